@@ -1,7 +1,28 @@
+import asyncio
+import logging
+import threading
 import unittest
+from time import perf_counter_ns
 from unittest import mock  # Import the mock module to simulate payment gateway responses.
 from unittest.mock import MagicMock
 
+from card_validation import card_error, validate_cards
+from card_vault import default_vault
+from instrumentation import metrics
+from profiling import sampled
+from result_cache import IdempotencyCache, request_fingerprint
+
+logger = logging.getLogger(__name__)
+
+# Card numbers that the fake gateways always decline.
+DECLINED_CARD_NUMBERS = ("1111222233334444", "4000000000000002")
+# Results for a payment whose outcome is unknown ({"status": "unknown"} from ResilientGateway): the gateway
+# may have charged it, so it must be reconciled with the gateway rather than charged again.
+PAYMENT_PENDING = "Payment pending, do not retry"
+ORDER_PENDING = "Order Pending"
+# Card number lengths the fake gateway accepts: every length a card network issues (ISO/IEC 7812).
+CARD_NUMBER_LENGTHS = range(12, 20)
+
 class FakePaymentGateway:
     """
     A simplified fake version of a payment gateway.
@@ -19,17 +40,31 @@ class FakePaymentGateway:
         Returns:
             dict: A fake payment response.
         """
-        # Simulate successful transaction for any valid card.
-        if method == "credit_card" and len(details.get("card_number", "")) == 16:
-            return {"status": "success", "transaction_id": "fake123"}
-
-        # Simulate card decline for a specific card number.
-        if method == "credit_card" and details["card_number"] == "1111222233334444":
+        # Simulate card decline for specific card numbers.
+        if method == "credit_card" and details.get("card_number") in DECLINED_CARD_NUMBERS:
             return {"status": "failure", "message": "Card declined"}
 
+        # Simulate successful transaction for any well-formed card number, and for PayPal.
+        card_number = details.get("card_number", "")
+        if (method == "credit_card" and isinstance(card_number, str) and card_number.isdigit()
+                and len(card_number) in CARD_NUMBER_LENGTHS or method == "paypal"):
+            return {"status": "success", "transaction_id": "fake123"}
+
         # Simulate generic failure for any other cases.
         return {"status": "failure", "message": "Invalid payment details"}
 
+    def process_payments_batch(self, requests):
+        """
+        Processes several payments in one call, as a gateway's batch authorization endpoint would.
+
+        Args:
+            requests (list): (method, details, amount) tuples.
+
+        Returns:
+            list: A fake payment response for each request, in the same order.
+        """
+        return [self.process_payment(method, details, amount) for method, details, amount in requests]
+
 
 # PaymentProcessing Class
 class PaymentProcessing:
@@ -38,13 +73,28 @@ class PaymentProcessing:
     
     Attributes:
         available_gateways (list): A list of supported payment gateways such as 'credit_card' and 'paypal'.
+        payment_gateway: The gateway that authorizes payments, one at a time and in batches.
+        today (callable): Returns the current date, against which card expiry dates are checked, or None for the system date.
+        vault (CardVault): Holds tokenized cards, which are charged without being validated again.
     """
-    def __init__(self):
+    def __init__(self, payment_gateway=None, today=None, vault=None):
         """
         Initializes the PaymentProcessing class with available payment gateways.
+
+        Args:
+            payment_gateway (optional): The gateway used by process_payment and process_payments_batch;
+                                        defaults to FakePaymentGateway.
+            today (callable, optional): Returns the current date; defaults to the system date.
+            vault (CardVault, optional): The card vault; defaults to the shared card_vault.default_vault.
         """
         self.available_gateways = ["credit_card", "paypal"]
-        self.payment_gateway = FakePaymentGateway()  # Initialize the fake gateway
+        self.payment_gateway = payment_gateway or FakePaymentGateway()  # Initialize the fake gateway
+        self.today = today
+        self.vault = vault or default_vault
+
+    def _today(self):
+        # None lets card_validation use its cached current month, which is much cheaper than datetime.date.today().
+        return self.today() if self.today else None
 
     def validate_payment_method(self, payment_method, payment_details):
         """
@@ -52,7 +102,8 @@ class PaymentProcessing:
         
         Args:
             payment_method (str): The selected payment method (e.g., 'credit_card', 'paypal').
-            payment_details (dict): The details required for the payment method (e.g., card number, expiry date).
+            payment_details (dict): The details required for the payment method (e.g., card number, expiry date),
+                                    or a card token reference, {"token": ...}, optionally with the "cvv".
         
         Returns:
             bool: True if the payment method and details are valid, otherwise raises ValueError.
@@ -66,7 +117,10 @@ class PaymentProcessing:
 
         # Validate credit card details if the selected method is 'credit_card'.
         if payment_method == "credit_card":
-            if not self.validate_credit_card(payment_details):
+            if self.vault.is_token(payment_details):
+                # Tokenized cards were validated when they were stored; only a re-entered CVV is checked.
+                self.vault.resolve(payment_details, self._today())
+            elif not self.validate_credit_card(payment_details):
                 raise ValueError("Invalid credit card details")
 
         # Validation passed.
@@ -75,6 +129,7 @@ class PaymentProcessing:
     def validate_credit_card(self, details):
         """
         Validates the credit card details (e.g., card number, expiry date, CVV).
+        See card_validation.card_error for the checks.
         
         Args:
             details (dict): A dictionary containing 'card_number', 'expiry_date', and 'cvv'.
@@ -82,16 +137,22 @@ class PaymentProcessing:
         Returns:
             bool: True if the card details are valid, False otherwise.
         """
-        card_number = details.get("card_number", "")
-        expiry_date = details.get("expiry_date", "")
-        cvv = details.get("cvv", "")
-
-        # Basic validation: Check if the card number is 16 digits and CVV is 3 digits.
-        if len(card_number) != 16 or len(cvv) != 3:
-            return False
+        return card_error(details, self._today()) is None
 
-        # More advanced validations like the Luhn Algorithm for card number can be added here.
-        return True
+    def tokenize_card(self, payment_details):
+        """
+        Validates a card once and stores it in the vault, e.g. when the customer saves it.
+        
+        Args:
+            payment_details (dict): A dictionary containing 'card_number', 'expiry_date', and 'cvv'.
+        
+        Returns:
+            dict: A token reference, {"token": ...}, to pass to process_payment instead of the card details.
+        
+        Raises:
+            ValueError: If the card details are invalid.
+        """
+        return {"token": self.vault.tokenize(payment_details, self._today())}
 
     def process_payment(self, order, payment_method, payment_details):
         """
@@ -100,31 +161,108 @@ class PaymentProcessing:
         Args:
             order (dict): The order details, including total amount.
             payment_method (str): The selected payment method.
-            payment_details (dict): The details required for the payment method.
+            payment_details (dict): The details required for the payment method, or a token reference from tokenize_card.
         
         Returns:
             str: A message indicating whether the payment was successful or failed.
         """
+        t0 = perf_counter_ns() if metrics.enabled else 0
         try:
-            # Validate the payment method and details.
-            self.validate_payment_method(payment_method, payment_details)
+            if payment_method == "credit_card" and self.vault.is_token(payment_details):
+                # Tokenized cards skip validation; the card details are only taken out of the vault for the gateway.
+                payment_details = self.vault.resolve(payment_details, self._today())
+            else:
+                # Validate the payment method and details.
+                self.validate_payment_method(payment_method, payment_details)
             
-            # Simulate interaction with the payment gateway.
+            # Authorize the payment with the payment gateway.
             payment_response = self.mock_payment_gateway(payment_method, payment_details, order["total_amount"])
 
             # Return the appropriate message based on the payment gateway's response.
             if payment_response["status"] == "success":
                 return "Payment successful, Order confirmed"
+            elif payment_response["status"] == "unknown":
+                return PAYMENT_PENDING
             else:
                 return "Payment failed, please try again"
 
         except Exception as e:
             # Catch and return any validation or processing errors.
             return f"Error: {str(e)}"
+        finally:
+            if t0:
+                metrics.observe("payment.process_payment", perf_counter_ns() - t0)
+
+    def process_payments_batch(self, orders, batch_size=100):
+        """
+        Processes the payments for many orders, e.g. a scheduled group or corporate order.
+
+        All payment details are validated first, with card details checked together by
+        card_validation.validate_cards and card tokens resolved through the vault; the valid
+        payments are then sent to the gateway's batch endpoint (process_payments_batch)
+        batch_size at a time. Gateways without a batch endpoint are called once per payment.
+        If a batch fails, only its orders get an error.
+
+        Args:
+            orders (list): (order, payment_method, payment_details) tuples, as passed to process_payment.
+            batch_size (int, optional): The maximum number of payments per gateway call.
+
+        Returns:
+            list: The process_payment message for each order, in input order.
+        """
+        t0 = perf_counter_ns() if metrics.enabled else 0
+        try:
+            results = [None] * len(orders)
+            today = self._today()
+            card_indexes = [index for index, (_, payment_method, payment_details) in enumerate(orders)
+                            if payment_method == "credit_card" and not self.vault.is_token(payment_details)]
+            card_errors = validate_cards([orders[index][2] for index in card_indexes], today)
+            invalid_cards = {index for index, error in zip(card_indexes, card_errors) if error is not None}
+
+            pending = []  # (index, (method, details, amount)) for orders that passed validation.
+            for index, (order, payment_method, payment_details) in enumerate(orders):
+                if payment_method not in self.available_gateways:
+                    results[index] = "Error: Invalid payment method"
+                elif index in invalid_cards:
+                    results[index] = "Error: Invalid credit card details"
+                else:
+                    try:
+                        if payment_method == "credit_card" and self.vault.is_token(payment_details):
+                            payment_details = self.vault.resolve(payment_details, today)
+                        pending.append((index, (payment_method, payment_details, order["total_amount"])))
+                    except Exception as e:
+                        results[index] = f"Error: {str(e)}"
+
+            for start in range(0, len(pending), batch_size):
+                batch = pending[start:start + batch_size]
+                try:
+                    responses = self._authorize_batch([request for _, request in batch])
+                except Exception as e:
+                    for index, _ in batch:
+                        results[index] = f"Error: {str(e)}"
+                    continue
+                for (index, _), payment_response in zip(batch, responses):
+                    if payment_response["status"] == "success":
+                        results[index] = "Payment successful, Order confirmed"
+                    elif payment_response["status"] == "unknown":
+                        results[index] = PAYMENT_PENDING
+                    else:
+                        results[index] = "Payment failed, please try again"
+            return results
+        finally:
+            if t0:
+                metrics.observe("payment.process_payments_batch", perf_counter_ns() - t0)
+
+    def _authorize_batch(self, requests):
+        process_payments_batch = getattr(self.payment_gateway, "process_payments_batch", None)
+        if process_payments_batch is not None:
+            return process_payments_batch(requests)
+        return [self.payment_gateway.process_payment(*request) for request in requests]
 
     def mock_payment_gateway(self, method, details, amount):
         """
-        Simulates the interaction with a payment gateway for processing payments.
+        Sends one payment to the payment gateway, the same gateway process_payments_batch uses,
+        so a payment gets the same answer alone and in a batch.
         
         Args:
             method (str): The payment method (e.g., 'credit_card').
@@ -132,26 +270,41 @@ class PaymentProcessing:
             amount (float): The amount to be charged.
         
         Returns:
-            dict: A mock response from the payment gateway, indicating success or failure.
+            dict: The payment gateway's response, indicating success or failure.
         """
-        # Simulate card decline for a specific card number.
-        if method == "credit_card" and details["card_number"] == "1111222233334444":
-            return {"status": "failure", "message": "Card declined"}
-
-        # Mock a successful transaction.
-        return {"status": "success", "transaction_id": "abc123"}
+        return self.payment_gateway.process_payment(method, details, amount)
 
 # Integration tests - Top-layer
 class OrderController:
-    def __init__(self, payment_service, notification_service):
+    def __init__(self, payment_service, notification_service, idempotency_cache=None):
         self.payment_service = payment_service  # Stub initially
         self.notification_service = notification_service  # Stub initially
-
-    def place_order(self, order_details, payment_details):
+        self.idempotency_cache = idempotency_cache or IdempotencyCache()
+
+    @sampled("place_order")
+    def place_order(self, order_details, payment_details, idempotency_key=None):
+        # Retries of a confirmed or pending order with the same idempotency key get the first result
+        # without charging again. Keys are scoped to the customer's email and bound to the order and payment details.
+        if idempotency_key is not None:
+            return self.idempotency_cache.get_or_compute(
+                idempotency_key, lambda: self._place_order(order_details, payment_details),
+                scope=order_details.get("email"), fingerprint=request_fingerprint(order_details, payment_details),
+                cache_if=lambda result: result in ("Order Confirmed", ORDER_PENDING))
+        return self._place_order(order_details, payment_details)
+
+    def _place_order(self, order_details, payment_details):
         payment_result = self.payment_service.process_payment(order_details, payment_details)
         if payment_result["status"] == "success":
-            self.notification_service.send_notification("Order placed successfully!")
+            # With a QueuedNotificationService this only queues the message, so delivery is not part of the order latency.
+            notification = {}
+            if order_details.get("email"):
+                notification["recipient"] = order_details["email"]
+            if order_details.get("order_id") is not None:
+                notification["order_id"] = order_details["order_id"]
+            self.notification_service.send_notification("Order placed successfully!", **notification)
             return "Order Confirmed"
+        if payment_result["status"] == "unknown":
+            return ORDER_PENDING
         return "Order Failed"
 
 # Integration tests - Middle-layer
@@ -162,11 +315,176 @@ class PaymentService:
     def process_payment(self, order, payment_details):
         return self.payment_gateway.process_payment("credit_card", payment_details, order["total_amount"])
 
+    async def process_payment_async(self, order, payment_details):
+        # Gateways that talk to the network (HttpPaymentGateway) are awaited; in-process ones run in a worker thread.
+        process_payment_async = getattr(self.payment_gateway, "process_payment_async", None)
+        if process_payment_async is not None:
+            return await process_payment_async("credit_card", payment_details, order["total_amount"])
+        return await asyncio.to_thread(self.process_payment, order, payment_details)
+
 # Stub for Integration tests
 class NotificationService:
-    def send_notification(self, message):
+    def send_notification(self, message, recipient=None, order_id=None):
         return f"Notification sent: {message}"
 
+# In-process transport for QueuedNotificationService
+class InProcessTransport:
+    """
+    A notification transport that records delivered batches in memory instead of sending them.
+    Real transports (email, push) provide the same deliver method.
+    
+    Attributes:
+        batches (list): (recipient, messages) tuples, in delivery order.
+    """
+    def __init__(self):
+        self.batches = []
+
+    def deliver(self, recipient, messages):
+        """
+        Delivers a batch of messages to one recipient.
+        
+        Args:
+            recipient (str): The recipient, or None for the default recipient.
+            messages (list): The messages, in the order they were sent.
+        """
+        self.batches.append((recipient, messages))
+
+# QueuedNotificationService Class
+class QueuedNotificationService:
+    """
+    A notification service that queues messages and delivers them in the background.
+    
+    Messages are grouped per recipient and delivered as one batch per recipient every
+    flush_interval seconds, or sooner once a recipient has max_batch_size messages waiting.
+    Identical messages about the same order to the same recipient within a window are sent
+    once; messages with neither a recipient nor an order ID are never deduplicated. A batch
+    the transport fails to deliver is queued again, up to max_attempts deliveries per message.
+    
+    Attributes:
+        transport: The object whose deliver(recipient, messages) method sends each batch.
+        sent (int): The number of messages delivered.
+        deduplicated (int): The number of duplicate messages dropped.
+        batches (int): The number of batches delivered.
+        failed (int): The number of batches the transport failed to deliver.
+        dropped (int): The number of messages given up on after max_attempts failed deliveries.
+    """
+    def __init__(self, transport=None, flush_interval=0.05, max_batch_size=100, max_attempts=3):
+        """
+        Initializes the service and starts its delivery thread.
+        
+        Args:
+            transport (optional): Delivers batches; defaults to an InProcessTransport.
+            flush_interval (float, optional): The longest time, in seconds, a message waits before delivery.
+            max_batch_size (int, optional): Delivers early once a recipient has this many messages waiting.
+            max_attempts (int, optional): Deliveries tried per message before it is dropped.
+        """
+        self.transport = transport or InProcessTransport()
+        self.flush_interval = flush_interval
+        self.max_batch_size = max_batch_size
+        self.max_attempts = max_attempts
+        self.sent = 0
+        self.deduplicated = 0
+        self.batches = 0
+        self.failed = 0
+        self.dropped = 0
+        self._pending = {}  # Maps recipient -> {(order ID, message): failed attempts}, in sending order.
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._delivery_lock = threading.Lock()  # Keeps batches for a recipient in order.
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="notification-flusher", daemon=True)
+        self._thread.start()
+
+    def send_notification(self, message, recipient=None, order_id=None):
+        """
+        Queues a message for delivery.
+        
+        Args:
+            message (str): The message to send.
+            recipient (str, optional): The recipient, e.g. the user's email address.
+            order_id (str, optional): The order the message is about, so that identical
+                                      messages about different orders are all sent.
+        
+        Returns:
+            str: A confirmation that the message was queued.
+        
+        Raises:
+            RuntimeError: If the service has been closed.
+        """
+        # Without a recipient or an order there is nothing to tell two identical messages apart by.
+        key = (order_id if recipient is not None or order_id is not None else object(), message)
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Notification service is closed")
+            messages = self._pending.setdefault(recipient, {})
+            if key in messages:
+                self.deduplicated += 1
+            else:
+                messages[key] = 0
+                if len(messages) >= self.max_batch_size:
+                    self._wakeup.notify()
+        return f"Notification queued: {message}"
+
+    def flush(self):
+        """
+        Delivers every queued message now, in the calling thread. Batches that fail are queued
+        again for the next flush.
+        
+        Returns:
+            int: The number of batches delivered.
+        """
+        with self._delivery_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+            delivered = 0
+            for recipient, messages in pending.items():
+                try:
+                    self.transport.deliver(recipient, [message for _, message in messages])
+                except Exception:
+                    logger.exception("Failed to deliver %d notifications to %r", len(messages), recipient)
+                    self.failed += 1
+                    self._requeue(recipient, messages)
+                else:
+                    self.sent += len(messages)
+                    self.batches += 1
+                    delivered += 1
+            return delivered
+
+    def _requeue(self, recipient, messages):
+        retry = {key: attempts + 1 for key, attempts in messages.items() if attempts + 1 < self.max_attempts}
+        if len(retry) < len(messages):
+            logger.error("Dropping %d notifications to %r after %d failed deliveries",
+                         len(messages) - len(retry), recipient, self.max_attempts)
+            self.dropped += len(messages) - len(retry)
+        if retry:
+            with self._lock:
+                # The failed messages go before any queued since, to keep the recipient's messages in order.
+                for key, attempts in self._pending.get(recipient, {}).items():
+                    retry.setdefault(key, attempts)
+                self._pending[recipient] = retry
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if not self._closed:
+                    self._wakeup.wait(self.flush_interval)
+                closed = self._closed
+            self.flush()
+            if closed:
+                # Keep flushing until requeued batches are delivered or dropped after max_attempts.
+                with self._lock:
+                    if not self._pending:
+                        return
+
+    def close(self):
+        """
+        Delivers the remaining messages and stops the delivery thread.
+        """
+        with self._lock:
+            self._closed = True
+            self._wakeup.notify()
+        self._thread.join()
+
 # Integration tests - Bottom-layer
 class PaymentGateway:
     def process_payment(self, method, details, amount):
@@ -189,7 +507,7 @@ class TestPaymentProcessing(unittest.TestCase):
         """
         Test case for successful validation of a valid payment method ('credit_card') with valid details.
         """
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
         result = self.payment_processing.validate_payment_method("credit_card", payment_details)
         self.assertTrue(result)
 
@@ -197,7 +515,7 @@ class TestPaymentProcessing(unittest.TestCase):
         """
         Test case for validation failure due to an unsupported payment method ('bitcoin').
         """
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
         with self.assertRaises(ValueError) as context:
             self.payment_processing.validate_payment_method("bitcoin", payment_details)
         self.assertEqual(str(context.exception), "Invalid payment method")
@@ -206,7 +524,7 @@ class TestPaymentProcessing(unittest.TestCase):
         """
         Test case for validation failure due to invalid credit card details (invalid card number and CVV).
         """
-        payment_details = {"card_number": "1234", "expiry_date": "12/25", "cvv": "12"}  # Invalid card number and CVV.
+        payment_details = {"card_number": "1234", "expiry_date": "12/30", "cvv": "12"}  # Invalid card number and CVV.
         result = self.payment_processing.validate_credit_card(payment_details)
         self.assertFalse(result)
 
@@ -215,7 +533,7 @@ class TestPaymentProcessing(unittest.TestCase):
         Test case for successful payment processing using the 'credit_card' method with valid details.
         """
         order = {"total_amount": 100.00}
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
 
         # Use mock to simulate a successful payment response from the gateway.
         with mock.patch.object(self.payment_processing, 'mock_payment_gateway', return_value={"status": "success"}):
@@ -227,7 +545,7 @@ class TestPaymentProcessing(unittest.TestCase):
         Test case for payment failure due to a declined credit card.
         """
         order = {"total_amount": 100.00}
-        payment_details = {"card_number": "1111222233334444", "expiry_date": "12/25", "cvv": "123"}  # Simulate a declined card.
+        payment_details = {"card_number": "4000000000000002", "expiry_date": "12/30", "cvv": "123"}  # Simulate a declined card.
 
         # Use mock to simulate a failed payment response from the gateway.
         with mock.patch.object(self.payment_processing, 'mock_payment_gateway', return_value={"status": "failure"}):
@@ -239,7 +557,7 @@ class TestPaymentProcessing(unittest.TestCase):
         Test case for payment processing failure due to an invalid payment method ('bitcoin').
         """
         order = {"total_amount": 100.00}
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
 
         # No need for mocking, the method will raise an error directly.
         result = self.payment_processing.process_payment(order, "bitcoin", payment_details)
@@ -259,7 +577,7 @@ class TestPaymentProcessing(unittest.TestCase):
         """
         Test case for validation failure when required credit card details are missing.
         """
-        payment_details = {"expiry_date": "12/25", "cvv": "123"}  # Missing card number
+        payment_details = {"expiry_date": "12/30", "cvv": "123"}  # Missing card number
         with self.assertRaises(ValueError) as context:
             self.payment_processing.validate_payment_method("credit_card", payment_details)
         self.assertEqual(str(context.exception), "Invalid credit card details")
@@ -269,7 +587,7 @@ class TestPaymentProcessing(unittest.TestCase):
     #     Test case for payment processing failure when order details are empty (no amount).
     #     """
     #     order = {}
-    #     payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+    #     payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
         
     #     result = self.payment_processing.process_payment(order, "credit_card", payment_details)
     #     self.assertIn("Error: Invalid payment method", result)  # The method will try to process but fail because order is empty
@@ -279,7 +597,7 @@ class TestPaymentProcessing(unittest.TestCase):
         """
         Test case for validation failure when payment method is None.
         """
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
         with self.assertRaises(ValueError) as context:
             self.payment_processing.validate_payment_method(None, payment_details)
         self.assertEqual(str(context.exception), "Invalid payment method")
@@ -297,7 +615,7 @@ class TestPaymentProcessing(unittest.TestCase):
         Test case for payment processing failure with a negative order amount.
         """
         order = {"total_amount": -100.00}  # Invalid negative amount
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
         
         result = self.payment_processing.process_payment(order, "credit_card", payment_details)
         self.assertIn("Error", result)  # Expecting an error message
@@ -307,7 +625,7 @@ class TestPaymentProcessing(unittest.TestCase):
         """
         Test case for credit card validation with a card number of 15 digits (boundary case - invalid).
         """
-        payment_details = {"card_number": "123456781234567", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "123456781234567", "expiry_date": "12/30", "cvv": "123"}
         result = self.payment_processing.validate_credit_card(payment_details)
         self.assertFalse(result)
     
@@ -315,7 +633,7 @@ class TestPaymentProcessing(unittest.TestCase):
         """
         Test case for credit card validation with a card number of 17 digits (boundary case - invalid).
         """
-        payment_details = {"card_number": "12345678123456789", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "12345678123456789", "expiry_date": "12/30", "cvv": "123"}
         result = self.payment_processing.validate_credit_card(payment_details)
         self.assertFalse(result)
     
@@ -323,7 +641,7 @@ class TestPaymentProcessing(unittest.TestCase):
         """
         Test case for credit card validation with a valid 16-digit card number (boundary case - valid).
         """
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
         result = self.payment_processing.validate_credit_card(payment_details)
         self.assertTrue(result)
     
@@ -331,7 +649,7 @@ class TestPaymentProcessing(unittest.TestCase):
         """
         Test case for credit card validation with a CVV of 2 digits (boundary case - invalid).
         """
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "12"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "12"}
         result = self.payment_processing.validate_credit_card(payment_details)
         self.assertFalse(result)
     
@@ -339,7 +657,7 @@ class TestPaymentProcessing(unittest.TestCase):
         """
         Test case for credit card validation with a CVV of 4 digits (boundary case - invalid).
         """
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "1234"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "1234"}
         result = self.payment_processing.validate_credit_card(payment_details)
         self.assertFalse(result)
     
@@ -347,7 +665,7 @@ class TestPaymentProcessing(unittest.TestCase):
         """
         Test case for credit card validation with a valid 3-digit CVV (boundary case - valid).
         """
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
         result = self.payment_processing.validate_credit_card(payment_details)
         self.assertTrue(result)
     
@@ -356,7 +674,7 @@ class TestPaymentProcessing(unittest.TestCase):
         Test case for payment processing with an order amount of zero (boundary case - valid scenario).
         """
         order = {"total_amount": 0.00}
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
         
         with mock.patch.object(self.payment_processing, 'mock_payment_gateway', return_value={"status": "success"}):
             result = self.payment_processing.process_payment(order, "credit_card", payment_details)
@@ -368,7 +686,7 @@ class TestPaymentProcessing(unittest.TestCase):
 
     def test_process_payment_success(self):
         order = {"total_amount": 100.00}
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
 
         result = self.payment_processing.process_payment(order, "credit_card", payment_details)
         self.assertEqual(result, "Payment successful, Order confirmed")
@@ -382,7 +700,7 @@ class TestSandwichIntegration(unittest.TestCase):
 
     def test_successful_order(self):
         order = {"total_amount": 100.00}
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
         
         # Mocking notification to avoid external dependencies
         self.notification_service.send_notification = MagicMock(return_value="Notification sent: Order placed successfully!")
@@ -392,7 +710,7 @@ class TestSandwichIntegration(unittest.TestCase):
     
     def test_failed_order_due_to_invalid_payment(self):
         order = {"total_amount": 100.00}
-        payment_details = {"card_number": "1111222233334444", "expiry_date": "12/25", "cvv": "123"}  # Simulated failure
+        payment_details = {"card_number": "4000000000000002", "expiry_date": "12/30", "cvv": "123"}  # Simulated failure
 
         # Mocking the payment gateway to return a failure response
         with mock.patch.object(self.payment_service.payment_gateway, 'process_payment', return_value={"status": "failure", "message": "Card declined"}):
@@ -404,7 +722,7 @@ class TestSandwichIntegration(unittest.TestCase):
         Test case to ensure that the notification is sent when the order is successful.
         """
         order = {"total_amount": 100.00}
-        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        payment_details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
         
         # Mocking notification to avoid actual side effects
         self.notification_service.send_notification = MagicMock(return_value="Notification sent: Order placed successfully!")
@@ -1,3 +1,9 @@
+from time import perf_counter_ns
+
+from instrumentation import metrics
+from profiling import sampled
+
+
 class RestaurantBrowsing:
     """
     A class for browsing restaurants in a database based on various criteria like cuisine type, location, and rating.
@@ -54,6 +60,7 @@ class RestaurantBrowsing:
         return [restaurant for restaurant in self.database.get_restaurants() 
                 if restaurant['rating'] >= min_rating]
 
+    @sampled("search_by_filters")
     def search_by_filters(self, cuisine_type=None, location=None, min_rating=None):
         """
         Search for restaurants based on multiple filters: cuisine type, location, and/or rating.
@@ -66,21 +73,26 @@ class RestaurantBrowsing:
         Returns:
             list: A list of restaurants that match all specified filters.
         """
-        results = self.database.get_restaurants()  # Start with all restaurants
+        t0 = perf_counter_ns() if metrics.enabled else 0
+        try:
+            results = self.database.get_restaurants()  # Start with all restaurants
 
-        if cuisine_type:
-            results = [restaurant for restaurant in results 
-                       if restaurant['cuisine'].lower() == cuisine_type.lower()]
+            if cuisine_type:
+                results = [restaurant for restaurant in results 
+                           if restaurant['cuisine'].lower() == cuisine_type.lower()]
 
-        if location:
-            results = [restaurant for restaurant in results 
-                       if restaurant['location'].lower() == location.lower()]
+            if location:
+                results = [restaurant for restaurant in results 
+                           if restaurant['location'].lower() == location.lower()]
 
-        if min_rating:
-            results = [restaurant for restaurant in results 
-                       if restaurant['rating'] >= min_rating]
+            if min_rating:
+                results = [restaurant for restaurant in results 
+                           if restaurant['rating'] >= min_rating]
 
-        return results
+            return results
+        finally:
+            if t0:
+                metrics.observe("browsing.search_by_filters", perf_counter_ns() - t0)
 
 
 class RestaurantDatabase:
@@ -1,3 +1,9 @@
+from time import perf_counter_ns
+
+from instrumentation import metrics
+from profiling import sampled
+
+
 class UserRegistration:
     def __init__(self):
         """
@@ -6,6 +12,7 @@ class UserRegistration:
         """
         self.users = {}
 
+    @sampled("register")
     def register(self, email, password, confirm_password):
         """
         Registers a new user.
@@ -30,18 +37,23 @@ class UserRegistration:
                   On success, it returns {"success": True, "message": "Registration successful, confirmation email sent"}.
                   On failure, it returns {"success": False, "error": "Specific error message"}.
         """
-        if not self.is_valid_email(email):
-            return {"success": False, "error": "Invalid email format"}  # If email format is invalid, return an error.
-        if password != confirm_password:
-            return {"success": False, "error": "Passwords do not match"}  # If passwords don't match, return an error.
-        if not self.is_strong_password(password):
-            return {"success": False, "error": "Password is not strong enough"}  # If password isn't strong, return an error.
-        if email in self.users:
-            return {"success": False, "error": "Email already registered"}  # If the email is already registered, return an error.
-
-        # Register the user if all conditions are met and return a success message.
-        self.users[email] = {"password": password, "confirmed": False}
-        return {"success": True, "message": "Registration successful, confirmation email sent"}
+        t0 = perf_counter_ns() if metrics.enabled else 0
+        try:
+            if not self.is_valid_email(email):
+                return {"success": False, "error": "Invalid email format"}  # If email format is invalid, return an error.
+            if password != confirm_password:
+                return {"success": False, "error": "Passwords do not match"}  # If passwords don't match, return an error.
+            if not self.is_strong_password(password):
+                return {"success": False, "error": "Password is not strong enough"}  # If password isn't strong, return an error.
+            if email in self.users:
+                return {"success": False, "error": "Email already registered"}  # If the email is already registered, return an error.
+
+            # Register the user if all conditions are met and return a success message.
+            self.users[email] = {"password": password, "confirmed": False}
+            return {"success": True, "message": "Registration successful, confirmation email sent"}
+        finally:
+            if t0:
+                metrics.observe("registration.register", perf_counter_ns() - t0)
 
     def is_valid_email(self, email):
         """
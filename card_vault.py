@@ -0,0 +1,216 @@
+import hashlib
+import hmac
+import secrets
+import threading
+import time
+
+from card_validation import CVV_LENGTHS, card_error, current_month, detect_network, parse_expiry
+from result_cache import TTLCache
+
+
+# CardRecord Class
+class CardRecord:
+    """
+    A validated card held by the vault.
+
+    Attributes:
+        token (str): The opaque token that stands for the card.
+        network (str): The card network, e.g. "visa".
+        last4 (str): The last four digits, for display.
+        expiry (tuple): (year, month) of the expiry date.
+        details (dict): The card number and expiry date, released only to the payment gateway.
+                        The CVV is never stored.
+    """
+    __slots__ = ("token", "network", "last4", "expiry", "details")
+
+    def __init__(self, token, network, last4, expiry, details):
+        self.token = token
+        self.network = network
+        self.last4 = last4
+        self.expiry = expiry
+        self.details = details
+
+    def __repr__(self):
+        return f"CardRecord({self.token!r}, {self.network} ending {self.last4}, expires {self.expiry[1]:02d}/{self.expiry[0]})"
+
+
+# CardVault Class
+class CardVault:
+    """
+    Exchanges card details for opaque tokens, validating each card once.
+
+    Validated cards are kept in a TTLCache, so a saved card can be charged by token without
+    re-validating it and without its number passing through the rest of the checkout. The CVV
+    is checked when the card is tokenized but not stored; the customer may enter it again
+    when paying with the saved card. Tokenizing the same card again returns its existing
+    token (found by a keyed hash of the card number and expiry date) without validating it
+    again. Tokens stop working when they leave the cache or the card expires; the caller
+    then tokenizes the card again.
+
+    Attributes:
+        cards (TTLCache): Maps token -> CardRecord.
+        validations (int): The number of cards validated.
+        validation_ns (int): The total time spent validating, in nanoseconds.
+        reused (int): The number of tokenize and resolve calls answered without validating.
+    """
+    def __init__(self, maxsize=10_000, ttl=24 * 60 * 60, clock=time.monotonic):
+        """
+        Initializes an empty vault.
+
+        Args:
+            maxsize (int, optional): The maximum number of cards held.
+            ttl (float, optional): Seconds a token stays valid; defaults to one day.
+            clock (callable, optional): Returns the current time in seconds.
+        """
+        self.cards = TTLCache(maxsize, ttl, clock)
+        self.validations = 0
+        self.validation_ns = 0
+        self.reused = 0
+        self._fingerprints = TTLCache(maxsize, ttl, clock)  # Maps keyed card hash -> token.
+        self._key = secrets.token_bytes(32)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def is_token(payment_details):
+        """
+        Checks whether payment details are a token reference, {"token": ...}, rather than card details.
+
+        Args:
+            payment_details: The payment details passed to checkout.
+
+        Returns:
+            bool: True for a token reference.
+        """
+        return isinstance(payment_details, dict) and "token" in payment_details
+
+    def tokenize(self, details, today=None):
+        """
+        Validates a card and returns its token. For a card that was already tokenized only the
+        CVV is checked again; the number, checksum and network checks are skipped.
+
+        Args:
+            details (dict): A dictionary containing 'card_number', 'expiry_date', and 'cvv'.
+            today (datetime.date, optional): The current date; defaults to today.
+
+        Returns:
+            str: The card's token.
+
+        Raises:
+            ValueError: If the card details are invalid.
+        """
+        fingerprint = self._fingerprint(details)
+        if fingerprint is not None:
+            token = self._fingerprints.get(fingerprint)
+            record = self.cards.get(token) if token is not None else None
+            if self._usable(record, today):
+                # Knowing a saved card's number and expiry date must not be enough to get its token.
+                if not self._cvv_valid(record, details.get("cvv")):
+                    raise ValueError("Invalid credit card details: Invalid CVV")
+                self._count_reuse()
+                return token
+
+        start = time.perf_counter_ns()
+        error = card_error(details, today)
+        elapsed = time.perf_counter_ns() - start
+        with self._lock:
+            self.validations += 1
+            self.validation_ns += elapsed
+        if error is not None:
+            raise ValueError(f"Invalid credit card details: {error}")
+
+        card_number = details["card_number"]
+        token = "tok_" + secrets.token_urlsafe(18)
+        stored = {field: value for field, value in details.items() if field != "cvv"}
+        self.cards.set(token, CardRecord(token, detect_network(card_number), card_number[-4:],
+                                         parse_expiry(details["expiry_date"]), stored))
+        self._fingerprints.set(fingerprint, token)
+        return token
+
+    def lookup(self, token, today=None):
+        """
+        Returns the card behind a token, if the token is known and the card has not expired.
+
+        Args:
+            token (str): The token.
+            today (datetime.date, optional): The current date; defaults to today.
+
+        Returns:
+            CardRecord: The card, or None.
+        """
+        record = self.cards.get(token)
+        return record if self._usable(record, today) else None
+
+    def resolve(self, payment_details, today=None):
+        """
+        Swaps a token reference for the card details to send to the gateway, without validating them again.
+
+        Args:
+            payment_details (dict): A token reference, {"token": ...}, with the "cvv" if the customer entered it again.
+            today (datetime.date, optional): The current date; defaults to today.
+
+        Returns:
+            dict: A copy of the card details, with the CVV only if it was passed in.
+
+        Raises:
+            ValueError: If the token is unknown, has expired, or its card has expired, or the CVV is malformed.
+        """
+        record = self.lookup(payment_details["token"], today)
+        if record is None:
+            raise ValueError("Invalid or expired card token")
+        details = dict(record.details)
+        if "cvv" in payment_details:
+            if not self._cvv_valid(record, payment_details["cvv"]):
+                raise ValueError("Invalid CVV")
+            details["cvv"] = payment_details["cvv"]
+        self._count_reuse()
+        return details
+
+    def forget(self, token):
+        """
+        Removes a card, e.g. when the customer deletes a saved card.
+
+        Args:
+            token (str): The token.
+        """
+        record = self.cards.pop(token)
+        if record is not None:
+            self._fingerprints.pop(self._fingerprint(record.details))
+
+    def stats(self):
+        """
+        Summarizes how much validation the vault has saved.
+
+        Returns:
+            dict: hit_rate (the fraction of card uses answered without validating), validations,
+                  reused, average_validation_ns and validation_ns_saved (reused * average).
+        """
+        with self._lock:
+            validations, validation_ns, reused = self.validations, self.validation_ns, self.reused
+        average = validation_ns / validations if validations else 0.0
+        uses = validations + reused
+        return {"hit_rate": reused / uses if uses else 0.0, "validations": validations, "reused": reused,
+                "average_validation_ns": average, "validation_ns_saved": reused * average}
+
+    def _usable(self, record, today):
+        if record is None:
+            return False
+        return record.expiry >= ((today.year, today.month) if today else current_month())
+
+    @staticmethod
+    def _cvv_valid(record, cvv):
+        return (isinstance(cvv, str) and len(cvv) == CVV_LENGTHS[record.network]
+                and cvv.isascii() and cvv.isdigit())
+
+    def _fingerprint(self, details):
+        if not isinstance(details, dict):
+            return None
+        card = "|".join(str(details.get(field, "")) for field in ("card_number", "expiry_date"))
+        return hmac.new(self._key, card.encode(), hashlib.sha256).digest()
+
+    def _count_reuse(self):
+        with self._lock:
+            self.reused += 1
+
+
+# The vault shared by PaymentProcessing instances, so a token issued by one can be charged by another.
+default_vault = CardVault()
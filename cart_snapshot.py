@@ -0,0 +1,167 @@
+import struct
+import sys
+from array import array
+from itertools import accumulate, pairwise
+
+# Snapshot layout (all integers little-endian):
+#   header      magic b"CART", version (u8), flags (u8), reserved (u16), line count (u32), string table size (u32)
+#   prices      line count x signed int, item prices in minor units
+#   quantities  line count x signed int
+#   offsets     (line count + 1) x unsigned int, byte offsets of each name in the string table
+#   strings     UTF-8 item names, concatenated
+# Each numeric column uses the narrowest of 2, 4 or 8 bytes that fits its values; the
+# widths are recorded as 2-bit codes in the flags byte (prices, quantities, offsets).
+MAGIC = b"CART"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHII")
+
+SIGNED_TYPECODES = ("h", "i", "q")
+UNSIGNED_TYPECODES = ("H", "I", "Q")
+
+_NATIVE_LITTLE_ENDIAN = sys.byteorder == "little"
+
+
+def _column(typecodes, values):
+    """
+    Encodes integers as a little-endian column using the narrowest typecode that fits them.
+
+    Args:
+        typecodes (tuple): Candidate array typecodes, from narrowest to widest.
+        values (iterable): The integers to encode.
+
+    Returns:
+        tuple: The width code (index into typecodes) and the encoded column bytes.
+    """
+    values = values if isinstance(values, array) else array("q", values)
+    low, high = min(values, default=0), max(values, default=0)
+    for code, typecode in enumerate(typecodes):
+        bits = array(typecode).itemsize * 8
+        if typecode.isupper():
+            fits = 0 <= low and high < 1 << bits
+        else:
+            fits = -(1 << bits - 1) <= low and high < 1 << bits - 1
+        if fits:
+            break
+    column = values if values.typecode == typecode else array(typecode, values)
+    if not _NATIVE_LITTLE_ENDIAN:
+        column = array(typecode, column)
+        column.byteswap()
+    return code, column.tobytes()
+
+
+def pack_snapshot(names, prices, quantities):
+    """
+    Encodes cart lines into the binary snapshot format.
+
+    Args:
+        names (list): Item names.
+        prices (iterable): Item prices in minor units, in the same order as names.
+        quantities (iterable): Item quantities, in the same order as names.
+
+    Returns:
+        bytes: The encoded snapshot.
+    """
+    encoded = [name.encode("utf-8") for name in names]
+    price_code, price_column = _column(SIGNED_TYPECODES, prices)
+    quantity_code, quantity_column = _column(SIGNED_TYPECODES, quantities)
+    offset_code, offset_column = _column(UNSIGNED_TYPECODES, accumulate((len(name) for name in encoded), initial=0))
+    strings = b"".join(encoded)
+    flags = price_code | quantity_code << 2 | offset_code << 4
+    header = HEADER.pack(MAGIC, VERSION, flags, 0, len(encoded), len(strings))
+    return b"".join((header, price_column, quantity_column, offset_column, strings))
+
+
+class CartSnapshot:
+    """
+    A read-only view over an encoded cart snapshot.
+
+    The snapshot keeps a memoryview over the caller's buffer: on little-endian machines
+    the price, quantity and offset columns are cast views into that buffer rather than
+    copies, and item names are only decoded when they are read.
+
+    Attributes:
+        prices (sequence): Item prices in minor units.
+        quantities (sequence): Item quantities.
+    """
+    def __init__(self, buffer):
+        """
+        Parses the snapshot header and sets up views over the columns.
+
+        Args:
+            buffer (bytes, bytearray or memoryview): The encoded snapshot.
+
+        Raises:
+            ValueError: If the buffer is not a valid snapshot or uses an unsupported version.
+        """
+        view = memoryview(buffer).cast("B")
+        if len(view) < HEADER.size:
+            raise ValueError("Invalid cart snapshot: truncated header")
+        magic, version, flags, _, count, strings_size = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Invalid cart snapshot: bad magic")
+        if version != VERSION:
+            raise ValueError(f"Unsupported cart snapshot version: {version}")
+        try:
+            price_type = SIGNED_TYPECODES[flags & 3]
+            quantity_type = SIGNED_TYPECODES[flags >> 2 & 3]
+            offset_type = UNSIGNED_TYPECODES[flags >> 4 & 3]
+        except IndexError:
+            raise ValueError("Invalid cart snapshot: bad column width") from None
+
+        prices_start = HEADER.size
+        quantities_start = prices_start + array(price_type).itemsize * count
+        offsets_start = quantities_start + array(quantity_type).itemsize * count
+        self._strings_start = offsets_start + array(offset_type).itemsize * (count + 1)
+        if len(view) != self._strings_start + strings_size:
+            raise ValueError("Invalid cart snapshot: size mismatch")
+
+        self._view = view
+        self._count = count
+        self.prices = self._read_column(view[prices_start:quantities_start], price_type)
+        self.quantities = self._read_column(view[quantities_start:offsets_start], quantity_type)
+        self._offsets = self._read_column(view[offsets_start:self._strings_start], offset_type)
+
+    @staticmethod
+    def _read_column(view, typecode):
+        if _NATIVE_LITTLE_ENDIAN:
+            return view.cast(typecode)
+        column = array(typecode, view.tobytes())
+        column.byteswap()
+        return column
+
+    def __len__(self):
+        return self._count
+
+    def name(self, index):
+        """
+        Decodes the name of the item at the given index.
+
+        Args:
+            index (int): The line index.
+
+        Returns:
+            str: The item name.
+        """
+        start = self._strings_start
+        return str(self._view[start + self._offsets[index]:start + self._offsets[index + 1]], "utf-8")
+
+    @property
+    def names(self):
+        """
+        Decodes every item name.
+
+        Returns:
+            list: The item names, in line order.
+        """
+        strings = self._view[self._strings_start:]
+        text = str(strings, "utf-8")
+        if len(text) == len(strings):  # ASCII only, so byte offsets are also character offsets.
+            return [text[start:end] for start, end in pairwise(self._offsets)]
+        raw = strings.tobytes()
+        return [raw[start:end].decode("utf-8") for start, end in pairwise(self._offsets)]
+
+    def __iter__(self):
+        """
+        Yields (name, price in minor units, quantity) for each line.
+        """
+        return zip(self.names, self.prices, self.quantities)
@@ -0,0 +1,151 @@
+import functools
+
+ZONES = ("Downtown", "Midtown", "Uptown")
+
+# Typical driving time in minutes between zones, from restaurant zone (rows) to delivery zone (columns).
+TRAVEL_MINUTES = {
+    "Downtown": {"Downtown": 10, "Midtown": 18, "Uptown": 28},
+    "Midtown": {"Downtown": 18, "Midtown": 10, "Uptown": 16},
+    "Uptown": {"Downtown": 28, "Midtown": 16, "Uptown": 10},
+}
+
+# Streets whose addresses do not name their zone.
+STREET_ZONES = {
+    "main st": "Downtown",
+    "market st": "Downtown",
+    "broadway": "Midtown",
+    "park ave": "Midtown",
+    "hill rd": "Uptown",
+    "college ave": "Uptown",
+}
+
+# Kitchen preparation time in minutes by price range, for restaurants without a "prep_minutes" field.
+PREP_MINUTES = {"$": 10, "$$": 15, "$$$": 20}
+DEFAULT_PREP_MINUTES = 15
+
+DEFAULT_ESTIMATE = "45 minutes"  # Used when the restaurant or address is not known.
+
+# The number of distinct addresses whose zones are memoized.
+ADDRESS_CACHE_SIZE = 4096
+
+
+# EtaCalculator Class
+class EtaCalculator:
+    """
+    Estimates delivery times from a restaurant's zone, the delivery address's zone and the
+    restaurant's preparation time.
+
+    Travel times come from a zone-to-zone matrix flattened into a dictionary when the
+    calculator is created. Addresses are normalized (case and whitespace) and the zones of
+    the most recently used ones are kept in a bounded LRU cache, and estimates are memoized
+    per (restaurant, zone), so repeated lookups, e.g. for every search result, are a few
+    dictionary hits.
+
+    Attributes:
+        database (RestaurantDatabase): The source of restaurant locations and price ranges.
+        default_zone (str): The zone used for addresses that cannot be placed in a zone.
+    """
+    def __init__(self, database, travel_minutes=None, street_zones=None, default_zone="Downtown",
+                 address_cache_size=ADDRESS_CACHE_SIZE):
+        """
+        Initializes the calculator and precomputes the travel-time table.
+
+        Args:
+            database (RestaurantDatabase): The restaurant database.
+            travel_minutes (dict, optional): Nested {from_zone: {to_zone: minutes}}; defaults to TRAVEL_MINUTES.
+            street_zones (dict, optional): Maps lowercase street names to zones; defaults to STREET_ZONES.
+            default_zone (str, optional): The zone for unrecognized addresses.
+            address_cache_size (int, optional): The number of normalized addresses whose zones are memoized.
+
+        Raises:
+            ValueError: If the default zone is not in the travel-time matrix.
+        """
+        travel_minutes = travel_minutes or TRAVEL_MINUTES
+        if default_zone not in travel_minutes:
+            raise ValueError(f"Unknown zone: {default_zone}")
+        self.database = database
+        self.default_zone = default_zone
+        self._travel = {(origin.lower(), destination.lower()): minutes
+                        for origin, row in travel_minutes.items() for destination, minutes in row.items()}
+        self._zone_names = {zone.lower(): zone for zone in travel_minutes}
+        self._street_zones = street_zones or STREET_ZONES
+        self._address_zones = functools.lru_cache(maxsize=address_cache_size)(self._resolve_zone)
+        self._estimates = {}  # Memoized (restaurant name, zone) -> minutes.
+        self._restaurants = None
+
+    def invalidate(self):
+        """
+        Discards memoized results, e.g. after restaurants are added or change location.
+        """
+        self._address_zones.cache_clear()
+        self._estimates.clear()
+        self._restaurants = None
+
+    def zone_for_address(self, address):
+        """
+        Maps a delivery address to a zone.
+
+        Args:
+            address (str): The address, e.g. "123 Main St" or "45 Uptown Plaza".
+
+        Returns:
+            str: The zone named in the address, the zone of its street, or the default zone.
+        """
+        # Spelling variants of the same address share one cache entry.
+        return self._address_zones(" ".join((address or "").split()).lower())
+
+    def _resolve_zone(self, text):
+        for name, zone in self._zone_names.items():
+            if name in text:
+                return zone
+        for street, zone in self._street_zones.items():
+            if street in text:
+                return zone
+        return self.default_zone
+
+    def estimate_minutes(self, restaurant_name, address):
+        """
+        Estimates the minutes from ordering to delivery.
+
+        Args:
+            restaurant_name (str): The restaurant's name in the database.
+            address (str): The delivery address.
+
+        Returns:
+            int: Preparation time plus travel time, in minutes.
+
+        Raises:
+            ValueError: If the restaurant is not in the database.
+        """
+        zone = self.zone_for_address(address)
+        key = (restaurant_name, zone)
+        minutes = self._estimates.get(key)
+        if minutes is None:
+            minutes = self._estimates[key] = self._compute(restaurant_name, zone)
+        return minutes
+
+    def _compute(self, restaurant_name, zone):
+        if self._restaurants is None:
+            self._restaurants = {restaurant["name"]: restaurant for restaurant in self.database.get_restaurants()}
+        restaurant = self._restaurants.get(restaurant_name)
+        if restaurant is None:
+            raise ValueError(f"Unknown restaurant: {restaurant_name}")
+        prep = restaurant.get("prep_minutes") or PREP_MINUTES.get(restaurant.get("price_range"), DEFAULT_PREP_MINUTES)
+        origin = self._zone_names.get(restaurant["location"].lower(), self.default_zone).lower()
+        return prep + self._travel[(origin, zone.lower())]
+
+    def estimate(self, restaurant_name, address):
+        """
+        Estimates the delivery time for display.
+
+        Args:
+            restaurant_name (str): The restaurant's name in the database.
+            address (str): The delivery address.
+
+        Returns:
+            str: The estimate, e.g. "38 minutes", or DEFAULT_ESTIMATE for unknown restaurants.
+        """
+        try:
+            return f"{self.estimate_minutes(restaurant_name, address)} minutes"
+        except ValueError:
+            return DEFAULT_ESTIMATE
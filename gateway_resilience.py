@@ -0,0 +1,338 @@
+import collections
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+from payment_gateway_client import GatewayError, GatewayUnavailable
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(GatewayUnavailable):
+    """
+    Raised instead of calling a gateway whose circuit breaker is open.
+    """
+
+
+def jittered_backoff(attempt, base=0.05, cap=1.0, rng=random.random):
+    """
+    Returns a "full jitter" retry delay: uniform between zero and the capped exponential backoff.
+
+    Args:
+        attempt (int): The retry number, starting at 1.
+        base (float, optional): The backoff before the first retry, in seconds.
+        cap (float, optional): The largest backoff, in seconds.
+        rng (callable, optional): Returns a random float in [0, 1).
+
+    Returns:
+        float: The delay in seconds.
+    """
+    return rng() * min(cap, base * 2 ** (attempt - 1))
+
+
+# CircuitBreaker Class
+class CircuitBreaker:
+    """
+    Stops calls to a gateway that is failing or too slow, and probes it again after a pause.
+
+    The breaker keeps the outcomes of the last window calls. When at least min_calls are
+    recorded and the fraction of failures reaches failure_rate, or the fraction of calls
+    slower than slow_call_duration reaches slow_call_rate, the breaker opens and allow()
+    returns False. After reset_timeout seconds one trial call is let through (half open):
+    if it succeeds quickly the breaker closes, otherwise it opens again.
+
+    Attributes:
+        state (str): CLOSED, OPEN or HALF_OPEN.
+        opened (int): The number of times the breaker has opened.
+    """
+    def __init__(self, failure_rate=0.5, slow_call_duration=None, slow_call_rate=0.5, window=20, min_calls=10,
+                 reset_timeout=5.0, clock=time.monotonic):
+        """
+        Initializes a closed breaker.
+
+        Args:
+            failure_rate (float, optional): The fraction of failed calls that opens the breaker.
+            slow_call_duration (float, optional): Seconds after which a call counts as slow; None disables it.
+            slow_call_rate (float, optional): The fraction of slow calls that opens the breaker.
+            window (int, optional): The number of recent calls considered.
+            min_calls (int, optional): The number of calls needed before the breaker can open.
+            reset_timeout (float, optional): Seconds to stay open before a trial call.
+            clock (callable, optional): Returns the current time in seconds.
+        """
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate = slow_call_rate
+        self.min_calls = min_calls
+        self.reset_timeout = reset_timeout
+        self.state = CLOSED
+        self.opened = 0
+        self._clock = clock
+        self._outcomes = collections.deque(maxlen=window)  # (failed, slow) per recent call.
+        self._opened_at = 0.0
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """
+        Decides whether a call may go ahead. Every allowed call must be followed by record().
+
+        Returns:
+            bool: False while the breaker is open, or while a half-open trial call is running.
+        """
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and not self._trial_running:
+                self._trial_running = True
+                return True
+            return False
+
+    def record(self, duration, failed=False):
+        """
+        Records the outcome of an allowed call.
+
+        Args:
+            duration (float): How long the call took, in seconds.
+            failed (bool, optional): Whether the call failed.
+        """
+        slow = self.slow_call_duration is not None and duration >= self.slow_call_duration
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._trial_running = False
+                if failed or slow:
+                    self._open()
+                else:
+                    self.state = CLOSED
+                    self._outcomes.clear()
+                return
+            self._outcomes.append((failed, slow))
+            if self.state == CLOSED and len(self._outcomes) >= self.min_calls:
+                failures = sum(outcome[0] for outcome in self._outcomes)
+                slow_calls = sum(outcome[1] for outcome in self._outcomes)
+                if (failures >= self.failure_rate * len(self._outcomes)
+                        or slow_calls and slow_calls >= self.slow_call_rate * len(self._outcomes)):
+                    self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened += 1
+        self._opened_at = self._clock()
+        self._outcomes.clear()
+
+
+# RetryBudget Class
+class RetryBudget:
+    """
+    Limits retries to a fraction of recent requests, so retries cannot multiply the load on
+    a gateway that is already struggling.
+
+    Within the last window seconds, a retry is allowed while the number of retries is below
+    min_retries + ratio * requests.
+    """
+    def __init__(self, ratio=0.2, min_retries=10, window=10.0, clock=time.monotonic):
+        """
+        Initializes an empty budget.
+
+        Args:
+            ratio (float, optional): Retries allowed per request.
+            min_retries (int, optional): Retries always allowed per window, for low traffic.
+            window (float, optional): The length of the sliding window, in seconds.
+            clock (callable, optional): Returns the current time in seconds.
+        """
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._clock = clock
+        self._requests = collections.deque()
+        self._retries = collections.deque()
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        """
+        Records a first attempt, which earns ratio retries.
+        """
+        with self._lock:
+            self._requests.append(self._clock())
+
+    def try_retry(self):
+        """
+        Spends one retry from the budget if there is one left.
+
+        Returns:
+            bool: True if the retry may go ahead.
+        """
+        with self._lock:
+            now = self._clock()
+            for timestamps in (self._requests, self._retries):
+                while timestamps and timestamps[0] <= now - self.window:
+                    timestamps.popleft()
+            if len(self._retries) >= self.min_retries + self.ratio * len(self._requests):
+                return False
+            self._retries.append(now)
+            return True
+
+
+# ResilientGateway Class
+class ResilientGateway:
+    """
+    Wraps a payment gateway with a circuit breaker, budgeted retries with jittered backoff,
+    and optional failover and hedging to a secondary gateway. It has the same
+    process_payment interface as the gateways it wraps, so it can be passed to PaymentService.
+
+    Payments are not idempotent, so only errors raised before the gateway received the
+    request (retry_on: GatewayUnavailable, such as a refused connection or HTTP 503) are
+    retried. When the gateway stays unavailable the result is a failure response rather
+    than an exception, like any other failed payment. Other gateway errors, such as a
+    GatewayTimeout waiting for the response, leave the payment's outcome unknown: they are
+    not retried, and the result is {"status": "unknown", ...}, which callers must reconcile
+    with the gateway before charging again (PaymentProcessing reports it as PAYMENT_PENDING,
+    OrderController as ORDER_PENDING). Declines ({"status": "failure"} responses) are
+    normal answers and are returned as they are.
+
+    With a secondary gateway, calls go to the secondary while the primary's breaker is open.
+    If hedge_delay is also set, a call that has not finished after hedge_delay seconds is
+    sent to the secondary too, and the first successful answer wins. Only enable hedging
+    when both gateways deduplicate the same payment, since either may complete the charge.
+
+    Attributes:
+        breaker (CircuitBreaker): The primary gateway's breaker.
+        secondary_breaker (CircuitBreaker): The secondary gateway's breaker, if there is one.
+        retry_budget (RetryBudget): The budget shared by every call through this gateway.
+        calls, retries, hedges, hedge_wins, short_circuited, failures, unknown (int): Statistics.
+    """
+    def __init__(self, primary, secondary=None, breaker=None, secondary_breaker=None, retry_budget=None,
+                 max_attempts=3, backoff_base=0.05, backoff_cap=1.0, hedge_delay=None, max_workers=8,
+                 retry_on=(GatewayUnavailable, ConnectionRefusedError), sleep=time.sleep, clock=time.monotonic):
+        """
+        Initializes the wrapper.
+
+        Args:
+            primary: The gateway to call; anything with process_payment(method, details, amount).
+            secondary (optional): A gateway used while the primary's breaker is open, and for hedging.
+            breaker (CircuitBreaker, optional): The primary's breaker; a default one is created if omitted.
+            secondary_breaker (CircuitBreaker, optional): The secondary's breaker.
+            retry_budget (RetryBudget, optional): Shared retry budget; a default one is created if omitted.
+            max_attempts (int, optional): Attempts per payment, including the first.
+            backoff_base (float, optional): The backoff before the first retry, in seconds.
+            backoff_cap (float, optional): The largest backoff, in seconds.
+            hedge_delay (float, optional): Seconds to wait before hedging to the secondary; None disables hedging.
+            max_workers (int, optional): Threads for hedged calls.
+            retry_on (tuple, optional): Exception types that are retried; only include errors raised
+                                        before the gateway received the request.
+            sleep (callable, optional): Waits between retries.
+            clock (callable, optional): Times calls for the breakers.
+        """
+        self.primary = primary
+        self.secondary = secondary
+        self.breaker = breaker or CircuitBreaker(clock=clock)
+        self.secondary_breaker = secondary_breaker or (CircuitBreaker(clock=clock) if secondary else None)
+        self.retry_budget = retry_budget or RetryBudget(clock=clock)
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.hedge_delay = hedge_delay if secondary else None
+        self.retry_on = retry_on
+        self.calls = self.retries = self.hedges = self.hedge_wins = self.short_circuited = self.failures = 0
+        self.unknown = 0
+        self._sleep = sleep
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(max_workers, "gateway-hedge") if self.hedge_delay is not None else None
+        self._lock = threading.Lock()
+
+    def process_payment(self, method, details, amount):
+        """
+        Processes a payment through the resilience layer.
+
+        Args:
+            method (str): Payment method (e.g., 'credit_card').
+            details (dict): Payment details (e.g., card number).
+            amount (float): Amount to be charged.
+
+        Returns:
+            dict: The gateway's response, {"status": "failure", "message": ...} if no gateway
+                  could be reached, or {"status": "unknown", "message": ...} if the gateway may
+                  have received the payment but did not answer.
+        """
+        self._count("calls")
+        self.retry_budget.record_request()
+        attempt = 1
+        while True:
+            try:
+                return self._call(method, details, amount)
+            except CircuitOpenError as e:
+                self._count("short_circuited")
+                return {"status": "failure", "message": f"Payment gateway unavailable: {e}"}
+            except self.retry_on as e:
+                if attempt >= self.max_attempts or not self.retry_budget.try_retry():
+                    self._count("failures")
+                    return {"status": "failure", "message": f"Payment gateway unavailable: {e}"}
+            except (GatewayError, OSError) as e:
+                # The request may have reached the gateway, so retrying could charge the payment twice.
+                self._count("unknown")
+                return {"status": "unknown", "message": f"Payment outcome unknown: {e}"}
+            self._count("retries")
+            self._sleep(jittered_backoff(attempt, self.backoff_base, self.backoff_cap))
+            attempt += 1
+
+    def _call(self, method, details, amount):
+        if self._executor is not None:
+            return self._hedged(method, details, amount)
+        try:
+            return self._attempt(self.primary, self.breaker, method, details, amount)
+        except CircuitOpenError:
+            if self.secondary is None:
+                raise
+            return self._attempt(self.secondary, self.secondary_breaker, method, details, amount)
+
+    def _hedged(self, method, details, amount):
+        primary = self._executor.submit(self._attempt, self.primary, self.breaker, method, details, amount)
+        done, _ = wait([primary], timeout=self.hedge_delay)
+        if done:
+            if not isinstance(primary.exception(), CircuitOpenError):
+                return primary.result()
+            return self._attempt(self.secondary, self.secondary_breaker, method, details, amount)
+
+        self._count("hedges")
+        secondary = self._executor.submit(self._attempt, self.secondary, self.secondary_breaker,
+                                          method, details, amount)
+        pending = {primary, secondary}
+        error = None
+        while pending:
+            done, pending = wait(pending, return_when="FIRST_COMPLETED")
+            for future in done:
+                if future.exception() is None:
+                    if future is secondary:
+                        self._count("hedge_wins")
+                    return future.result()
+                # Prefer reporting a real gateway error over the secondary's open circuit.
+                if error is None or isinstance(error, CircuitOpenError):
+                    error = future.exception()
+        raise error
+
+    def _attempt(self, gateway, breaker, method, details, amount):
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {type(gateway).__name__}")
+        start = self._clock()
+        try:
+            response = gateway.process_payment(method, details, amount)
+        except BaseException:
+            breaker.record(self._clock() - start, failed=True)
+            raise
+        breaker.record(self._clock() - start)
+        return response
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def close(self):
+        """
+        Stops the hedging threads, waiting for hedged calls that are still running.
+        """
+        if self._executor is not None:
+            self._executor.shutdown()
@@ -0,0 +1,233 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds in nanoseconds: powers of two from 1.024us to ~68.7s.
+BUCKET_BOUNDS = tuple(1 << exponent for exponent in range(10, 37))
+
+
+# Histogram Class
+class Histogram:
+    """
+    A latency histogram with logarithmic (power-of-two) buckets.
+
+    Attributes:
+        count (int): The number of observations.
+        total (int): The sum of all observations, in nanoseconds.
+        min (int): The smallest observation, or None if there are none.
+        max (int): The largest observation, or None if there are none.
+        buckets (list): Observation counts per bucket; the last bucket collects values above
+                        the largest bound in BUCKET_BOUNDS.
+    """
+    __slots__ = ("count", "total", "min", "max", "buckets")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = None
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+
+    def record(self, nanoseconds):
+        """
+        Adds an observation.
+
+        Args:
+            nanoseconds (int): The observed duration.
+        """
+        self.count += 1
+        self.total += nanoseconds
+        if self.min is None or nanoseconds < self.min:
+            self.min = nanoseconds
+        if self.max is None or nanoseconds > self.max:
+            self.max = nanoseconds
+        # Bucket i holds values up to 2 ** (i + 10) ns.
+        index = max((nanoseconds - 1).bit_length() - 10, 0) if nanoseconds > 0 else 0
+        self.buckets[min(index, len(BUCKET_BOUNDS))] += 1
+
+    def percentile(self, fraction):
+        """
+        Estimates a percentile as the upper bound of the bucket that contains it.
+
+        Args:
+            fraction (float): The percentile as a fraction, e.g. 0.99.
+
+        Returns:
+            int: The estimated percentile in nanoseconds, or None if there are no observations.
+        """
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank and bucket:
+                return min(BUCKET_BOUNDS[index], self.max) if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def to_dict(self):
+        return {"count": self.count, "sum_ns": self.total, "min_ns": self.min, "max_ns": self.max,
+                "p50_ns": self.percentile(0.50), "p99_ns": self.percentile(0.99), "buckets": list(self.buckets)}
+
+
+# Metrics Class
+class Metrics:
+    """
+    A registry of counters and latency histograms for hot code paths.
+
+    Instrumented code checks the enabled attribute before doing any work, so when metrics
+    are disabled (the default) the only cost is that attribute check:
+
+        t0 = perf_counter_ns() if metrics.enabled else 0
+        try:
+            ...
+        finally:
+            if t0:
+                metrics.observe("checkout.confirm_order", perf_counter_ns() - t0)
+
+    Attributes:
+        enabled (bool): Whether instrumented code records metrics.
+    """
+    def __init__(self, enabled=False):
+        """
+        Initializes an empty registry.
+
+        Args:
+            enabled (bool, optional): Whether to start recording immediately.
+        """
+        self.enabled = enabled
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name, amount=1):
+        """
+        Adds to a counter.
+
+        Args:
+            name (str): The counter name, e.g. "payment.failed".
+            amount (int, optional): The amount to add.
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + amount
+
+    def observe(self, name, nanoseconds):
+        """
+        Records a duration in a latency histogram.
+
+        Args:
+            name (str): The timer name, e.g. "checkout.confirm_order".
+            nanoseconds (int): The duration.
+        """
+        with self._lock:
+            histogram = self._histograms.get(name)
+            if histogram is None:
+                histogram = self._histograms[name] = Histogram()
+            histogram.record(nanoseconds)
+
+    @contextmanager
+    def timer(self, name):
+        """
+        Times the enclosed block, for code outside the hot paths.
+
+        Args:
+            name (str): The timer name.
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter_ns() - start)
+
+    def reset(self):
+        """
+        Discards every counter and histogram.
+        """
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        """
+        Returns a consistent copy of every metric.
+
+        Returns:
+            dict: {"counters": {name: value}, "timers": {name: histogram summary}}, where each
+                  summary has count, sum_ns, min_ns, max_ns, p50_ns, p99_ns and bucket counts.
+        """
+        with self._lock:
+            return {"counters": dict(self._counters),
+                    "timers": {name: histogram.to_dict() for name, histogram in self._histograms.items()}}
+
+    def export_text(self):
+        """
+        Formats every metric in the Prometheus text exposition format.
+
+        Returns:
+            str: One line per counter and per histogram bucket, sum and count.
+        """
+        snapshot = self.snapshot()
+        lines = []
+        for name, value in sorted(snapshot["counters"].items()):
+            metric = _metric_name(name)
+            lines.append(f"# TYPE {metric}_total counter")
+            lines.append(f"{metric}_total {value}")
+        for name, timer in sorted(snapshot["timers"].items()):
+            metric = _metric_name(name) + "_seconds"
+            lines.append(f"# TYPE {metric} histogram")
+            cumulative = 0
+            for bound, bucket in zip(BUCKET_BOUNDS, timer["buckets"]):
+                cumulative += bucket
+                lines.append(f'{metric}_bucket{{le="{bound / 1e9:.9g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{le="+Inf"}} {timer["count"]}')
+            lines.append(f"{metric}_sum {timer['sum_ns'] / 1e9:.9f}")
+            lines.append(f"{metric}_count {timer['count']}")
+        return "\n".join(lines) + "\n"
+
+    def write_text(self, path):
+        """
+        Writes export_text() to a file atomically, so a scraper never reads a partial file.
+
+        Args:
+            path (str): The destination file.
+        """
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "w") as f:
+            f.write(self.export_text())
+        os.replace(temporary, path)
+
+
+def _metric_name(name):
+    return "".join(character if character.isalnum() else "_" for character in name)
+
+
+def start_file_export(path, interval=15.0, registry=None):
+    """
+    Rewrites a metrics file in the background every interval seconds, for a local scraper to read.
+
+    Args:
+        path (str): The destination file.
+        interval (float, optional): Seconds between writes.
+        registry (Metrics, optional): The registry to export; defaults to the process-wide one.
+
+    Returns:
+        threading.Event: Set it to stop exporting; the file is written once more before stopping.
+    """
+    registry = registry or metrics
+    stop = threading.Event()
+
+    def export():
+        while not stop.wait(interval):
+            registry.write_text(path)
+        registry.write_text(path)
+
+    threading.Thread(target=export, name="metrics-export", daemon=True).start()
+    return stop
+
+
+# The process-wide registry used by the instrumented modules; set ORDER_METRICS=1 to enable it at startup.
+metrics = Metrics(enabled=os.environ.get("ORDER_METRICS") == "1")
@@ -2,14 +2,19 @@ import tkinter as tk
 from tkinter import messagebox, ttk
 import json
 import os
+import queue
 
 from User_Registration import UserRegistration
 from Order_Placement import Cart, OrderPlacement, UserProfile, RestaurantMenu, PaymentMethod
+from order_events import OrderStatusBus
+from delivery_eta import EtaCalculator
 from Payment_Processing import PaymentProcessing
 from Restaurant_Browsing import RestaurantDatabase, RestaurantBrowsing
 
 # Utility functions for user data storage
 USERS_FILE = "users.json"
+# How often the UI thread checks for order status updates, in milliseconds.
+STATUS_POLL_MS = 100
 
 def load_users():
     if not os.path.exists(USERS_FILE):
@@ -172,8 +177,15 @@ class MainAppFrame(tk.Frame):
         # Create user's profile and cart
         self.user_profile = UserProfile(delivery_address="123 Main St")
         self.cart = Cart()
-        self.restaurant_menu = RestaurantMenu(available_items=["Burger", "Pizza", "Salad"])
-        self.order_placement = OrderPlacement(self.cart, self.user_profile, self.restaurant_menu)
+        self.restaurant_menu = RestaurantMenu(available_items={"Burger": 8.99, "Pizza": 12.99, "Salad": 7.49})
+        self.eta_calculator = EtaCalculator(self.database)
+        # Status updates are delivered on a worker thread, which must not call Tk; it queues them
+        # and the Tk event loop polls the queue in show_status_updates.
+        self.status_updates = queue.SimpleQueue()
+        self.status_bus = OrderStatusBus(max_workers=1)
+        self.status_bus.subscribe(self.status_updates.put)
+        self.order_placement = OrderPlacement(self.cart, self.user_profile, self.restaurant_menu,
+                                              status_bus=self.status_bus)
 
         # Search Frame
         search_frame = tk.Frame(self)
@@ -184,10 +196,11 @@ class MainAppFrame(tk.Frame):
         tk.Button(search_frame, text="Search", command=self.search_restaurants).pack(side="left")
 
         # Results Treeview
-        self.results_tree = ttk.Treeview(self, columns=("cuisine", "location", "rating"), show="headings")
+        self.results_tree = ttk.Treeview(self, columns=("cuisine", "location", "rating", "eta"), show="headings")
         self.results_tree.heading("cuisine", text="Cuisine")
         self.results_tree.heading("location", text="Location")
         self.results_tree.heading("rating", text="Rating")
+        self.results_tree.heading("eta", text="Delivery")
         self.results_tree.pack(pady=10, fill="x")
 
         # Buttons for actions
@@ -198,6 +211,8 @@ class MainAppFrame(tk.Frame):
         tk.Button(action_frame, text="View Cart", command=self.view_cart).pack(side="left", padx=5)
         tk.Button(action_frame, text="Checkout", command=self.checkout).pack(side="left", padx=5)
 
+        self.show_status_updates()
+
         # Show Checkout Popup
         checkout_popup = CheckoutPopup(self, self.order_placement)
         self.wait_window(checkout_popup)
@@ -237,9 +252,22 @@ class MainAppFrame(tk.Frame):
     def update_status(self):
         # ここではテスト用にステータスを変更します
         new_status = "Out for Delivery"
-        self.master.order.update_status(new_status)
+        try:
+            self.order_placement.update_status(new_status)
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
         self.status_label.config(text=f"Order Status: {new_status}")
 
+    def show_status_updates(self):
+        while True:
+            try:
+                event = self.status_updates.get_nowait()
+            except queue.Empty:
+                break
+            self.notify(event.status)
+        self.after(STATUS_POLL_MS, self.show_status_updates)
+
     def notify(self, status):
         messagebox.showinfo("Order Status Update", f"Your order status is now: {status}")
 
@@ -251,14 +279,18 @@ class MainAppFrame(tk.Frame):
         self.results_tree.delete(*self.results_tree.get_children())
         cuisine = self.cuisine_var.get().strip()
         results = self.browsing.search_by_filters(cuisine_type=cuisine if cuisine else None)
-        for r in results:
-            self.results_tree.insert("", "end", values=(r["cuisine"], r["location"], r["rating"]))
+        self.show_results(results)
 
     def view_all_restaurants(self):
         self.results_tree.delete(*self.results_tree.get_children())
         results = self.database.get_restaurants()
+        self.show_results(results)
+
+    def show_results(self, results):
+        address = self.user_profile.current_address or self.user_profile.delivery_address
         for r in results:
-            self.results_tree.insert("", "end", values=(r["cuisine"], r["location"], r["rating"]))
+            eta = self.eta_calculator.estimate(r["name"], address)
+            self.results_tree.insert("", "end", values=(r["cuisine"], r["location"], r["rating"], eta))
 
     def add_item_to_cart(self):
         # For simplicity, let's assume user always adds "Pizza"
@@ -400,7 +432,7 @@ class AddItemPopup(tk.Toplevel):
     def add_to_cart(self):
         item = self.item_var.get()
         qty = int(self.qty_entry.get())
-        price = 10.0  # Static price for simplicity
+        price = self.menu.get_price(item)
         msg = self.cart.add_item(item, price, qty)
         messagebox.showinfo("Cart", msg)
         self.destroy()
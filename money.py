@@ -0,0 +1,156 @@
+from decimal import (Decimal, ROUND_CEILING, ROUND_DOWN, ROUND_FLOOR, ROUND_HALF_DOWN, ROUND_HALF_EVEN,
+                     ROUND_HALF_UP, ROUND_UP)
+
+MINOR_UNITS = 100  # Cents per currency unit.
+
+ROUNDING_MODES = (ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_HALF_DOWN, ROUND_UP, ROUND_DOWN, ROUND_CEILING, ROUND_FLOOR)
+
+
+def to_minor(amount, rounding=ROUND_HALF_UP):
+    """
+    Converts an amount in currency units to an integer number of minor units (cents).
+
+    Args:
+        amount (int, float, str or Decimal): The amount to convert, e.g. 8.99 or "8.99".
+        rounding (str, optional): The decimal rounding mode used for sub-cent amounts.
+
+    Returns:
+        int: The amount in minor units, e.g. 899.
+    """
+    if isinstance(amount, int):
+        return amount * MINOR_UNITS
+    if isinstance(amount, float):
+        # Fast path: most prices are already whole cents, so the scaled float is within
+        # representation error of an integer.
+        scaled = amount * MINOR_UNITS
+        nearest = round(scaled)
+        if abs(scaled - nearest) < 1e-6:
+            return int(nearest)
+        amount = repr(amount)
+    return int((Decimal(amount) * MINOR_UNITS).quantize(Decimal(1), rounding=rounding))
+
+
+def from_minor(minor):
+    """
+    Converts an integer number of minor units back to currency units.
+
+    Args:
+        minor (int): The amount in minor units.
+
+    Returns:
+        float: The amount in currency units, e.g. 8.99.
+    """
+    return minor / MINOR_UNITS
+
+
+def divide_rounded(numerator, denominator, rounding=ROUND_HALF_UP):
+    """
+    Divides two integers, rounding the quotient to an integer with the given decimal rounding mode.
+
+    Args:
+        numerator (int): The dividend.
+        denominator (int): The divisor, which must be positive.
+        rounding (str, optional): One of the decimal module's rounding modes.
+
+    Returns:
+        int: The rounded quotient.
+
+    Raises:
+        ValueError: If the rounding mode is not supported.
+    """
+    quotient, remainder = divmod(numerator, denominator)  # Floor division; remainder is non-negative.
+    if not remainder:
+        return quotient
+    if rounding == ROUND_FLOOR:
+        return quotient
+    if rounding == ROUND_CEILING:
+        return quotient + 1
+    if rounding == ROUND_DOWN:
+        return quotient if numerator >= 0 else quotient + 1
+    if rounding == ROUND_UP:
+        return quotient + 1 if numerator >= 0 else quotient
+
+    twice_remainder = remainder * 2
+    if twice_remainder != denominator:
+        return quotient + 1 if twice_remainder > denominator else quotient
+    # Exactly half way between quotient and quotient + 1.
+    if rounding == ROUND_HALF_UP:
+        return quotient + 1 if numerator >= 0 else quotient
+    if rounding == ROUND_HALF_DOWN:
+        return quotient if numerator >= 0 else quotient + 1
+    if rounding == ROUND_HALF_EVEN:
+        return quotient + (quotient & 1)
+    raise ValueError(f"Unsupported rounding mode: {rounding}")
+
+
+class PricingRules:
+    """
+    Tax and delivery fee rules applied to a cart subtotal held in integer minor units.
+
+    Attributes:
+        tax_rate (Decimal): The tax rate, e.g. Decimal("0.10") for 10%.
+        delivery_fee (int): The flat delivery fee in minor units.
+        rounding (str): The decimal rounding mode used when the tax is not a whole number of minor units.
+    """
+    def __init__(self, tax_rate="0.10", delivery_fee="5.00", rounding=ROUND_HALF_UP):
+        """
+        Initializes the pricing rules.
+
+        Args:
+            tax_rate (str, float or Decimal, optional): The tax rate as a fraction of the subtotal.
+            delivery_fee (str, float or Decimal, optional): The flat delivery fee in currency units.
+            rounding (str, optional): One of the decimal module's rounding modes.
+
+        Raises:
+            ValueError: If the rounding mode is not supported.
+        """
+        if rounding not in ROUNDING_MODES:
+            raise ValueError(f"Unsupported rounding mode: {rounding}")
+        self.tax_rate = Decimal(str(tax_rate))
+        self.delivery_fee = to_minor(delivery_fee if isinstance(delivery_fee, int) else str(delivery_fee))
+        self.rounding = rounding
+        self._tax_numerator, self._tax_denominator = self.tax_rate.as_integer_ratio()
+
+    def calculate_tax(self, subtotal):
+        """
+        Calculates the tax on a subtotal.
+
+        Args:
+            subtotal (int): The subtotal in minor units.
+
+        Returns:
+            int: The tax in minor units, rounded with the configured rounding mode.
+        """
+        return divide_rounded(subtotal * self._tax_numerator, self._tax_denominator, self.rounding)
+
+    def breakdown_minor(self, subtotal):
+        """
+        Applies tax and the delivery fee to a subtotal.
+
+        Args:
+            subtotal (int): The subtotal in minor units.
+
+        Returns:
+            dict: The subtotal, tax, delivery fee, and total cost, all in minor units.
+        """
+        tax = self.calculate_tax(subtotal)
+        return {"subtotal": subtotal, "tax": tax, "delivery_fee": self.delivery_fee,
+                "total": subtotal + tax + self.delivery_fee}
+
+    def breakdown(self, subtotal):
+        """
+        Applies tax and the delivery fee to a subtotal, converting the results to currency units.
+
+        Args:
+            subtotal (int): The subtotal in minor units.
+
+        Returns:
+            dict: A dictionary containing the subtotal, tax, delivery fee, and total cost.
+        """
+        tax = self.calculate_tax(subtotal)
+        total = subtotal + tax + self.delivery_fee
+        return {"subtotal": subtotal / MINOR_UNITS, "tax": tax / MINOR_UNITS,
+                "delivery_fee": self.delivery_fee / MINOR_UNITS, "total": total / MINOR_UNITS}
+
+
+DEFAULT_PRICING = PricingRules()
@@ -0,0 +1,209 @@
+import itertools
+import logging
+import threading
+from collections import deque
+
+logger = logging.getLogger(__name__)
+
+# Order lifecycle, in order. An order may skip forward (e.g. Pending -> Preparing) but never
+# move backwards, and can be cancelled until it is delivered.
+ORDER_STATUSES = ("Pending", "Confirmed", "Preparing", "Out for Delivery", "Delivered")
+CANCELLED = "Cancelled"
+TERMINAL_STATUSES = frozenset({"Delivered", CANCELLED})
+
+STATUS_TRANSITIONS = {status: frozenset(ORDER_STATUSES[index + 1:]) | {CANCELLED}
+                      for index, status in enumerate(ORDER_STATUSES)}
+STATUS_TRANSITIONS.update({status: frozenset() for status in TERMINAL_STATUSES})
+
+
+def validate_status_transition(current, new_status):
+    """
+    Checks that an order may move from one status to another.
+
+    Args:
+        current (str): The order's current status.
+        new_status (str): The requested status.
+
+    Raises:
+        ValueError: If the status is unknown or the transition is not allowed.
+    """
+    if new_status not in STATUS_TRANSITIONS:
+        raise ValueError(f"Unknown order status: {new_status}")
+    if new_status not in STATUS_TRANSITIONS.get(current, ()):
+        raise ValueError(f"Invalid status transition: {current} -> {new_status}")
+
+
+# StatusEvent Class
+class StatusEvent:
+    """
+    A change in an order's status.
+
+    Attributes:
+        order_id (str): The order's ID, or None if the order has not been confirmed yet.
+        status (str): The new status.
+        previous (str): The status before the change.
+        sequence (int): Increases with every published event, so clients can discard stale updates.
+    """
+    __slots__ = ("order_id", "status", "previous", "sequence")
+
+    def __init__(self, order_id, status, previous, sequence):
+        self.order_id = order_id
+        self.status = status
+        self.previous = previous
+        self.sequence = sequence
+
+    def __repr__(self):
+        return f"StatusEvent({self.order_id!r}, {self.previous!r} -> {self.status!r}, #{self.sequence})"
+
+
+# OrderStatusBus Class
+class OrderStatusBus:
+    """
+    Delivers order status changes to any number of subscribers on a pool of worker threads.
+
+    Publishing never waits for subscribers. Events for the same order are delivered one at a
+    time and in order; if an order changes status again before its previous event has been
+    delivered, the pending event is replaced, so subscribers only see the latest status.
+    A subscriber that raises is logged and does not affect the other subscribers.
+
+    Attributes:
+        published (int): The number of events published.
+        delivered (int): The number of events delivered to subscribers.
+        coalesced (int): The number of events replaced by a newer event before delivery.
+    """
+    def __init__(self, max_workers=4):
+        """
+        Initializes the bus and starts its worker threads.
+
+        Args:
+            max_workers (int, optional): The number of delivery threads.
+        """
+        self._subscribers = ()
+        self._pending = {}  # Maps order key -> latest undelivered event.
+        self._active = set()  # Order keys that are queued in _ready or being delivered.
+        self._ready = deque()  # Order keys waiting for a worker.
+        self._lock = threading.Lock()
+        self._work_available = threading.Condition(self._lock)
+        self._all_delivered = threading.Condition(self._lock)
+        self._idle_workers = 0
+        self._closed = False
+        self._sequence = itertools.count(1)
+        self.published = 0
+        self.delivered = 0
+        self.coalesced = 0
+        self._workers = [threading.Thread(target=self._work, name=f"order-status-{index}", daemon=True)
+                         for index in range(max_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def subscribe(self, callback):
+        """
+        Registers a callback to receive every delivered StatusEvent.
+
+        Args:
+            callback (callable): Called with a StatusEvent on a worker thread.
+
+        Returns:
+            callable: The callback, for passing to unsubscribe.
+        """
+        with self._lock:
+            self._subscribers += (callback,)
+        return callback
+
+    def unsubscribe(self, callback):
+        """
+        Removes a previously registered callback. Unknown callbacks are ignored.
+
+        Args:
+            callback (callable): The callback to remove.
+        """
+        with self._lock:
+            self._subscribers = tuple(subscriber for subscriber in self._subscribers if subscriber is not callback)
+
+    def publish(self, key, status, previous=None, order_id=None):
+        """
+        Queues a status change for delivery.
+
+        Args:
+            key (hashable): Identifies the order; undelivered events with the same key are coalesced.
+            status (str): The new status.
+            previous (str, optional): The status before the change.
+            order_id (str, optional): The order's ID.
+
+        Returns:
+            StatusEvent: The published event.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Cannot publish to a closed OrderStatusBus")
+            event = StatusEvent(order_id, status, previous, next(self._sequence))
+            self.published += 1
+            if key in self._pending:
+                self.coalesced += 1
+            self._pending[key] = event
+            if key not in self._active:
+                # Otherwise the order is already queued or being delivered, and its worker
+                # picks up the latest event afterwards, which keeps each order's events in order.
+                self._active.add(key)
+                self._ready.append(key)
+                if self._idle_workers:
+                    self._work_available.notify()
+        return event
+
+    def _work(self):
+        lock = self._lock
+        while True:
+            with lock:
+                while not self._ready:
+                    if self._closed:
+                        return
+                    self._idle_workers += 1
+                    self._work_available.wait()
+                    self._idle_workers -= 1
+                key = self._ready.popleft()
+                event = self._pending.pop(key)
+                subscribers = self._subscribers
+                self.delivered += 1
+
+            for callback in subscribers:
+                try:
+                    callback(event)
+                except Exception:
+                    logger.exception("Order status subscriber %r failed for %r", callback, event)
+
+            with lock:
+                if key in self._pending:
+                    self._ready.append(key)  # Published again during delivery.
+                else:
+                    self._active.discard(key)
+                    if not self._active:
+                        self._all_delivered.notify_all()
+
+    def flush(self, timeout=None):
+        """
+        Waits until every published event has been delivered.
+
+        Args:
+            timeout (float, optional): The maximum number of seconds to wait.
+
+        Returns:
+            bool: True if all events were delivered, False if the timeout expired.
+        """
+        with self._lock:
+            return self._all_delivered.wait_for(lambda: not self._active, timeout)
+
+    def close(self):
+        """
+        Delivers the remaining events and stops the worker threads.
+        """
+        with self._lock:
+            self._closed = True
+            self._work_available.notify_all()
+        for worker in self._workers:
+            worker.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -1,3 +1,6 @@
+from bisect import bisect_left
+
+
 class OrderHistory:
     """
     ユーザーの注文履歴を管理するクラス
@@ -16,9 +19,7 @@ class OrderHistory:
             email (str): ユーザーのメールアドレス。
             order (dict): 注文内容を含む辞書。
         """
-        if email not in self.orders:
-            self.orders[email] = []
-        self.orders[email].append(order)
+        self.orders.setdefault(email, []).append(order)  # 複数スレッドから追加しても注文が失われないようにします
 
     def view_order_history(self, email):
         """
@@ -35,6 +36,25 @@ class OrderHistory:
             return {"success": False, "error": "No orders found"}  # 注文履歴がない場合
         return {"success": True, "orders": self.orders[email]}  # 注文履歴がある場合
 
+    def view_orders_between(self, email, start_id, end_id):
+        """
+        注文IDの範囲でユーザーの注文履歴を取得します。
+        注文IDは時刻順に採番されるため、注文は追加された順にIDで整列しており、二分探索で範囲を特定できます。
+
+        Args:
+            email (str): ユーザーのメールアドレス。
+            start_id (str): 範囲の開始注文ID（この値を含む）。order_ids.order_id_for_time で時刻から作成できます。
+            end_id (str): 範囲の終了注文ID（この値を含まない）。
+
+        Returns:
+            list: "order_id" が範囲内にある注文のリスト。
+        """
+        orders = self.orders.get(email, [])
+        order_id = lambda order: order["order_id"]
+        start = bisect_left(orders, start_id, key=order_id)
+        end = bisect_left(orders, end_id, lo=start, key=order_id)
+        return orders[start:end]
+
 class UserProfile:
     """
     ユーザープロフィールを管理するクラス。
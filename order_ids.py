@@ -0,0 +1,250 @@
+import os
+import threading
+import time
+import weakref
+
+# Snowflake-style 63-bit IDs: | 41 bits milliseconds since EPOCH_MS | 10 bits worker id | 12 bits sequence |
+EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+WORKER_ID_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_ID_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+TIMESTAMP_SHIFT = WORKER_ID_BITS + SEQUENCE_BITS
+
+ORDER_ID_PREFIX = "ORD"
+ORDER_ID_DIGITS = 19  # Zero-padded, so formatted IDs sort in the same order as the numbers.
+
+# Every generator, so that forked children stop issuing IDs until they are given their own worker id.
+_generators = weakref.WeakSet()
+
+
+def check_worker_id(worker_id):
+    """
+    Checks that a worker id fits in the ID's worker field.
+
+    Args:
+        worker_id (int): The worker id.
+
+    Returns:
+        int: The worker id.
+
+    Raises:
+        ValueError: If the worker id is not an integer between 0 and MAX_WORKER_ID.
+    """
+    if not isinstance(worker_id, int) or isinstance(worker_id, bool) or not 0 <= worker_id <= MAX_WORKER_ID:
+        raise ValueError(f"Worker id must be an integer between 0 and {MAX_WORKER_ID}, got {worker_id!r}")
+    return worker_id
+
+
+def default_worker_id():
+    """
+    Reads this process's worker id from the ORDER_WORKER_ID environment variable.
+
+    IDs are only unique if every process that issues them concurrently has its own worker id,
+    so deployments running several worker processes must give each one a distinct
+    ORDER_WORKER_ID. When the variable is unset, worker id 0 is used, which is only safe
+    for a single process.
+
+    Returns:
+        int: A worker id between 0 and MAX_WORKER_ID.
+
+    Raises:
+        ValueError: If ORDER_WORKER_ID is not an integer between 0 and MAX_WORKER_ID.
+    """
+    configured = os.environ.get("ORDER_WORKER_ID")
+    if configured is None:
+        return 0
+    try:
+        worker_id = int(configured)
+    except ValueError:
+        raise ValueError(f"ORDER_WORKER_ID must be an integer between 0 and {MAX_WORKER_ID}, "
+                         f"got {configured!r}") from None
+    return check_worker_id(worker_id)
+
+
+def format_order_id(order_id):
+    """
+    Formats a numeric order ID for display and storage, e.g. "ORD0000123456789012345".
+
+    Args:
+        order_id (int): The numeric ID.
+
+    Returns:
+        str: The formatted order ID.
+    """
+    return f"{ORDER_ID_PREFIX}{order_id:0{ORDER_ID_DIGITS}d}"
+
+
+def parse_order_id(order_id):
+    """
+    Converts a formatted order ID back to its numeric value.
+
+    Args:
+        order_id (str): The formatted order ID.
+
+    Returns:
+        int: The numeric ID.
+
+    Raises:
+        ValueError: If the string is not a formatted order ID.
+    """
+    if not order_id.startswith(ORDER_ID_PREFIX):
+        raise ValueError(f"Invalid order ID: {order_id}")
+    return int(order_id[len(ORDER_ID_PREFIX):])
+
+
+def order_id_for_time(timestamp, epoch_ms=EPOCH_MS):
+    """
+    Returns the smallest order ID that can be issued at the given time, for range-scanning orders by ID.
+
+    Args:
+        timestamp (float): Seconds since the Unix epoch.
+        epoch_ms (int, optional): The generator's custom epoch in milliseconds.
+
+    Returns:
+        str: The formatted lower-bound order ID.
+    """
+    return format_order_id(max(int(timestamp * 1000) - epoch_ms, 0) << TIMESTAMP_SHIFT)
+
+
+def timestamp_of(order_id, epoch_ms=EPOCH_MS):
+    """
+    Extracts the issue time from an order ID.
+
+    Args:
+        order_id (int or str): The numeric or formatted order ID.
+        epoch_ms (int, optional): The generator's custom epoch in milliseconds.
+
+    Returns:
+        float: Seconds since the Unix epoch.
+    """
+    if isinstance(order_id, str):
+        order_id = parse_order_id(order_id)
+    return ((order_id >> TIMESTAMP_SHIFT) + epoch_ms) / 1000
+
+
+class OrderIdGenerator:
+    """
+    Issues unique, time-ordered order IDs.
+
+    Each ID packs the milliseconds since a custom epoch, a worker id and a per-millisecond
+    sequence number, so generators with different worker ids never collide and IDs from the
+    same generator are strictly increasing. If the sequence is exhausted within a millisecond,
+    or the system clock steps backwards, the generator advances its own logical clock instead
+    of blocking.
+
+    A forked child process inherits its parent's generators and worker ids, so in the child
+    they raise RuntimeError until set_worker_id() gives them a worker id of their own.
+
+    Attributes:
+        worker_id (int): The worker id embedded in every ID.
+        epoch_ms (int): The custom epoch in milliseconds since the Unix epoch.
+    """
+    def __init__(self, worker_id, epoch_ms=EPOCH_MS, clock=time.time_ns):
+        """
+        Initializes the generator.
+
+        Args:
+            worker_id (int): A worker id between 0 and MAX_WORKER_ID, unique among the processes
+                             issuing IDs; see default_worker_id.
+            epoch_ms (int, optional): The custom epoch in milliseconds since the Unix epoch.
+            clock (callable, optional): Returns the current time in nanoseconds.
+
+        Raises:
+            ValueError: If the worker id is out of range.
+        """
+        self.worker_id = check_worker_id(worker_id)
+        self.epoch_ms = epoch_ms
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = -1
+        self._sequence = 0
+        _generators.add(self)
+
+    def set_worker_id(self, worker_id):
+        """
+        Assigns a new worker id, e.g. in a forked worker process.
+
+        Args:
+            worker_id (int): A worker id between 0 and MAX_WORKER_ID.
+
+        Raises:
+            ValueError: If the worker id is out of range.
+        """
+        with self._lock:
+            self.worker_id = check_worker_id(worker_id)
+
+    def _reset_after_fork(self):
+        self._lock = threading.Lock()
+        self.worker_id = None
+
+    def _worker_bits(self):
+        if self.worker_id is None:
+            raise RuntimeError("This generator was inherited from the parent process; "
+                               "call set_worker_id() with this process's own worker id first")
+        return self.worker_id << SEQUENCE_BITS
+
+    def next_id(self):
+        """
+        Issues the next order ID.
+
+        Returns:
+            int: A unique, time-ordered 63-bit ID.
+        """
+        now_ms = self._clock() // 1_000_000 - self.epoch_ms
+        with self._lock:
+            worker_bits = self._worker_bits()
+            if now_ms > self._last_ms:
+                self._sequence = 0
+            else:
+                # Same millisecond (or the clock stepped back): continue from the last timestamp.
+                self._sequence = (self._sequence + 1) & MAX_SEQUENCE
+                now_ms = self._last_ms if self._sequence else self._last_ms + 1
+            self._last_ms = now_ms
+            return now_ms << TIMESTAMP_SHIFT | worker_bits | self._sequence
+
+    def next_ids(self, count):
+        """
+        Issues a block of order IDs under a single lock acquisition.
+
+        Args:
+            count (int): The number of IDs to issue.
+
+        Returns:
+            list: The IDs, in increasing order.
+        """
+        ids = []
+        now_ms = self._clock() // 1_000_000 - self.epoch_ms
+        with self._lock:
+            worker_bits = self._worker_bits()
+            last_ms, sequence = self._last_ms, self._sequence
+            if now_ms > last_ms:
+                last_ms, sequence = now_ms, -1
+            for _ in range(count):
+                sequence += 1
+                if sequence > MAX_SEQUENCE:
+                    last_ms, sequence = last_ms + 1, 0
+                ids.append(last_ms << TIMESTAMP_SHIFT | worker_bits | sequence)
+            self._last_ms, self._sequence = last_ms, sequence
+        return ids
+
+    def next_order_id(self):
+        """
+        Issues the next order ID, formatted for display and storage.
+
+        Returns:
+            str: The formatted order ID.
+        """
+        return format_order_id(self.next_id())
+
+
+def _reset_generators_after_fork():
+    for generator in list(_generators):
+        generator._reset_after_fork()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_generators_after_fork)
+
+# The process-wide generator; its worker id comes from ORDER_WORKER_ID.
+default_generator = OrderIdGenerator(default_worker_id())
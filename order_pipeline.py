@@ -0,0 +1,252 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+from Order_Placement import availability_result
+from order_ids import default_generator
+
+_STOP = object()  # Queue sentinel that tells a stage worker to exit.
+
+
+class OrderRejected(Exception):
+    """
+    Raised by a stage to end an order's trip through the pipeline without an error,
+    e.g. when validation or payment fails. The order's future resolves to a failure result.
+    """
+
+
+# PipelineStage Class
+class PipelineStage:
+    """
+    One step of an OrderPipeline: a bounded input queue served by its own worker threads.
+
+    Attributes:
+        name (str): The stage name, used in results and statistics.
+        func (callable): Called with the order dict; returns the order dict for the next stage.
+        workers (int): The number of worker threads.
+        queue (queue.Queue): The bounded input queue.
+        processed (int): Orders the stage passed on.
+        rejected (int): Orders the stage rejected with OrderRejected.
+        failed (int): Orders the stage failed with any other exception.
+        busy_time (float): Total seconds spent in func.
+        total_latency (float): Total seconds orders spent queued and processing in this stage.
+        max_latency (float): The longest time, in seconds, an order spent queued and processing in this stage.
+    """
+    def __init__(self, name, func, workers=1, queue_size=100):
+        """
+        Initializes the stage.
+
+        Args:
+            name (str): The stage name.
+            func (callable): The stage's processing function.
+            workers (int, optional): The number of worker threads.
+            queue_size (int, optional): The capacity of the input queue; producers block when it is full.
+        """
+        self.name = name
+        self.func = func
+        self.workers = workers
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.processed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.busy_time = 0.0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+        self._lock = threading.Lock()
+
+    def _record(self, outcome, enqueued_at, started_at):
+        finished_at = time.perf_counter()
+        latency = finished_at - enqueued_at
+        with self._lock:
+            setattr(self, outcome, getattr(self, outcome) + 1)
+            self.busy_time += finished_at - started_at
+            self.total_latency += latency
+            if latency > self.max_latency:
+                self.max_latency = latency
+
+    def stats(self, elapsed):
+        """
+        Summarizes the stage's counters.
+
+        Args:
+            elapsed (float): Seconds since the pipeline started, for computing throughput.
+
+        Returns:
+            dict: Processed, rejected and failed counts, throughput (orders/s), average and
+                  maximum latency (s), and the current queue depth.
+        """
+        with self._lock:
+            handled = self.processed + self.rejected + self.failed
+            return {
+                "processed": self.processed,
+                "rejected": self.rejected,
+                "failed": self.failed,
+                "throughput": handled / elapsed if elapsed else 0.0,
+                "avg_latency": self.total_latency / handled if handled else 0.0,
+                "max_latency": self.max_latency,
+                "queue_depth": self.queue.qsize(),
+            }
+
+
+# OrderPipeline Class
+class OrderPipeline:
+    """
+    Runs orders through a sequence of stages, each with its own bounded queue and worker threads.
+
+    Each stage hands orders to the next by a blocking put, so when a stage falls behind its
+    queue fills up and the stages before it slow down in turn, until submit itself blocks.
+    Orders are never dropped: every submitted order's future resolves to either the
+    last stage's result or a rejection from the stage that rejected it.
+    """
+    def __init__(self, stages):
+        """
+        Initializes the pipeline and starts every stage's workers.
+
+        Args:
+            stages (list): PipelineStage objects, in processing order.
+        """
+        self.stages = list(stages)
+        self._started_at = time.perf_counter()
+        self._threads = []  # Worker threads of each stage, in stage order.
+        for index, stage in enumerate(self.stages):
+            next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            threads = [threading.Thread(target=self._work, args=(stage, next_stage),
+                                        name=f"pipeline-{stage.name}-{worker}", daemon=True)
+                       for worker in range(stage.workers)]
+            for thread in threads:
+                thread.start()
+            self._threads.append(threads)
+
+    def submit(self, order, timeout=None):
+        """
+        Queues an order for processing, blocking while the first stage's queue is full.
+
+        Args:
+            order (dict): The order; each stage reads and adds keys.
+            timeout (float, optional): The longest time to wait for queue space.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the final order dict, or to a dict with
+                                       "success": False, the rejecting stage and a message.
+
+        Raises:
+            queue.Full: If the timeout expires before the order is queued.
+        """
+        future = Future()
+        self.stages[0].queue.put((order, future, time.perf_counter()), timeout=timeout)
+        return future
+
+    def _work(self, stage, next_stage):
+        while True:
+            item = stage.queue.get()
+            if item is _STOP:
+                return
+            order, future, enqueued_at = item
+            started_at = time.perf_counter()
+            try:
+                order = stage.func(order)
+            except OrderRejected as e:
+                stage._record("rejected", enqueued_at, started_at)
+                future.set_result({"success": False, "stage": stage.name, "message": str(e)})
+                continue
+            except Exception as e:
+                stage._record("failed", enqueued_at, started_at)
+                future.set_exception(e)
+                continue
+            stage._record("processed", enqueued_at, started_at)
+            if next_stage is None:
+                future.set_result(order)
+            else:
+                next_stage.queue.put((order, future, time.perf_counter()))  # Blocks when the next stage is behind.
+
+    def stats(self):
+        """
+        Returns per-stage throughput and latency counters.
+
+        Returns:
+            dict: Maps each stage name to the dictionary returned by PipelineStage.stats.
+        """
+        elapsed = time.perf_counter() - self._started_at
+        return {stage.name: stage.stats(elapsed) for stage in self.stages}
+
+    def close(self):
+        """
+        Finishes every queued order and stops the workers, one stage at a time.
+        """
+        for stage, threads in zip(self.stages, self._threads):
+            for _ in threads:
+                stage.queue.put(_STOP)
+            for thread in threads:
+                thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def build_checkout_pipeline(restaurant_menu, payment_service, order_history, notification_service,
+                            id_generator=None, workers=None, queue_size=100):
+    """
+    Builds the checkout pipeline: validate -> price -> authorize -> persist -> notify.
+
+    Orders are dicts with "email", "cart" (a Cart) and "payment_details". Successful orders
+    resolve to the same dict with "success", "order_id" and "total_info" added.
+
+    Args:
+        restaurant_menu (RestaurantMenu): The menu the cart's items are checked against.
+        payment_service (PaymentService): Authorizes payments; process_payment(order, payment_details)
+                                          returns a gateway response with a "status".
+        order_history (OrderHistory): Stores confirmed orders.
+        notification_service (NotificationService): Sends the confirmation message.
+        id_generator (OrderIdGenerator, optional): Issues order IDs; defaults to the process-wide generator.
+        workers (dict, optional): Maps stage name -> worker count; authorize defaults to 8, the rest to 2.
+        queue_size (int, optional): The capacity of each stage's queue.
+
+    Returns:
+        OrderPipeline: The running pipeline.
+    """
+    id_generator = id_generator or default_generator
+    workers = {"validate": 2, "price": 2, "authorize": 8, "persist": 2, "notify": 2, **(workers or {})}
+    persist_lock = threading.Lock()  # Keeps each user's history sorted by order ID.
+
+    def validate(order):
+        item_names = order["cart"].item_names()
+        if not item_names:
+            raise OrderRejected("Cart is empty")
+        result = availability_result(restaurant_menu.check_items(item_names))
+        if not result["success"]:
+            raise OrderRejected(result["message"])
+        return order
+
+    def price(order):
+        order["total_info"] = order["cart"].calculate_total()
+        return order
+
+    def authorize(order):
+        response = payment_service.process_payment({"total_amount": order["total_info"]["total"]},
+                                                   order["payment_details"])
+        if response.get("status") != "success":
+            raise OrderRejected(response.get("message", "Payment failed"))
+        order["transaction_id"] = response.get("transaction_id")
+        return order
+
+    def persist(order):
+        with persist_lock:
+            order["order_id"] = id_generator.next_order_id()
+            order_history.add_order(order["email"], {"order_id": order["order_id"],
+                                                     "items": order["cart"].view_cart(),
+                                                     "total_info": order["total_info"]})
+        return order
+
+    def notify(order):
+        notification_service.send_notification("Order placed successfully!", recipient=order["email"],
+                                              order_id=order["order_id"])
+        order["success"] = True
+        return order
+
+    return OrderPipeline([PipelineStage(name, func, workers[name], queue_size)
+                          for name, func in (("validate", validate), ("price", price), ("authorize", authorize),
+                                             ("persist", persist), ("notify", notify))])
@@ -0,0 +1,425 @@
+import asyncio
+import collections
+import itertools
+import json
+import random
+import threading
+
+from Payment_Processing import FakePaymentGateway
+
+PAYMENTS_PATH = "/payments"
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 503: "Service Unavailable"}
+
+
+class GatewayError(Exception):
+    """
+    Raised when the gateway cannot be reached or does not return a usable response.
+    Declined payments are not errors; they come back as {"status": "failure", ...}.
+    """
+
+
+class GatewayUnavailable(GatewayError):
+    """
+    Raised when the gateway did not process the request: the connection could not be opened,
+    or the gateway answered HTTP 503. The payment was not charged, so it is safe to retry.
+    """
+
+
+class GatewayTimeout(GatewayError):
+    """
+    Raised when the gateway's response takes too long. The request was sent, so the gateway
+    may still charge the payment; the outcome is unknown.
+    """
+
+
+async def _read_message(reader):
+    """
+    Reads one HTTP/1.1 message head and its Content-Length body.
+
+    Returns:
+        tuple: (start line, headers dict with lower-case names, body bytes), or None at end of stream.
+    """
+    start_line = await reader.readline()
+    if not start_line:
+        return None
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return start_line.decode("latin-1").rstrip("\r\n"), headers, body
+
+
+# GatewayClient Class
+class GatewayClient:
+    """
+    An asyncio client for the gateway's HTTP/JSON API that reuses keep-alive connections.
+
+    At most pool_size requests are in flight at once; further requests wait for a free
+    connection. Connections belong to the event loop they were opened on, so use one
+    client per loop.
+
+    Attributes:
+        host (str): The gateway host.
+        port (int): The gateway port.
+        pool_size (int): The maximum number of open connections.
+        connect_timeout (float): Seconds allowed for opening a connection.
+        request_timeout (float): Seconds allowed for one request and its response.
+        connections_opened (int): The number of connections opened so far.
+    """
+    def __init__(self, host, port, pool_size=10, connect_timeout=1.0, request_timeout=5.0):
+        """
+        Initializes the client; connections are opened on demand.
+
+        Args:
+            host (str): The gateway host.
+            port (int): The gateway port.
+            pool_size (int, optional): The maximum number of open connections.
+            connect_timeout (float, optional): Seconds allowed for opening a connection.
+            request_timeout (float, optional): Seconds allowed for one request and its response.
+
+        Raises:
+            ValueError: If pool_size is not positive.
+        """
+        if pool_size <= 0:
+            raise ValueError("pool_size must be positive")
+        self.host = host
+        self.port = port
+        self.pool_size = pool_size
+        self.connect_timeout = connect_timeout
+        self.request_timeout = request_timeout
+        self.connections_opened = 0
+        self._idle = collections.deque()  # (reader, writer) pairs ready for reuse.
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def process_payment(self, method, details, amount):
+        """
+        Asks the gateway to charge a payment.
+
+        Args:
+            method (str): Payment method (e.g., 'credit_card').
+            details (dict): Payment details (e.g., card number).
+            amount (float): Amount to be charged.
+
+        Returns:
+            dict: The gateway's response, e.g. {"status": "success", "transaction_id": ...}.
+
+        Raises:
+            GatewayUnavailable: If no connection could be opened or the gateway returned HTTP 503.
+            GatewayTimeout: If the gateway does not answer within request_timeout.
+            GatewayError: If the connection fails mid-request, the gateway returns another HTTP error
+                or the response is malformed.
+        """
+        return await self.request("POST", PAYMENTS_PATH, {"method": method, "details": details, "amount": amount})
+
+    async def request(self, verb, path, payload):
+        """
+        Sends a JSON request over a pooled connection and decodes the JSON response.
+
+        Args:
+            verb (str): The HTTP method.
+            path (str): The request path.
+            payload: The JSON-serializable request body.
+
+        Returns:
+            The decoded response body.
+
+        Raises:
+            GatewayUnavailable: If no connection could be opened or the gateway returned HTTP 503.
+            GatewayTimeout: If the gateway does not answer within request_timeout.
+            GatewayError: If the connection fails mid-request, the gateway returns another HTTP error
+                or the response is malformed.
+        """
+        body = json.dumps(payload).encode()
+        head = (f"{verb} {path} HTTP/1.1\r\nHost: {self.host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n\r\n").encode("latin-1")
+        async with self._slots:
+            reader, writer = await self._acquire()
+            try:
+                writer.write(head + body)
+                response = await asyncio.wait_for(self._exchange(writer, reader), self.request_timeout)
+            except asyncio.TimeoutError:
+                writer.close()
+                raise GatewayTimeout(f"No response from {self.host}:{self.port} "
+                                     f"within {self.request_timeout}s") from None
+            except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+                writer.close()
+                raise GatewayError(f"Gateway connection failed: {e}") from e
+            except BaseException:
+                writer.close()  # Cancelled mid-request; the connection state is unknown.
+                raise
+            if response is None:
+                writer.close()
+                raise GatewayError("Gateway closed the connection")
+            status_line, headers, data = response
+            try:
+                status = int(status_line.split()[1])
+            except (IndexError, ValueError):
+                writer.close()
+                raise GatewayError(f"Malformed gateway status line: {status_line!r}") from None
+            if headers.get("connection", "").lower() == "close":
+                writer.close()
+            else:
+                self._idle.append((reader, writer))
+
+        if status == 503:
+            raise GatewayUnavailable(f"Gateway returned HTTP 503: {data.decode(errors='replace')}")
+        if status != 200:
+            raise GatewayError(f"Gateway returned HTTP {status}: {data.decode(errors='replace')}")
+        try:
+            return json.loads(data)
+        except ValueError as e:
+            raise GatewayError(f"Malformed gateway response body: {e}") from e
+
+    @staticmethod
+    async def _exchange(writer, reader):
+        await writer.drain()
+        return await _read_message(reader)
+
+    async def _acquire(self):
+        while self._idle:
+            reader, writer = self._idle.popleft()
+            if not reader.at_eof() and not writer.is_closing():
+                return reader, writer
+            writer.close()  # The server closed this idle connection.
+        try:
+            connection = await asyncio.wait_for(asyncio.open_connection(self.host, self.port), self.connect_timeout)
+        except asyncio.TimeoutError:
+            raise GatewayUnavailable(f"Could not connect to {self.host}:{self.port} "
+                                     f"within {self.connect_timeout}s") from None
+        except OSError as e:
+            raise GatewayUnavailable(f"Could not connect to {self.host}:{self.port}: {e}") from e
+        self.connections_opened += 1
+        return connection
+
+    async def close(self):
+        """
+        Closes every idle connection.
+        """
+        while self._idle:
+            _, writer = self._idle.popleft()
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+
+# _LoopThread Class
+class _LoopThread:
+    """
+    An event loop running in a daemon thread, for synchronous code that drives asyncio objects.
+    """
+    def __init__(self, name):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def run(self, coroutine, timeout=None):
+        return self.submit(coroutine).result(timeout)
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+# HttpPaymentGateway Class
+class HttpPaymentGateway:
+    """
+    A payment gateway backed by a GatewayClient, with the same process_payment interface as
+    the in-process gateways, so it can be passed to PaymentService unchanged.
+
+    The client runs on a private event loop thread shared by all callers, so synchronous
+    callers in any thread share one connection pool.
+
+    Attributes:
+        client (GatewayClient): The pooled client.
+    """
+    def __init__(self, host, port, pool_size=10, connect_timeout=1.0, request_timeout=5.0):
+        """
+        Initializes the gateway and starts its event loop thread.
+
+        Args:
+            host (str): The gateway host.
+            port (int): The gateway port.
+            pool_size (int, optional): The maximum number of open connections.
+            connect_timeout (float, optional): Seconds allowed for opening a connection.
+            request_timeout (float, optional): Seconds allowed for one request and its response.
+        """
+        self._loop_thread = _LoopThread("payment-gateway-client")
+        self.client = GatewayClient(host, port, pool_size, connect_timeout, request_timeout)
+
+    def process_payment(self, method, details, amount):
+        """
+        Charges a payment, blocking until the gateway answers.
+
+        Args:
+            method (str): Payment method (e.g., 'credit_card').
+            details (dict): Payment details (e.g., card number).
+            amount (float): Amount to be charged.
+
+        Returns:
+            dict: The gateway's response.
+
+        Raises:
+            GatewayError: If the gateway cannot be reached or fails.
+        """
+        return self._loop_thread.run(self.client.process_payment(method, details, amount))
+
+    async def process_payment_async(self, method, details, amount):
+        """
+        Charges a payment from any event loop without blocking it.
+
+        Args:
+            method (str): Payment method (e.g., 'credit_card').
+            details (dict): Payment details (e.g., card number).
+            amount (float): Amount to be charged.
+
+        Returns:
+            dict: The gateway's response.
+
+        Raises:
+            GatewayError: If the gateway cannot be reached or fails.
+        """
+        return await asyncio.wrap_future(self._loop_thread.submit(self.client.process_payment(method, details, amount)))
+
+    def close(self):
+        """
+        Closes the pooled connections and stops the event loop thread.
+        """
+        self._loop_thread.run(self.client.close())
+        self._loop_thread.stop()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+# LocalGatewayServer Class
+class LocalGatewayServer:
+    """
+    A local stand-in for the payment gateway's HTTP/JSON API, for tests and benchmarks.
+
+    POST /payments with {"method", "details", "amount"} returns the decision of an in-process
+    gateway (FakePaymentGateway by default) after the configured latency. A failure_rate
+    fraction of requests get HTTP 503 instead. Connections are kept alive between requests.
+    latency and failure_rate can be changed while the server is running.
+
+    Attributes:
+        host (str): The listening host.
+        port (int): The listening port; chosen by the OS when 0 is passed, known after start().
+        latency (float): Seconds to wait before answering each request.
+        failure_rate (float): The fraction of requests answered with HTTP 503.
+        requests (int): The number of requests received.
+        connections (int): The number of connections accepted.
+    """
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, failure_rate=0.0, gateway=None, seed=None):
+        """
+        Initializes the server; call start() to begin listening.
+
+        Args:
+            host (str, optional): The host to listen on.
+            port (int, optional): The port to listen on; 0 picks a free port.
+            latency (float, optional): Seconds to wait before answering each request.
+            failure_rate (float, optional): The fraction of requests answered with HTTP 503.
+            gateway (optional): Decides payments; anything with process_payment(method, details, amount).
+            seed (int, optional): Seeds the failure injection, for reproducible runs.
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.gateway = gateway or FakePaymentGateway()
+        self.requests = 0
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._transaction_ids = itertools.count(1)
+        self._loop_thread = None
+        self._server = None
+
+    def start(self):
+        """
+        Starts listening in a background thread.
+
+        Returns:
+            LocalGatewayServer: self, so the server can be started inline.
+        """
+        self._loop_thread = _LoopThread("local-payment-gateway")
+        self._server = self._loop_thread.run(asyncio.start_server(self._handle, self.host, self.port))
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    def stop(self):
+        """
+        Stops listening, closes open connections and stops the background thread.
+        """
+        if self._server is None:
+            return
+        self._server.close()
+        self._loop_thread.run(self._close_connections())
+        self._loop_thread.stop()
+        self._server = None
+
+    async def _close_connections(self):
+        for task in asyncio.all_tasks() - {asyncio.current_task()}:
+            task.cancel()
+        await self._server.wait_closed()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                request = await _read_message(reader)
+                if request is None:
+                    break
+                request_line, headers, body = request
+                self.requests += 1
+                status, response = await self._respond(request_line, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                data = json.dumps(response).encode()
+                connection = "" if keep_alive else "Connection: close\r\n"
+                writer.write((f"HTTP/1.1 {status} {_REASONS[status]}\r\nContent-Type: application/json\r\n"
+                              f"Content-Length: {len(data)}\r\n{connection}\r\n").encode("latin-1") + data)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # The client went away mid-request.
+        finally:
+            writer.close()
+
+    async def _respond(self, request_line, body):
+        verb, path = request_line.split()[:2]
+        if (verb, path) != ("POST", PAYMENTS_PATH):
+            return 404, {"error": f"No route for {verb} {path}"}
+        try:
+            payload = json.loads(body)
+            method, details, amount = payload["method"], payload["details"], payload["amount"]
+        except (ValueError, KeyError, TypeError):
+            return 400, {"error": "Expected a JSON object with method, details and amount"}
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.failure_rate and self._random.random() < self.failure_rate:
+            return 503, {"error": "Gateway temporarily unavailable"}
+        try:
+            response = dict(self.gateway.process_payment(method, details, amount))
+        except (KeyError, TypeError, AttributeError):
+            return 400, {"error": "Malformed payment details"}
+        if response.get("status") == "success":
+            response["transaction_id"] = f"txn{next(self._transaction_ids)}"
+        return 200, response
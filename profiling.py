@@ -0,0 +1,206 @@
+import argparse
+import cProfile
+import functools
+import glob
+import logging
+import os
+import pstats
+import random
+import sys
+import threading
+import time
+import tracemalloc
+
+logger = logging.getLogger(__name__)
+
+PROFILE_SUFFIX = ".prof"
+MEMORY_SUFFIX = ".tracemalloc"
+
+
+# SamplingProfiler Class
+class SamplingProfiler:
+    """
+    Profiles a random fraction of calls to functions decorated with sampled().
+
+    A sampled call runs under cProfile, and optionally tracemalloc, and its stats are written
+    to the output directory as <name>-<time>-<pid>.prof (and .tracemalloc). Only the newest
+    max_files files are kept. Only one call is profiled at a time; calls that start while
+    another is being profiled, including nested sampled calls, run normally.
+
+    Unsampled calls cost one rate check and, when the rate is not zero, one random number.
+    Profiles that cannot be written, e.g. to a read-only directory, are logged and skipped;
+    the profiled call still returns its result.
+
+    Attributes:
+        rate (float): The fraction of calls to profile, from 0.0 (off) to 1.0 (every call).
+        directory (str): Where profiles are written.
+        max_files (int): The number of profile files to keep.
+        trace_memory (bool): Whether to also capture tracemalloc snapshots.
+        written (int): The number of profiles written.
+    """
+    def __init__(self, rate=0.0, directory="profiles", max_files=50, trace_memory=False):
+        """
+        Initializes the profiler.
+
+        Args:
+            rate (float, optional): The fraction of calls to profile.
+            directory (str, optional): The output directory; created when the first profile is written.
+            max_files (int, optional): The number of profile files to keep.
+            trace_memory (bool, optional): Whether to capture tracemalloc allocation snapshots.
+        """
+        self.rate = rate
+        self.directory = directory
+        self.max_files = max_files
+        self.trace_memory = trace_memory
+        self.written = 0
+        self._busy = threading.Lock()
+        self._random = random.random
+
+    def should_sample(self):
+        """
+        Decides whether to profile the current call.
+
+        Returns:
+            bool: True for a random fraction (rate) of calls.
+        """
+        return self.rate > 0 and self._random() < self.rate
+
+    def profile(self, name, func, *args, **kwargs):
+        """
+        Calls func under the profiler and writes its stats, unless another call is being profiled.
+
+        Args:
+            name (str): The name used in the profile's file name.
+            func (callable): The function to call.
+            *args, **kwargs: Arguments for func.
+
+        Returns:
+            Whatever func returns.
+        """
+        if not self._busy.acquire(blocking=False):
+            return func(*args, **kwargs)
+        try:
+            started_tracing = self.trace_memory and not tracemalloc.is_tracing()
+            if started_tracing:
+                tracemalloc.start()
+            profiler = cProfile.Profile()
+            try:
+                return profiler.runcall(func, *args, **kwargs)
+            finally:
+                snapshot = tracemalloc.take_snapshot() if self.trace_memory else None
+                if started_tracing:
+                    tracemalloc.stop()
+                self._write(name, profiler, snapshot)
+        finally:
+            self._busy.release()
+
+    def _write(self, name, profiler, snapshot):
+        # Runs after the profiled call; profiling must never make that call fail.
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            base = os.path.join(self.directory, f"{name}-{time.time_ns()}-{os.getpid()}")
+            profiler.dump_stats(base + PROFILE_SUFFIX)
+            if snapshot is not None:
+                snapshot.dump(base + MEMORY_SUFFIX)
+            self.written += 1
+            self._rotate()
+        except Exception:
+            logger.exception("Could not write the %s profile to %s", name, self.directory)
+
+    def _rotate(self):
+        for suffix in (PROFILE_SUFFIX, MEMORY_SUFFIX):
+            paths = sorted(glob.glob(os.path.join(self.directory, f"*{suffix}")), key=os.path.getmtime)
+            for path in paths[:max(len(paths) - self.max_files, 0)]:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # Removed by another process sharing the directory.
+
+
+def _profiler_from_environment():
+    return SamplingProfiler(rate=float(os.environ.get("ORDER_PROFILE_RATE", "0")),
+                            directory=os.environ.get("ORDER_PROFILE_DIR", "profiles"),
+                            trace_memory=os.environ.get("ORDER_PROFILE_MEMORY") == "1")
+
+
+# The process-wide profiler, configured by ORDER_PROFILE_RATE, ORDER_PROFILE_DIR and ORDER_PROFILE_MEMORY.
+default_profiler = _profiler_from_environment()
+
+
+def sampled(name, profiler=None):
+    """
+    Decorates a function so that a fraction of its calls are profiled.
+
+    Args:
+        name (str): The name used for the function's profile files.
+        profiler (SamplingProfiler, optional): Defaults to default_profiler, looked up at call time.
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            active = profiler or default_profiler
+            if active.rate and active.should_sample():
+                return active.profile(name, func, *args, **kwargs)
+            return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def summarize(directory, name=None, top=20, sort="cumulative", memory=False, stream=None):
+    """
+    Merges the profiles in a directory and prints the top functions.
+
+    Args:
+        directory (str): The profile directory.
+        name (str, optional): Only include profiles of this sampled function.
+        top (int, optional): The number of functions (or allocation sites) to print.
+        sort (str, optional): A pstats sort key, e.g. "cumulative" or "tottime".
+        memory (bool, optional): Also print the top allocation sites from tracemalloc snapshots.
+        stream (file, optional): Where to print; defaults to stdout.
+
+    Returns:
+        int: The number of profiles merged.
+    """
+    stream = stream or sys.stdout
+    pattern = os.path.join(directory, f"{name + '-' if name else ''}*")
+    paths = sorted(glob.glob(pattern + PROFILE_SUFFIX))
+    if not paths:
+        print(f"No profiles found in {directory}", file=stream)
+        return 0
+    stats = pstats.Stats(*paths, stream=stream)
+    print(f"Merged {len(paths)} profiles from {directory}", file=stream)
+    stats.strip_dirs().sort_stats(sort).print_stats(top)
+
+    if memory:
+        totals = {}
+        for path in sorted(glob.glob(pattern + MEMORY_SUFFIX)):
+            for statistic in tracemalloc.Snapshot.load(path).statistics("lineno"):
+                frame = statistic.traceback[0]
+                key = f"{frame.filename}:{frame.lineno}"
+                size, count = totals.get(key, (0, 0))
+                totals[key] = (size + statistic.size, count + statistic.count)
+        print(f"Top {top} allocation sites:", file=stream)
+        for key, (size, count) in sorted(totals.items(), key=lambda item: item[1][0], reverse=True)[:top]:
+            print(f"{size / 1024:10.1f} KiB {count:8d} blocks  {key}", file=stream)
+    return len(paths)
+
+
+def main(argv=None):
+    """
+    Command-line entry point: python profiling.py DIRECTORY [--name NAME] [--top N] [--sort KEY] [--memory]
+    """
+    parser = argparse.ArgumentParser(description="Merge sampled profiles and summarize the top functions.")
+    parser.add_argument("directory", help="The profile directory.")
+    parser.add_argument("--name", help="Only include profiles of this sampled function, e.g. place_order.")
+    parser.add_argument("--top", type=int, default=20, help="The number of entries to show.")
+    parser.add_argument("--sort", default="cumulative", help="The pstats sort key, e.g. cumulative or tottime.")
+    parser.add_argument("--memory", action="store_true", help="Also summarize tracemalloc snapshots.")
+    args = parser.parse_args(argv)
+    return 0 if summarize(args.directory, args.name, args.top, args.sort, args.memory) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+import copy
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+_MISSING = object()
+
+
+# TTLCache Class
+class TTLCache:
+    """
+    A thread-safe, size-bounded cache whose entries expire after a fixed time to live.
+
+    When the cache is full, the least recently used entry is evicted.
+
+    Attributes:
+        maxsize (int): The maximum number of entries.
+        ttl (float): Seconds an entry stays valid after it is stored.
+        hits (int): The number of lookups that found a valid entry.
+        misses (int): The number of lookups that did not.
+    """
+    def __init__(self, maxsize=1024, ttl=600.0, clock=time.monotonic):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int, optional): The maximum number of entries.
+            ttl (float, optional): Seconds an entry stays valid.
+            clock (callable, optional): Returns the current time in seconds.
+
+        Raises:
+            ValueError: If maxsize or ttl is not positive.
+        """
+        if maxsize <= 0 or ttl <= 0:
+            raise ValueError("maxsize and ttl must be positive")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries = OrderedDict()  # Maps key -> (expiry time, value), least recently used first.
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Looks up a key, refreshing its recency.
+
+        Args:
+            key (hashable): The key.
+            default (optional): Returned if the key is missing or expired.
+
+        Returns:
+            The cached value, or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[0] > self._clock():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key, value):
+        """
+        Stores a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key (hashable): The key.
+            value: The value to cache.
+        """
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            if len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key, default=None):
+        """
+        Removes a key.
+
+        Args:
+            key (hashable): The key.
+            default (optional): Returned if the key is not cached.
+
+        Returns:
+            The removed value, or default.
+        """
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        return default if entry is None else entry[1]
+
+    def clear(self):
+        """
+        Removes every entry.
+        """
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > self._clock()
+
+
+# IdempotencyCache Class
+class IdempotencyCache:
+    """
+    Runs an operation at most once per idempotency key and replays its result for retries.
+
+    Keys are scoped, e.g. by user or order, so two clients that happen to choose the same
+    key never see each other's results. Each key is bound to a fingerprint of the request
+    parameters (see request_fingerprint); reusing a key with different parameters is an
+    error rather than a replay of the wrong result.
+
+    Successful results are kept in a TTLCache; results that cache_if rejects, e.g. failed
+    payments, are passed to callers already waiting but not kept, so a later retry runs the
+    operation again. A retry that arrives while the first attempt is still running waits for
+    that attempt instead of starting another one. If the operation raises, the exception is
+    passed to every waiting caller but not cached. Every caller gets its own copy of the result.
+
+    Attributes:
+        results (TTLCache): Maps (scope, key) -> (fingerprint, result).
+        replayed (int): The number of calls answered from the cache or an in-flight attempt.
+    """
+    def __init__(self, maxsize=10_000, ttl=24 * 60 * 60, clock=time.monotonic):
+        """
+        Initializes an empty cache.
+
+        Args:
+            maxsize (int, optional): The maximum number of cached results.
+            ttl (float, optional): Seconds a result is replayed for; defaults to one day.
+            clock (callable, optional): Returns the current time in seconds.
+        """
+        self.results = TTLCache(maxsize, ttl, clock)
+        self.replayed = 0
+        self._in_flight = {}  # Maps (scope, key) -> (fingerprint, Future) for the running attempt.
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute, scope=None, fingerprint=None, cache_if=None):
+        """
+        Returns the result for a key, calling compute only if there is no cached or running attempt.
+
+        Args:
+            key (hashable): The idempotency key.
+            compute (callable): Called with no arguments to produce the result.
+            scope (hashable, optional): Who the key belongs to, e.g. a user or an order.
+            fingerprint (optional): Identifies the request's parameters, e.g. from request_fingerprint.
+            cache_if (callable, optional): Called with a result; only results it accepts are
+                                           cached. Defaults to caching every result.
+
+        Returns:
+            A copy of the result of the first call of compute for this key whose result was cached.
+
+        Raises:
+            ValueError: If the key was already used in this scope with a different fingerprint.
+            Exception: Whatever compute raised, for the caller that ran it and any callers waiting on it.
+        """
+        scoped_key = (scope, key)
+        with self._lock:
+            entry = self.results.get(scoped_key, _MISSING)
+            if entry is _MISSING:
+                entry = self._in_flight.get(scoped_key)
+            if entry is not None:
+                _check_fingerprint(key, entry[0], fingerprint)
+                self.replayed += 1
+                cached = entry[1]
+                if not isinstance(cached, Future):
+                    return copy.deepcopy(cached)
+                future, owner = cached, False
+            else:
+                future, owner = Future(), True
+                self._in_flight[scoped_key] = (fingerprint, future)
+
+        if not owner:
+            return copy.deepcopy(future.result())
+
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[scoped_key]
+            future.set_exception(e)
+            raise
+        stored = copy.deepcopy(result)  # Kept apart from the caller's copy, which the caller may modify.
+        with self._lock:
+            if cache_if is None or cache_if(result):
+                self.results.set(scoped_key, (fingerprint, stored))
+            del self._in_flight[scoped_key]
+        future.set_result(stored)
+        return result
+
+
+def request_fingerprint(*parameters):
+    """
+    Hashes the parameters of a request, so an idempotency key can be checked against them
+    without keeping the parameters, which may include card details.
+
+    Args:
+        *parameters: JSON-serializable values, e.g. the order and payment details; dictionary
+                     key order does not matter, and other values are compared by repr.
+
+    Returns:
+        str: A SHA-256 hex digest.
+    """
+    text = json.dumps(parameters, sort_keys=True, default=repr)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+def _check_fingerprint(key, expected, fingerprint):
+    if expected != fingerprint:
+        raise ValueError(f"Idempotency key {key!r} was already used with different request parameters")
+
+
+default_idempotency_cache = IdempotencyCache()
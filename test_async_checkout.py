@@ -0,0 +1,104 @@
+# python -m unittest test_async_checkout.py
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+from Order_Placement import Cart, OrderPlacement, PaymentMethod, RestaurantMenu, UserProfile
+
+class SlowPaymentMethod(PaymentMethod):
+    def __init__(self, latency, approve=True):
+        self.latency = latency
+        self.approve = approve
+        self.cancelled = False
+
+    async def process_payment_async(self, amount):
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        return self.approve
+
+class BlockingPaymentMethod(PaymentMethod):
+    def __init__(self, latency=0):
+        self.latency = latency
+        self.charged = threading.Event()
+
+    def process_payment(self, amount):
+        time.sleep(self.latency)
+        self.charged.set()
+        return amount > 20
+
+class TestAsyncCheckout(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.cart = Cart()
+        self.cart.add_item("Burger", 8.99, 2)
+        self.menu = RestaurantMenu(available_items=["Burger", "Pizza"])
+        self.order = OrderPlacement(self.cart, UserProfile("123 Main St"), self.menu)
+
+    async def test_confirm_order_async_success(self):
+        result = await self.order.confirm_order_async(PaymentMethod())
+        self.assertTrue(result["success"])
+        self.assertEqual(result["order_id"], self.order.order_id)
+
+    async def test_confirm_order_async_matches_sync_results(self):
+        self.assertEqual((await self.order.confirm_order_async(SlowPaymentMethod(0, approve=False))),
+                         {"success": False, "message": "Payment failed"})
+        self.cart.add_item("Sushi", 5.0, 1)
+        self.assertEqual((await self.order.confirm_order_async(PaymentMethod())),
+                         {"success": False, "message": "Order validation failed"})
+
+    async def test_sync_only_payment_methods_run_in_a_thread(self):
+        result = await self.order.confirm_order_async(BlockingPaymentMethod())
+        self.assertTrue(result["success"])
+
+        payment_method = mock.Mock()
+        payment_method.process_payment.return_value = True
+        result = await self.order.confirm_order_async(payment_method)
+        self.assertTrue(result["success"])
+        payment_method.process_payment.assert_called_once_with(24.78)
+
+    async def test_payment_timeout(self):
+        payment_method = SlowPaymentMethod(10)
+        result = await self.order.confirm_order_async(payment_method, timeout=0.01)
+        self.assertEqual(result, {"success": False, "message": "Payment timed out"})
+        self.assertTrue(payment_method.cancelled)
+        self.assertIsNone(self.order.order_id)
+
+    async def test_cancellation_propagates(self):
+        payment_method = SlowPaymentMethod(10)
+        task = asyncio.create_task(self.order.confirm_order_async(payment_method))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertTrue(payment_method.cancelled)
+
+    async def test_timeout_does_not_abandon_thread_payments(self):
+        payment_method = BlockingPaymentMethod(latency=0.1)
+        result = await self.order.confirm_order_async(payment_method, timeout=0.01)
+        self.assertTrue(payment_method.charged.is_set())
+        self.assertTrue(result["success"])
+        self.assertEqual(result["order_id"], self.order.order_id)
+
+    async def test_cancelled_thread_payment_still_confirms_order(self):
+        payment_method = BlockingPaymentMethod(latency=0.1)
+        task = asyncio.create_task(self.order.confirm_order_async(payment_method))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertIsNone(self.order.order_id)
+        await asyncio.sleep(0.2)
+        self.assertTrue(payment_method.charged.is_set())
+        self.assertIsNotNone(self.order.order_id)
+
+    async def test_many_concurrent_checkouts(self):
+        orders = [OrderPlacement(self.cart, UserProfile("123 Main St"), self.menu) for _ in range(1000)]
+        results = await asyncio.gather(*(order.confirm_order_async(SlowPaymentMethod(0.05)) for order in orders))
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertEqual(len({result["order_id"] for result in results}), 1000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# python -m unittest test_batch_payments.py
+import unittest
+from Payment_Processing import FakePaymentGateway, PaymentGateway, PaymentProcessing
+
+CARD = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
+DECLINED_CARD = {"card_number": "4000000000000002", "expiry_date": "12/30", "cvv": "123"}
+AMEX_CARD = {"card_number": "378282246310005", "expiry_date": "12/30", "cvv": "1234"}
+
+class RecordingGateway(FakePaymentGateway):
+    def __init__(self, fail_batch=None):
+        self.batches = []
+        self.fail_batch = fail_batch
+
+    def process_payments_batch(self, requests):
+        self.batches.append(len(requests))
+        if len(self.batches) == self.fail_batch:
+            raise ConnectionError("Gateway unavailable")
+        return super().process_payments_batch(requests)
+
+class TestProcessPaymentsBatch(unittest.TestCase):
+    def setUp(self):
+        self.gateway = RecordingGateway()
+        self.payment_processing = PaymentProcessing(self.gateway)
+
+    def test_results_in_input_order(self):
+        orders = [
+            ({"total_amount": 10.0}, "credit_card", CARD),
+            ({"total_amount": 10.0}, "bitcoin", {}),
+            ({"total_amount": 10.0}, "credit_card", DECLINED_CARD),
+            ({"total_amount": 10.0}, "credit_card", {"card_number": "1234", "cvv": "123"}),
+            ({"total_amount": 10.0}, "paypal", {}),
+        ]
+        self.assertEqual(self.payment_processing.process_payments_batch(orders), [
+            "Payment successful, Order confirmed",
+            "Error: Invalid payment method",
+            "Payment failed, please try again",
+            "Error: Invalid credit card details",
+            "Payment successful, Order confirmed",
+        ])
+        self.assertEqual(self.gateway.batches, [3])  # Only validated payments reach the gateway.
+
+    def test_matches_process_payment(self):
+        orders = [({"total_amount": 5.0 * i}, method, details)
+                  for i in range(20) for method, details in (("credit_card", CARD), ("credit_card", DECLINED_CARD),
+                                                             ("credit_card", AMEX_CARD), ("paypal", {}), ("cash", {}))]
+        expected = [self.payment_processing.process_payment(*order) for order in orders]
+        self.assertEqual(self.payment_processing.process_payments_batch(orders), expected)
+
+    def test_single_payments_use_the_same_gateway(self):
+        self.assertEqual(self.payment_processing.process_payment({"total_amount": 10.0}, "credit_card", AMEX_CARD),
+                         "Payment successful, Order confirmed")
+        self.assertEqual(self.payment_processing.process_payments_batch([({"total_amount": 10.0}, "credit_card",
+                                                                          AMEX_CARD)]),
+                         ["Payment successful, Order confirmed"])
+
+        gateway = FakePaymentGateway()
+        gateway.process_payment = lambda method, details, amount: {"status": "failure"}
+        self.assertEqual(PaymentProcessing(gateway).process_payment({"total_amount": 10.0}, "credit_card", CARD),
+                         "Payment failed, please try again")
+
+    def test_payments_are_sent_in_batches(self):
+        orders = [({"total_amount": 10.0}, "credit_card", CARD)] * 250
+        self.payment_processing.process_payments_batch(orders, batch_size=100)
+        self.assertEqual(self.gateway.batches, [100, 100, 50])
+
+    def test_failed_batch_only_affects_its_orders(self):
+        payment_processing = PaymentProcessing(RecordingGateway(fail_batch=2))
+        results = payment_processing.process_payments_batch([({"total_amount": 10.0}, "credit_card", CARD)] * 5,
+                                                            batch_size=2)
+        self.assertEqual(results, ["Payment successful, Order confirmed"] * 2 + ["Error: Gateway unavailable"] * 2
+                         + ["Payment successful, Order confirmed"])
+
+    def test_gateway_without_batch_endpoint(self):
+        payment_processing = PaymentProcessing(PaymentGateway())
+        results = payment_processing.process_payments_batch([({"total_amount": 10.0}, "credit_card", CARD),
+                                                             ({}, "credit_card", CARD)])
+        self.assertEqual(results, ["Payment successful, Order confirmed", "Error: 'total_amount'"])
+
+    def test_empty_batch(self):
+        self.assertEqual(self.payment_processing.process_payments_batch([]), [])
+        self.assertEqual(self.gateway.batches, [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+# python -m unittest test_batch_validation.py
+import unittest
+from Order_Placement import BatchOrderValidator, Cart, ColumnarCart, OrderPlacement, RestaurantMenu, UserProfile
+
+class TestBatchOrderValidator(unittest.TestCase):
+    def setUp(self):
+        self.pizzeria = RestaurantMenu({"Pizza": 12.99, "Salad": 7.49})
+        self.diner = RestaurantMenu({"Burger": 8.99, "Fries": 3.49})
+        self.validator = BatchOrderValidator()
+
+    def make_cart(self, *names, cart_class=Cart):
+        cart = cart_class()
+        for name in names:
+            cart.add_item(name, 5.0, 1)
+        return cart
+
+    def test_results_in_input_order_with_all_failures(self):
+        orders = [
+            (self.make_cart("Pizza"), self.pizzeria),
+            (self.make_cart("Burger", "Pizza", "Shake"), self.diner),
+            (self.make_cart(), self.pizzeria),
+            (self.make_cart("Salad", cart_class=ColumnarCart), self.pizzeria),
+        ]
+        results = self.validator.validate(orders)
+        self.assertEqual([result["success"] for result in results], [True, False, False, True])
+        self.assertEqual(results[1]["unavailable_items"], ["Pizza", "Shake"])
+        self.assertEqual(results[2]["message"], "Cart is empty")
+
+    def test_matches_single_order_validation(self):
+        orders = [(self.make_cart("Pizza", "Fries"), self.pizzeria), (self.make_cart("Fries"), self.diner)]
+        expected = [OrderPlacement(cart, UserProfile("123 Main St"), menu).validate_order() for cart, menu in orders]
+        self.assertEqual(self.validator.validate(orders), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+# python -m unittest test_card_validation.py
+import datetime
+import unittest
+import card_validation
+from card_validation import card_error, detect_network, luhn_valid, parse_expiry, validate_cards
+from Payment_Processing import PaymentProcessing
+
+TODAY = datetime.date(2026, 10, 18)
+
+def card(number, expiry="12/30", cvv="123"):
+    return {"card_number": number, "expiry_date": expiry, "cvv": cvv}
+
+class TestCardChecks(unittest.TestCase):
+    def test_luhn(self):
+        for number in ("4111111111111111", "5555555555554444", "378282246310005", "6011111111111117", "79927398713"):
+            self.assertTrue(luhn_valid(number), number)
+        for number in ("4111111111111112", "1234567812345678", "79927398710"):
+            self.assertFalse(luhn_valid(number), number)
+
+    def test_network_detection(self):
+        self.assertEqual(detect_network("4111111111111111"), "visa")
+        self.assertEqual(detect_network("5555555555554444"), "mastercard")
+        self.assertEqual(detect_network("2223003122003222"), "mastercard")
+        self.assertEqual(detect_network("378282246310005"), "amex")
+        self.assertEqual(detect_network("6011111111111117"), "discover")
+        self.assertEqual(detect_network("6445644564456445"), "discover")
+        self.assertEqual(detect_network("3530111333300000"), "jcb")
+        self.assertEqual(detect_network("30569309025904"), "diners")
+        self.assertIsNone(detect_network("1234567812345678"))
+        self.assertIsNone(detect_network(""))
+        self.assertEqual((detect_network("4"), detect_network("37"), detect_network("3")), ("visa", "amex", None))
+
+    def test_current_month(self):
+        today = datetime.date.today()
+        self.assertEqual(card_validation.current_month(), (today.year, today.month))
+        this_month = f"{today.month:02d}/{today.year}"
+        last_year = f"{today.month:02d}/{today.year - 1}"
+        self.assertIsNone(card_error(card("4111111111111111", expiry=this_month)))
+        self.assertEqual(card_error(card("4111111111111111", expiry=last_year)), "Card expired")
+
+    def test_parse_expiry(self):
+        self.assertEqual(parse_expiry("12/30"), (2030, 12))
+        self.assertEqual(parse_expiry("01/2031"), (2031, 1))
+        for expiry in ("13/30", "00/30", "1/30", "12-30", "12/3", "ab/cd", "", None):
+            self.assertIsNone(parse_expiry(expiry), expiry)
+
+    def test_card_error(self):
+        self.assertIsNone(card_error(card("4111111111111111"), TODAY))
+        self.assertIsNone(card_error(card("378282246310005", cvv="1234"), TODAY))
+        self.assertIsNone(card_error(card("4111111111111111", expiry="10/26"), TODAY))  # Valid through October.
+        self.assertEqual(card_error(card("4111111111111111", expiry="09/26"), TODAY), "Card expired")
+        self.assertEqual(card_error(card("4111111111111112"), TODAY), "Invalid card number")
+        self.assertEqual(card_error(card("4111 1111 1111 1111"), TODAY), "Invalid card number")
+        self.assertEqual(card_error(card("41111111111111110"), TODAY), "Invalid card number")  # Wrong length for Visa.
+        self.assertEqual(card_error(card("1234567812345678"), TODAY), "Unsupported card network")
+        self.assertEqual(card_error(card("378282246310005"), TODAY), "Invalid CVV")  # Amex needs 4 digits.
+        self.assertEqual(card_error(card("4111111111111111", cvv="12a"), TODAY), "Invalid CVV")
+        self.assertEqual(card_error(card("4111111111111111", expiry="2030-12"), TODAY), "Invalid expiry date")
+        self.assertEqual(card_error(None, TODAY), "Missing card details")
+        self.assertEqual(card_error({}, TODAY), "Invalid card number")
+
+class TestValidateCards(unittest.TestCase):
+    cards = [card("4111111111111111"), card("4111111111111112"), card("378282246310005", cvv="1234"),
+             card("5555555555554444", expiry="01/20"), None, card("1234"), card("6011111111111117")] * 20
+
+    def test_matches_scalar_checks(self):
+        self.assertEqual(validate_cards(self.cards, TODAY), [card_error(details, TODAY) for details in self.cards])
+
+    @unittest.skipIf(card_validation.numpy is None, "NumPy is not installed")
+    def test_numpy_checksums_match_scalar(self):
+        checksums = card_validation._luhn_batch(self.cards)
+        for index, details in enumerate(self.cards):
+            if index in checksums:
+                self.assertEqual(checksums[index], luhn_valid(details["card_number"]))
+
+class TestPaymentProcessingCardValidation(unittest.TestCase):
+    def test_expiry_uses_injected_date(self):
+        details = card("4111111111111111", expiry="06/27")
+        self.assertTrue(PaymentProcessing(today=lambda: TODAY).validate_credit_card(details))
+        self.assertFalse(PaymentProcessing(today=lambda: datetime.date(2027, 7, 1)).validate_credit_card(details))
+
+    def test_invalid_cards_are_rejected(self):
+        payment_processing = PaymentProcessing(today=lambda: TODAY)
+        orders = [({"total_amount": 10.0}, "credit_card", card("4111111111111112")),
+                  ({"total_amount": 10.0}, "credit_card", card("4111111111111111", expiry="01/26")),
+                  ({"total_amount": 10.0}, "credit_card", card("4111111111111111"))]
+        expected = ["Error: Invalid credit card details"] * 2 + ["Payment successful, Order confirmed"]
+        self.assertEqual([payment_processing.process_payment(*order) for order in orders], expected)
+        self.assertEqual(payment_processing.process_payments_batch(orders), expected)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,137 @@
+# python -m unittest test_card_vault.py
+import datetime
+import unittest
+from card_vault import CardVault
+from Payment_Processing import PaymentProcessing
+
+TODAY = datetime.date(2026, 10, 18)
+CARD = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestCardVault(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.vault = CardVault(maxsize=2, ttl=60.0, clock=self.clock)
+
+    def test_tokenize_validates_once(self):
+        token = self.vault.tokenize(CARD, TODAY)
+        self.assertTrue(token.startswith("tok_"))
+        self.assertNotIn("4111111111111111", token)
+        self.assertEqual(self.vault.tokenize(dict(CARD), TODAY), token)
+        self.assertEqual((self.vault.validations, self.vault.reused), (1, 1))
+        record = self.vault.lookup(token, TODAY)
+        self.assertEqual((record.network, record.last4, record.expiry), ("visa", "1111", (2030, 12)))
+
+    def test_known_card_with_malformed_cvv_is_rejected(self):
+        token = self.vault.tokenize(CARD, TODAY)
+        for cvv in ("zz", "12", "1234", None):
+            with self.assertRaisesRegex(ValueError, "Invalid CVV"):
+                self.vault.tokenize(dict(CARD, cvv=cvv), TODAY)
+        card = dict(CARD)
+        del card["cvv"]
+        with self.assertRaisesRegex(ValueError, "Invalid CVV"):
+            self.vault.tokenize(card, TODAY)
+        self.assertEqual(self.vault.tokenize(CARD, TODAY), token)
+        self.assertEqual((self.vault.validations, self.vault.reused), (1, 1))
+
+    def test_invalid_cards_are_rejected(self):
+        with self.assertRaisesRegex(ValueError, "Invalid credit card details: Invalid card number"):
+            self.vault.tokenize(dict(CARD, card_number="4111111111111112"), TODAY)
+        with self.assertRaisesRegex(ValueError, "Card expired"):
+            self.vault.tokenize(dict(CARD, expiry_date="01/26"), TODAY)
+        self.assertEqual(len(self.vault.cards), 0)
+
+    def test_tokens_expire(self):
+        token = self.vault.tokenize(CARD, TODAY)
+        self.assertIsNone(self.vault.lookup(token, datetime.date(2031, 1, 1)))  # The card expired.
+        self.clock.now = 61.0
+        self.assertIsNone(self.vault.lookup(token, TODAY))  # The token expired.
+        with self.assertRaisesRegex(ValueError, "Invalid or expired card token"):
+            self.vault.resolve({"token": token}, TODAY)
+        self.assertNotEqual(self.vault.tokenize(CARD, TODAY), token)
+
+    def test_bounded_size_and_forget(self):
+        tokens = [self.vault.tokenize(dict(CARD, expiry_date=expiry), TODAY) for expiry in ("10/30", "11/30", "12/30")]
+        self.assertIsNone(self.vault.lookup(tokens[0], TODAY))  # Evicted as least recently used.
+        self.vault.forget(tokens[2])
+        self.assertIsNone(self.vault.lookup(tokens[2], TODAY))
+        self.assertEqual(self.vault.tokenize(dict(CARD, expiry_date="11/30"), TODAY), tokens[1])
+
+    def test_cvv_is_not_stored(self):
+        token = self.vault.tokenize(CARD, TODAY)
+        self.assertNotIn("cvv", self.vault.lookup(token, TODAY).details)
+        self.assertEqual(self.vault.tokenize(dict(CARD, cvv="999"), TODAY), token)  # Same card, CVV not compared.
+        self.assertEqual(self.vault.resolve({"token": token}, TODAY),
+                         {"card_number": "4111111111111111", "expiry_date": "12/30"})
+        self.assertEqual(self.vault.resolve({"token": token, "cvv": "456"}, TODAY)["cvv"], "456")
+        self.assertNotIn("cvv", self.vault.lookup(token, TODAY).details)
+        for cvv in ("12", "1234", "abc", None):
+            with self.assertRaisesRegex(ValueError, "Invalid CVV"):
+                self.vault.resolve({"token": token, "cvv": cvv}, TODAY)
+
+    def test_stats(self):
+        token = self.vault.tokenize(CARD, TODAY)
+        for _ in range(3):
+            self.vault.resolve({"token": token}, TODAY)
+        stats = self.vault.stats()
+        self.assertEqual((stats["validations"], stats["reused"], stats["hit_rate"]), (1, 3, 0.75))
+        self.assertAlmostEqual(stats["validation_ns_saved"], 3 * stats["average_validation_ns"])
+
+class TestTokenizedPayments(unittest.TestCase):
+    def setUp(self):
+        self.vault = CardVault()
+        self.payment_processing = PaymentProcessing(today=lambda: TODAY, vault=self.vault)
+
+    def test_token_payments_skip_validation(self):
+        token = self.payment_processing.tokenize_card(CARD)
+        self.assertEqual(set(token), {"token"})
+        for _ in range(5):
+            self.assertEqual(self.payment_processing.process_payment({"total_amount": 10.0}, "credit_card", token),
+                             "Payment successful, Order confirmed")
+        self.assertTrue(self.payment_processing.validate_payment_method("credit_card", token))
+        self.assertEqual(self.vault.validations, 1)
+
+    def test_tokenize_card_checks_the_cvv_of_known_cards(self):
+        self.payment_processing.tokenize_card(CARD)
+        with self.assertRaisesRegex(ValueError, "Invalid CVV"):
+            self.payment_processing.tokenize_card(dict(CARD, cvv="zz"))
+
+    def test_saved_card_with_reentered_cvv(self):
+        token = self.payment_processing.tokenize_card(CARD)
+        self.assertEqual(self.payment_processing.process_payment({"total_amount": 10.0}, "credit_card",
+                                                                 dict(token, cvv="321")),
+                         "Payment successful, Order confirmed")
+        self.assertEqual(self.payment_processing.process_payment({"total_amount": 10.0}, "credit_card",
+                                                                 dict(token, cvv="1")),
+                         "Error: Invalid CVV")
+        with self.assertRaisesRegex(ValueError, "Invalid CVV"):
+            self.payment_processing.validate_payment_method("credit_card", dict(token, cvv="1"))
+
+    def test_gateway_receives_card_details(self):
+        declined = self.payment_processing.tokenize_card(dict(CARD, card_number="4000000000000002"))
+        self.assertEqual(self.payment_processing.process_payment({"total_amount": 10.0}, "credit_card", declined),
+                         "Payment failed, please try again")
+
+    def test_unknown_tokens(self):
+        unknown = {"token": "tok_unknown"}
+        self.assertEqual(self.payment_processing.process_payment({"total_amount": 10.0}, "credit_card", unknown),
+                         "Error: Invalid or expired card token")
+        with self.assertRaisesRegex(ValueError, "Invalid or expired card token"):
+            self.payment_processing.validate_payment_method("credit_card", unknown)
+
+    def test_batch_with_tokens(self):
+        token = self.payment_processing.tokenize_card(CARD)
+        orders = [({"total_amount": 10.0}, "credit_card", token), ({"total_amount": 10.0}, "credit_card", CARD),
+                  ({"total_amount": 10.0}, "credit_card", {"token": "tok_unknown"})]
+        self.assertEqual(self.payment_processing.process_payments_batch(orders),
+                         ["Payment successful, Order confirmed"] * 2 + ["Error: Invalid or expired card token"])
+        self.assertEqual(self.vault.validations, 1)
+
+if __name__ == '__main__':
+    unittest.main()
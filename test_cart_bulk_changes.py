@@ -0,0 +1,69 @@
+# python -m unittest test_cart_bulk_changes.py
+import unittest
+from unittest import mock
+from Order_Placement import Cart
+
+class TestCartApplyChanges(unittest.TestCase):
+    def setUp(self):
+        self.cart = Cart(debug=True)
+        self.cart.add_item("Salad", 6.50, 1)
+
+    def test_apply_changes(self):
+        result = self.cart.apply_changes([
+            {"op": "add", "name": "Burger", "price": 8.99, "quantity": 2},
+            {"op": "add", "name": "Burger", "price": 8.99, "quantity": 1},
+            {"op": "add", "name": "Pizza", "price": 12.99, "quantity": 1},
+            {"op": "update", "name": "Pizza", "quantity": 2},
+            {"op": "remove", "name": "Salad"},
+        ])
+        self.assertEqual(result["applied"], 5)
+        self.assertEqual(result["errors"], [])
+        self.assertEqual(self.cart.view_cart(), [
+            {"name": "Burger", "quantity": 3, "subtotal": 26.97},
+            {"name": "Pizza", "quantity": 2, "subtotal": 25.98},
+        ])
+        self.assertEqual(result["total_info"], self.cart.calculate_total())
+        self.assertEqual(result["total_info"]["subtotal"], 52.95)
+
+    def test_invalid_changes_are_reported_and_skipped(self):
+        result = self.cart.apply_changes([
+            {"op": "add", "name": "Burger", "price": 8.99, "quantity": -2},
+            {"op": "add", "name": "Pizza", "price": -12.99, "quantity": 1},
+            {"op": "update", "name": "Pasta", "quantity": 1},
+            {"op": "update", "name": "Salad", "quantity": -1},
+            {"op": "refund", "name": "Salad"},
+            {"op": "update", "name": "Salad", "quantity": 3},
+        ])
+        self.assertEqual(result["applied"], 1)
+        self.assertEqual([error["index"] for error in result["errors"]], [0, 1, 2, 3, 4])
+        self.assertEqual(self.cart.view_cart(), [{"name": "Salad", "quantity": 3, "subtotal": 19.5}])
+
+    def test_malformed_change_keeps_totals_consistent(self):
+        context_total = self.cart.calculate_total()["total"]
+        version = self.cart.version
+        with self.assertRaises(TypeError):
+            self.cart.apply_changes([{"op": "add", "name": "Steak", "price": 100.00, "quantity": 1},
+                                     {"op": "remove", "name": ["unhashable"]}])
+        self.assertIn("Steak", [item["name"] for item in self.cart.view_cart()])
+        self.assertGreater(self.cart.version, version)  # Memoized checkout contexts are invalidated.
+        self.assertEqual(self.cart.calculate_total()["subtotal"], 106.5)  # debug=True rechecks the running subtotal.
+        self.assertNotEqual(self.cart.calculate_total()["total"], context_total)
+        with self.assertRaises(AttributeError):
+            self.cart.apply_changes([{"op": "update", "name": "Steak", "quantity": 2}, None])
+        self.assertEqual(self.cart.calculate_total()["subtotal"], 206.5)
+
+    def test_reprices_once(self):
+        with mock.patch.object(self.cart, "calculate_total", wraps=self.cart.calculate_total) as calculate_total:
+            self.cart.apply_changes({"op": "add", "name": f"Item {i}", "price": 1.0, "quantity": 1}
+                                    for i in range(100))
+        calculate_total.assert_called_once_with()
+
+    def test_single_mutations_reject_negative_values(self):
+        self.assertEqual(self.cart.add_item("Burger", 8.99, -2),
+                         "Cannot add Burger: Quantity must be a non-negative integer")
+        self.assertEqual(self.cart.update_item_quantity("Salad", -1),
+                         "Cannot update Salad: Quantity must be a non-negative integer")
+        self.assertEqual(len(self.cart.view_cart()), 1)
+
+if __name__ == '__main__':
+    unittest.main()
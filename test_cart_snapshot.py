@@ -0,0 +1,59 @@
+# python -m unittest test_cart_snapshot.py
+import pickle
+import unittest
+from cart_snapshot import CartSnapshot, pack_snapshot
+from Order_Placement import Cart, ColumnarCart
+
+class TestCartSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.cart = Cart()
+        self.cart.add_item("Burger", 8.99, 2)
+        self.cart.add_item("Pizza Margherita 🍕", 12.99, 1)
+        self.cart.add_item("Water", 0.00, 3)
+
+    def test_round_trip(self):
+        restored = Cart.from_bytes(self.cart.to_bytes())
+        self.assertEqual([(item.name, item.price, item.quantity) for item in restored.items],
+                         [(item.name, item.price, item.quantity) for item in self.cart.items])
+        self.assertEqual(restored.calculate_total(), self.cart.calculate_total())
+
+    def test_snapshot_is_smaller_than_pickle(self):
+        self.assertLess(len(self.cart.to_bytes()), len(pickle.dumps(self.cart)))
+
+    def test_reads_memoryview_in_place(self):
+        buffer = bytearray(self.cart.to_bytes())
+        snapshot = CartSnapshot(memoryview(buffer))
+        self.assertEqual(list(snapshot.prices), [899, 1299, 0])
+        self.assertEqual(snapshot.name(1), "Pizza Margherita 🍕")
+        buffer[16:18] = (100).to_bytes(2, "little")  # The snapshot sees changes to the underlying buffer
+        self.assertEqual(snapshot.prices[0], 100)
+
+    def test_columnar_cart_round_trip(self):
+        columnar = ColumnarCart.from_bytes(self.cart.to_bytes())
+        columnar.remove_item("Burger")
+        restored = Cart.from_bytes(columnar.to_bytes())
+        self.assertEqual(restored.view_cart(), columnar.view_cart())
+        self.assertEqual(restored.calculate_total(), columnar.calculate_total())
+
+    def test_wide_values(self):
+        self.cart.add_item("Catering Tray", 123456.78, 70_000)
+        restored = Cart.from_bytes(self.cart.to_bytes())
+        self.assertEqual(restored.view_cart(), self.cart.view_cart())
+
+    def test_empty_cart(self):
+        self.assertEqual(Cart.from_bytes(Cart().to_bytes()).view_cart(), [])
+
+    def test_rejects_invalid_snapshots(self):
+        data = self.cart.to_bytes()
+        for corrupted in (b"", b"JSON" + data[4:], data[:4] + b"\x09" + data[5:], data[:-1]):
+            with self.assertRaises(ValueError):
+                Cart.from_bytes(corrupted)
+
+    def test_rejects_duplicate_names(self):
+        data = pack_snapshot(["Burger", "Water", "Burger"], [899, 0, 100], [2, 1, 5])
+        for cart_class in (Cart, ColumnarCart):
+            with self.assertRaisesRegex(ValueError, "duplicate item 'Burger'"):
+                cart_class.from_bytes(data)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+# python -m unittest test_cart_totals.py
+import unittest
+from Order_Placement import Cart
+
+class TestIncrementalCartTotals(unittest.TestCase):
+    def setUp(self):
+        self.cart = Cart(debug=True)
+
+    def test_total_tracks_every_mutation(self):
+        self.cart.add_item("Burger", 8.99, 2)
+        self.cart.add_item("Pizza", 12.99, 1)
+        self.cart.add_item("Burger", 8.99, 1)
+        self.cart.update_item_quantity("Pizza", 3)
+        self.cart.remove_item("Salad")  # Not in cart, subtotal is unchanged
+        total_info = self.cart.calculate_total()
+        self.assertEqual(total_info["subtotal"], 65.94)
+
+        self.cart.remove_item("Burger")
+        total_info = self.cart.calculate_total()
+        self.assertEqual(total_info["subtotal"], 38.97)
+        self.assertEqual(total_info["tax"], 3.90)
+        self.assertEqual(total_info["total"], 47.87)
+
+    def test_emptied_cart_resets_subtotal(self):
+        self.cart.add_item("Salad", 0.1, 3)
+        self.cart.add_item("Water", 0.2, 1)
+        self.cart.remove_item("Salad")
+        self.cart.remove_item("Water")
+        self.assertEqual(self.cart.calculate_total()["subtotal"], 0.0)
+
+    def test_replacing_items_recalculates_subtotal(self):
+        other = Cart()
+        other.add_item("Pizza", 10.0, 2)
+        self.cart.items = other.items
+        self.assertEqual(self.cart.calculate_total()["subtotal"], 20.0)
+
+    def test_debug_mode_detects_out_of_band_changes(self):
+        self.cart.add_item("Pizza", 10.0, 1)
+        self.cart.items[0].update_quantity(5)  # Bypasses the cart's bookkeeping
+        with self.assertRaises(RuntimeError):
+            self.cart.calculate_total()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# python -m unittest test_checkout_context.py
+import unittest
+from unittest import mock
+from Order_Placement import Cart, OrderPlacement, PaymentMethod, RestaurantMenu, UserProfile
+
+class TestCheckoutContext(unittest.TestCase):
+    def setUp(self):
+        self.cart = Cart()
+        self.cart.add_item("Pizza", 12.99, 1)
+        self.menu = RestaurantMenu(["Pizza", "Burger"])
+        self.order = OrderPlacement(self.cart, UserProfile("123 Main St"), self.menu)
+
+    def test_confirm_reuses_checkout_pricing(self):
+        self.order.proceed_to_checkout()
+        with mock.patch.object(self.order, "validate_order") as validate_order, \
+                mock.patch.object(self.cart, "calculate_total") as calculate_total:
+            result = self.order.confirm_order(PaymentMethod())
+        validate_order.assert_not_called()
+        calculate_total.assert_not_called()
+        self.assertTrue(result["success"])
+
+    def test_cart_change_invalidates_context(self):
+        first = self.order.proceed_to_checkout()
+        self.cart.add_item("Burger", 8.99, 1)
+        second = self.order.proceed_to_checkout()
+        self.assertEqual(first["total_info"]["subtotal"], 12.99)
+        self.assertEqual(second["total_info"]["subtotal"], 21.98)
+
+    def test_menu_change_invalidates_context(self):
+        self.order.proceed_to_checkout()
+        self.menu.remove_item("Pizza")
+        result = self.order.confirm_order(PaymentMethod())
+        self.assertFalse(result["success"])
+        self.assertEqual(result["message"], "Order validation failed")
+
+    def test_replaced_cart_invalidates_context(self):
+        self.order.proceed_to_checkout()
+        self.order.cart = Cart()
+        self.assertEqual(self.order.proceed_to_checkout()["items"], [])
+
+    def test_invalidate_checkout(self):
+        context = self.order.get_checkout_context()
+        self.assertIs(self.order.get_checkout_context(), context)
+        self.order.invalidate_checkout()
+        self.assertIsNot(self.order.get_checkout_context(), context)
+
+if __name__ == '__main__':
+    unittest.main()
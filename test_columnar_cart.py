@@ -0,0 +1,52 @@
+# python -m unittest test_columnar_cart.py
+import unittest
+from Order_Placement import Cart, ColumnarCart, OrderPlacement, RestaurantMenu, UserProfile
+
+class TestColumnarCart(unittest.TestCase):
+    def setUp(self):
+        self.cart = ColumnarCart()
+        self.reference = Cart()
+
+    def apply(self, method, *args):
+        self.assertEqual(getattr(self.cart, method)(*args), getattr(self.reference, method)(*args))
+
+    def test_matches_object_cart(self):
+        self.apply("add_item", "Burger", 8.99, 2)
+        self.apply("add_item", "Pizza", 12.99, 1)
+        self.apply("add_item", "Burger", 8.99, 1)
+        self.apply("update_item_quantity", "Pizza", 4)
+        self.apply("update_item_quantity", "Pasta", 1)
+        self.apply("remove_item", "Burger")
+        self.apply("add_item", "Burger", 8.99, 1)
+        self.assertEqual(self.cart.view_cart(), self.reference.view_cart())
+        self.assertEqual(self.cart.calculate_total(), self.reference.calculate_total())
+
+    def test_empty_cart_total(self):
+        self.assertEqual(self.cart.calculate_total()["total"], 5.0)
+
+    def test_compaction_preserves_order(self):
+        for i in range(500):
+            self.cart.add_item(f"Item {i}", 1.0, 1)
+        for i in range(0, 400):
+            self.cart.remove_item(f"Item {i}")
+        self.assertLess(len(self.cart._names), 200)  # Tombstones were compacted away
+        self.assertEqual([line["name"] for line in self.cart.view_cart()],
+                         [f"Item {i}" for i in range(400, 500)])
+        self.assertEqual(self.cart.calculate_total()["subtotal"], 100.0)
+
+    def test_item_views(self):
+        self.cart.add_item("Pizza", 12.5, 2)
+        item = self.cart.items[0]
+        self.assertEqual((item.name, item.price, item.quantity), ("Pizza", 12.5, 2))
+        item.update_quantity(3)
+        self.assertEqual(item.get_subtotal(), 37.5)
+        with self.assertRaises(AttributeError):
+            item.extra = True  # Views have no per-instance __dict__
+
+    def test_order_placement_accepts_columnar_cart(self):
+        self.cart.add_item("Pizza", 12.99, 1)
+        order = OrderPlacement(self.cart, UserProfile("123 Main St"), RestaurantMenu(["Pizza"]))
+        self.assertTrue(order.validate_order()["success"])
+
+if __name__ == '__main__':
+    unittest.main()
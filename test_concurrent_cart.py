@@ -0,0 +1,98 @@
+# python -m unittest test_concurrent_cart.py
+import threading
+import unittest
+from Order_Placement import Cart, OrderPlacement, PaymentMethod, RestaurantMenu, UserProfile
+
+def run_threads(count, target):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+class RecordingPaymentMethod(PaymentMethod):
+    """
+    Records each charged amount together with the cart's total at the moment of payment.
+    """
+    def __init__(self, cart):
+        self.cart = cart
+        self.charges = []
+
+    def process_payment(self, amount):
+        self.charges.append((amount, self.cart.calculate_total()["total"]))
+        return True
+
+class TestConcurrentCart(unittest.TestCase):
+    def setUp(self):
+        self.cart = Cart(debug=True, concurrent=True)
+
+    def test_concurrent_adds_are_not_lost(self):
+        def add(_):
+            for _ in range(2000):
+                self.cart.add_item("Burger", 8.99, 1)
+
+        run_threads(8, add)
+        self.assertEqual(self.cart.items[0].quantity, 16_000)
+        self.assertEqual(self.cart.calculate_total()["subtotal"], 143_840.0)
+
+    def test_mixed_edits_keep_subtotal_consistent(self):
+        def edit(worker):
+            for i in range(2000):
+                name = f"Item {i % 50}"
+                if worker % 3 == 0:
+                    self.cart.remove_item(name)
+                elif worker % 3 == 1:
+                    self.cart.add_item(name, 1.25, 2)
+                else:
+                    self.cart.apply_changes([{"op": "update", "name": name, "quantity": i % 7},
+                                             {"op": "add", "name": "Drink", "price": 0.99, "quantity": 1}])
+
+        run_threads(9, edit)
+        self.cart.calculate_total()  # Debug mode raises if the running subtotal drifted.
+
+    def test_holding_the_lock_makes_a_sequence_atomic(self):
+        self.cart.add_item("Pizza", 10.0, 1)
+
+        def increment(_):
+            for _ in range(1000):
+                with self.cart.lock:
+                    quantity = self.cart.items[0].quantity
+                    self.cart.update_item_quantity("Pizza", quantity + 1)
+
+        run_threads(4, increment)
+        self.assertEqual(self.cart.items[0].quantity, 4001)
+
+    def test_confirm_order_charges_a_consistent_total(self):
+        menu = RestaurantMenu(available_items={"Burger": 8.99, "Pizza": 12.99})
+        order = OrderPlacement(self.cart, UserProfile("123 Main St"), menu, concurrent=True)
+        payment_method = RecordingPaymentMethod(self.cart)
+        stop = threading.Event()
+
+        def edit(worker):
+            while not stop.is_set():
+                self.cart.add_item("Burger", 8.99, 1)
+                self.cart.update_item_quantity("Burger", worker + 1)
+
+        editors = [threading.Thread(target=edit, args=(i,)) for i in range(4)]
+        for editor in editors:
+            editor.start()
+        try:
+            for _ in range(200):
+                self.assertTrue(order.confirm_order(payment_method)["success"])
+        finally:
+            stop.set()
+            for editor in editors:
+                editor.join()
+
+        self.assertEqual(len(payment_method.charges), 200)
+        for charged, cart_total in payment_method.charges:
+            self.assertEqual(charged, cart_total)
+
+    def test_default_mode_has_no_lock(self):
+        cart = Cart()
+        with cart.lock:
+            cart.add_item("Salad", 7.49, 1)
+        self.assertEqual(cart.calculate_total()["subtotal"], 7.49)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+# python -m unittest test_delivery_eta.py
+import unittest
+from unittest import mock
+from delivery_eta import DEFAULT_ESTIMATE, EtaCalculator
+from Order_Placement import Cart, OrderPlacement, PaymentMethod, RestaurantMenu, UserProfile
+from Restaurant_Browsing import RestaurantDatabase
+
+class TestEtaCalculator(unittest.TestCase):
+    def setUp(self):
+        self.database = RestaurantDatabase()
+        self.calculator = EtaCalculator(self.database)
+
+    def test_address_zones(self):
+        self.assertEqual(self.calculator.zone_for_address("123 Main St"), "Downtown")
+        self.assertEqual(self.calculator.zone_for_address("9 Uptown Plaza"), "Uptown")
+        self.assertEqual(self.calculator.zone_for_address("500 Park Ave, Apt 3"), "Midtown")
+        self.assertEqual(self.calculator.zone_for_address("Somewhere else"), "Downtown")
+        self.assertEqual(self.calculator.zone_for_address(None), "Downtown")
+
+    def test_address_cache_is_normalized_and_bounded(self):
+        calculator = EtaCalculator(self.database, address_cache_size=2)
+        for address in ("1 Hill Rd", "1  hill RD ", "1 HILL RD"):
+            self.assertEqual(calculator.zone_for_address(address), "Uptown")
+        self.assertEqual(calculator._address_zones.cache_info().currsize, 1)
+        for number in range(100):
+            calculator.zone_for_address(f"{number} Market St")
+        self.assertEqual(calculator._address_zones.cache_info().currsize, 2)
+
+    def test_estimates_combine_prep_and_travel_time(self):
+        # Sushi House: Midtown, $$$ (20 minutes prep); Uptown delivery is 16 minutes away
+        self.assertEqual(self.calculator.estimate_minutes("Sushi House", "1 Hill Rd"), 36)
+        # Taco Town: Downtown, $ (10 minutes prep), delivering within Downtown
+        self.assertEqual(self.calculator.estimate("Taco Town", "123 Main St"), "20 minutes")
+        self.assertEqual(self.calculator.estimate("Unknown Diner", "123 Main St"), DEFAULT_ESTIMATE)
+        with self.assertRaises(ValueError):
+            self.calculator.estimate_minutes("Unknown Diner", "123 Main St")
+
+    def test_estimates_are_memoized_per_restaurant_and_zone(self):
+        with mock.patch.object(self.calculator, "_compute", wraps=self.calculator._compute) as compute:
+            for address in ("123 Main St", "77 Market St", "1 Downtown Sq"):
+                self.calculator.estimate("Pizza Palace", address)
+            self.calculator.estimate("Pizza Palace", "1 Broadway")
+        self.assertEqual(compute.call_count, 2)
+
+    def test_invalidate_picks_up_database_changes(self):
+        self.assertEqual(self.calculator.estimate_minutes("Pizza Palace", "123 Main St"), 43)
+        self.database.restaurants[4]["location"] = "Downtown"
+        self.calculator.invalidate()
+        self.assertEqual(self.calculator.estimate_minutes("Pizza Palace", "123 Main St"), 25)
+
+class TestOrderEstimatedDelivery(unittest.TestCase):
+    def setUp(self):
+        self.cart = Cart()
+        self.cart.add_item("Pizza", 12.99, 1)
+        self.user_profile = UserProfile("123 Main St")
+        self.menu = RestaurantMenu(["Pizza"])
+
+    def test_confirm_order_uses_the_eta_calculator(self):
+        order = OrderPlacement(self.cart, self.user_profile, self.menu, restaurant="Italian Bistro",
+                               eta_calculator=EtaCalculator(RestaurantDatabase()))
+        self.assertEqual(order.confirm_order(PaymentMethod())["estimated_delivery"], "25 minutes")
+
+        self.user_profile.add_address("Work", "200 Uptown Ave")
+        self.user_profile.switch_address("Work")
+        self.assertEqual(order.confirm_order(PaymentMethod())["estimated_delivery"], "43 minutes")
+
+    def test_default_estimate_without_calculator(self):
+        order = OrderPlacement(self.cart, self.user_profile, self.menu)
+        self.assertEqual(order.confirm_order(PaymentMethod())["estimated_delivery"], "45 minutes")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,112 @@
+# python -m unittest test_gateway_client.py
+import asyncio
+import time
+import unittest
+from payment_gateway_client import GatewayClient, GatewayError, GatewayTimeout, HttpPaymentGateway, LocalGatewayServer
+from Payment_Processing import NotificationService, OrderController, PaymentGateway, PaymentService
+
+CARD = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+
+class TestHttpPaymentGateway(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalGatewayServer().start()
+        self.gateway = HttpPaymentGateway("127.0.0.1", self.server.port, pool_size=4, request_timeout=1.0)
+
+    def tearDown(self):
+        self.gateway.close()
+        self.server.stop()
+
+    def test_payment_service_uses_the_gateway_transparently(self):
+        service = PaymentService(self.gateway)
+        response = service.process_payment({"total_amount": 20.0}, CARD)
+        self.assertEqual(response["status"], "success")
+        self.assertTrue(response["transaction_id"].startswith("txn"))
+        self.assertEqual(service.process_payment({"total_amount": 20.0}, {"card_number": "123"}),
+                         {"status": "failure", "message": "Invalid payment details"})
+        controller = OrderController(service, NotificationService())
+        self.assertEqual(controller.place_order({"total_amount": 20.0}, CARD), "Order Confirmed")
+
+    def test_connections_are_kept_alive(self):
+        for _ in range(10):
+            self.gateway.process_payment("credit_card", CARD, 5.0)
+        self.assertEqual(self.gateway.client.connections_opened, 1)
+        self.assertEqual(self.server.connections, 1)
+        self.assertEqual(self.server.requests, 10)
+
+    def test_gateway_errors(self):
+        self.server.failure_rate = 1.0
+        with self.assertRaises(GatewayError):
+            self.gateway.process_payment("credit_card", CARD, 5.0)
+        self.server.failure_rate = 0.0
+        self.assertEqual(self.gateway.process_payment("credit_card", CARD, 5.0)["status"], "success")
+
+    def test_timeout_discards_the_connection(self):
+        self.server.latency = 0.5
+        self.gateway.client.request_timeout = 0.05
+        with self.assertRaises(GatewayTimeout):
+            self.gateway.process_payment("credit_card", CARD, 5.0)
+        self.server.latency = 0.0
+        self.assertEqual(self.gateway.process_payment("credit_card", CARD, 5.0)["status"], "success")
+        self.assertEqual(self.gateway.client.connections_opened, 2)
+
+    def test_unreachable_gateway(self):
+        port = self.server.port
+        self.server.stop()
+        with HttpPaymentGateway("127.0.0.1", port) as gateway, self.assertRaises(GatewayError):
+            gateway.process_payment("credit_card", CARD, 5.0)
+        self.server = LocalGatewayServer()
+
+class TestGatewayClient(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.server = LocalGatewayServer(latency=0.05).start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    async def test_pool_size_limits_concurrent_connections(self):
+        client = GatewayClient("127.0.0.1", self.server.port, pool_size=4)
+        start = time.perf_counter()
+        responses = await asyncio.gather(*(client.process_payment("credit_card", CARD, 5.0) for _ in range(16)))
+        elapsed = time.perf_counter() - start
+        await client.close()
+        self.assertTrue(all(response["status"] == "success" for response in responses))
+        self.assertEqual(client.connections_opened, 4)
+        self.assertGreaterEqual(elapsed, 4 * 0.05 * 0.9)  # 16 requests through 4 connections.
+
+    async def test_bad_requests_raise(self):
+        client = GatewayClient("127.0.0.1", self.server.port)
+        with self.assertRaisesRegex(GatewayError, "HTTP 404"):
+            await client.request("GET", "/unknown", {})
+        with self.assertRaisesRegex(GatewayError, "HTTP 400"):
+            await client.request("POST", "/payments", {"amount": 5.0})
+        await client.close()
+
+    async def test_malformed_responses_raise(self):
+        responses = [b"HTTP/1.1\r\nContent-Length: 2\r\n\r\n{}",
+                     b"HTTP/1.1 200 OK\r\nContent-Length: 8\r\n\r\nnot json"]
+
+        async def respond(reader, writer):
+            await reader.readuntil(b"\r\n\r\n")
+            writer.write(responses.pop(0))
+            await writer.drain()
+            writer.close()
+
+        server = await asyncio.start_server(respond, "127.0.0.1", 0)
+        client = GatewayClient("127.0.0.1", server.sockets[0].getsockname()[1])
+        with self.assertRaisesRegex(GatewayError, "Malformed gateway status line"):
+            await client.request("GET", "/payments", {})
+        with self.assertRaisesRegex(GatewayError, "Malformed gateway response body"):
+            await client.request("GET", "/payments", {})
+        await client.close()
+        server.close()
+        await server.wait_closed()
+
+    async def test_payment_service_async(self):
+        with HttpPaymentGateway("127.0.0.1", self.server.port) as gateway:
+            services = [PaymentService(gateway), PaymentService(PaymentGateway())]
+            responses = await asyncio.gather(*(service.process_payment_async({"total_amount": 5.0}, CARD)
+                                               for service in services))
+        self.assertEqual([response["status"] for response in responses], ["success", "success"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,217 @@
+# python -m unittest test_gateway_resilience.py
+import time
+import unittest
+from gateway_resilience import (CLOSED, HALF_OPEN, OPEN, CircuitBreaker, ResilientGateway, RetryBudget,
+                                jittered_backoff)
+from payment_gateway_client import (GatewayError, GatewayTimeout, GatewayUnavailable, HttpPaymentGateway,
+                                    LocalGatewayServer)
+from Payment_Processing import (ORDER_PENDING, PAYMENT_PENDING, FakePaymentGateway, NotificationService,
+                                OrderController, PaymentProcessing, PaymentService)
+
+CARD = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class SpikyGateway(FakePaymentGateway):
+    """
+    A fake gateway that answers after a scripted latency and raises scripted errors.
+    latencies and errors are consumed one per call; when exhausted, calls are fast and succeed.
+    """
+    def __init__(self, latencies=(), errors=()):
+        self.latencies = list(latencies)
+        self.errors = list(errors)
+        self.calls = 0
+
+    def process_payment(self, method, details, amount):
+        self.calls += 1
+        latency = self.latencies.pop(0) if self.latencies else 0.0
+        if latency:
+            time.sleep(latency)
+        error = self.errors.pop(0) if self.errors else None
+        if error:
+            raise error
+        return super().process_payment(method, details, amount)
+
+class TestCircuitBreaker(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(failure_rate=0.5, window=10, min_calls=4, reset_timeout=5.0, clock=self.clock)
+
+    def test_opens_on_failures_and_recovers_after_a_trial_call(self):
+        for failed in (False, True, False, True):
+            self.assertTrue(self.breaker.allow())
+            self.breaker.record(0.01, failed=failed)
+        self.assertEqual(self.breaker.state, OPEN)
+        self.assertFalse(self.breaker.allow())
+
+        self.clock.now = 5.0
+        self.assertTrue(self.breaker.allow())
+        self.assertEqual(self.breaker.state, HALF_OPEN)
+        self.assertFalse(self.breaker.allow())  # Only one trial call at a time.
+        self.breaker.record(0.01)
+        self.assertEqual(self.breaker.state, CLOSED)
+
+    def test_failed_trial_reopens(self):
+        for _ in range(4):
+            self.breaker.allow()
+            self.breaker.record(0.01, failed=True)
+        self.clock.now = 5.0
+        self.breaker.allow()
+        self.breaker.record(0.01, failed=True)
+        self.assertEqual((self.breaker.state, self.breaker.opened), (OPEN, 2))
+        self.clock.now = 9.0
+        self.assertFalse(self.breaker.allow())
+
+    def test_opens_on_slow_calls(self):
+        breaker = CircuitBreaker(slow_call_duration=0.5, slow_call_rate=0.5, min_calls=4, clock=self.clock)
+        for duration in (0.1, 0.6, 0.1, 0.1):
+            breaker.allow()
+            breaker.record(duration)
+        self.assertEqual(breaker.state, CLOSED)
+        breaker.allow()
+        breaker.record(0.7)
+        breaker.allow()
+        breaker.record(0.8)
+        self.assertEqual(breaker.state, OPEN)
+
+class TestRetryBudget(unittest.TestCase):
+    def test_retries_are_limited_to_a_fraction_of_requests(self):
+        clock = FakeClock()
+        budget = RetryBudget(ratio=0.1, min_retries=2, window=10.0, clock=clock)
+        for _ in range(20):
+            budget.record_request()
+        self.assertEqual(sum(budget.try_retry() for _ in range(10)), 4)  # 2 + 0.1 * 20
+        clock.now = 10.0  # The window has passed.
+        self.assertTrue(budget.try_retry())
+
+    def test_jittered_backoff(self):
+        self.assertEqual(jittered_backoff(1, base=0.1, rng=lambda: 0.0), 0.0)
+        self.assertAlmostEqual(jittered_backoff(3, base=0.1, rng=lambda: 0.5), 0.2)
+        self.assertAlmostEqual(jittered_backoff(10, base=0.1, cap=1.0, rng=lambda: 0.999), 0.999)
+
+class TestResilientGateway(unittest.TestCase):
+    def setUp(self):
+        self.delays = []
+
+    def test_retries_with_backoff(self):
+        primary = SpikyGateway(errors=[GatewayUnavailable("503"), ConnectionRefusedError("refused")])
+        gateway = ResilientGateway(primary, max_attempts=3, backoff_base=0.1, sleep=self.delays.append)
+        self.assertEqual(gateway.process_payment("credit_card", CARD, 10.0)["status"], "success")
+        self.assertEqual((primary.calls, gateway.retries), (3, 2))
+        self.assertTrue(0 <= self.delays[0] <= 0.1 and 0 <= self.delays[1] <= 0.2)
+
+    def test_gives_up_after_max_attempts(self):
+        primary = SpikyGateway(errors=[GatewayUnavailable("503")] * 5)
+        gateway = ResilientGateway(primary, max_attempts=3, sleep=self.delays.append)
+        response = gateway.process_payment("credit_card", CARD, 10.0)
+        self.assertEqual(response["status"], "failure")
+        self.assertIn("503", response["message"])
+        self.assertEqual((primary.calls, gateway.failures), (3, 1))
+
+    def test_declines_are_not_retried(self):
+        primary = SpikyGateway()
+        gateway = ResilientGateway(primary, sleep=self.delays.append)
+        response = gateway.process_payment("credit_card", {"card_number": "1111222233334444"}, 10.0)
+        self.assertEqual(response, {"status": "failure", "message": "Card declined"})
+        self.assertEqual(primary.calls, 1)
+
+    def test_errors_after_the_request_was_sent_are_not_retried(self):
+        for error in (GatewayTimeout("No response"), GatewayError("Gateway closed the connection"),
+                      ConnectionResetError("reset")):
+            primary = SpikyGateway(errors=[error])
+            gateway = ResilientGateway(primary, sleep=self.delays.append)
+            response = gateway.process_payment("credit_card", CARD, 10.0)
+            self.assertEqual(response["status"], "unknown")
+            self.assertEqual((primary.calls, gateway.retries, gateway.unknown), (1, 0, 1))
+
+    def test_response_timeout_charges_once(self):
+        with LocalGatewayServer(latency=0.2) as server, \
+                HttpPaymentGateway("127.0.0.1", server.port, request_timeout=0.05) as http_gateway:
+            gateway = ResilientGateway(http_gateway, sleep=self.delays.append)
+            response = gateway.process_payment("credit_card", CARD, 10.0)
+            self.assertEqual(response["status"], "unknown")
+            self.assertEqual((server.requests, gateway.retries), (1, 0))
+
+            server.latency, server.failure_rate = 0.0, 1.0  # HTTP 503: the payment was not processed.
+            self.assertEqual(gateway.process_payment("credit_card", CARD, 10.0)["status"], "failure")
+            self.assertEqual((server.requests, gateway.retries), (4, 2))
+
+    def test_retry_budget_caps_retries(self):
+        primary = SpikyGateway(errors=[GatewayUnavailable("503")] * 100)
+        gateway = ResilientGateway(primary, breaker=CircuitBreaker(min_calls=1000), max_attempts=5,
+                                   retry_budget=RetryBudget(ratio=0.0, min_retries=3), sleep=self.delays.append)
+        for _ in range(5):
+            gateway.process_payment("credit_card", CARD, 10.0)
+        self.assertEqual(gateway.retries, 3)
+        self.assertEqual(primary.calls, 8)
+
+    def test_open_circuit_fails_fast(self):
+        primary = SpikyGateway(errors=[GatewayUnavailable("503")] * 100)
+        breaker = CircuitBreaker(min_calls=4, reset_timeout=60.0)
+        gateway = ResilientGateway(primary, breaker=breaker, max_attempts=1, sleep=self.delays.append)
+        for _ in range(10):
+            gateway.process_payment("credit_card", CARD, 10.0)
+        self.assertEqual(primary.calls, 4)
+        self.assertEqual(gateway.short_circuited, 6)
+
+    def test_fails_over_while_the_primary_circuit_is_open(self):
+        primary = SpikyGateway(errors=[GatewayUnavailable("503")] * 100)
+        secondary = SpikyGateway()
+        gateway = ResilientGateway(primary, secondary, breaker=CircuitBreaker(min_calls=2, reset_timeout=60.0),
+                                   max_attempts=1, sleep=self.delays.append)
+        results = [gateway.process_payment("credit_card", CARD, 10.0)["status"] for _ in range(5)]
+        self.assertEqual(results, ["failure", "failure", "success", "success", "success"])
+        self.assertEqual((primary.calls, secondary.calls), (2, 3))
+
+    def test_hedges_latency_spikes_to_the_secondary(self):
+        primary = SpikyGateway(latencies=[0.5])
+        secondary = SpikyGateway()
+        gateway = ResilientGateway(primary, secondary, hedge_delay=0.02)
+        start = time.perf_counter()
+        self.assertEqual(gateway.process_payment("credit_card", CARD, 10.0)["status"], "success")
+        self.assertLess(time.perf_counter() - start, 0.3)
+        self.assertEqual((gateway.hedges, gateway.hedge_wins), (1, 1))
+
+        self.assertEqual(gateway.process_payment("credit_card", CARD, 10.0)["status"], "success")
+        self.assertEqual(gateway.hedges, 1)  # Fast calls are not hedged.
+        gateway.close()
+        self.assertEqual(secondary.calls, 1)
+
+    def test_hedged_call_survives_a_secondary_error(self):
+        primary = SpikyGateway(latencies=[0.1])
+        secondary = SpikyGateway(errors=[GatewayUnavailable("503")])
+        gateway = ResilientGateway(primary, secondary, hedge_delay=0.01, sleep=self.delays.append)
+        self.assertEqual(gateway.process_payment("credit_card", CARD, 10.0)["status"], "success")
+        self.assertEqual((gateway.hedge_wins, gateway.retries), (0, 0))
+        gateway.close()
+
+    def test_drop_in_for_payment_service(self):
+        gateway = ResilientGateway(SpikyGateway(errors=[GatewayUnavailable("503")]), sleep=self.delays.append)
+        controller = OrderController(PaymentService(gateway), NotificationService())
+        self.assertEqual(controller.place_order({"total_amount": 10.0}, CARD), "Order Confirmed")
+        down = ResilientGateway(SpikyGateway(errors=[GatewayUnavailable("503")] * 3), sleep=self.delays.append)
+        controller = OrderController(PaymentService(down), NotificationService())
+        self.assertEqual(controller.place_order({"total_amount": 10.0}, CARD), "Order Failed")
+
+    def test_unknown_outcome_is_pending_and_not_charged_again(self):
+        primary = SpikyGateway(errors=[GatewayTimeout("No response")] * 10)
+        gateway = ResilientGateway(primary, sleep=self.delays.append)
+        controller = OrderController(PaymentService(gateway), NotificationService())
+        for _ in range(2):
+            self.assertEqual(controller.place_order({"total_amount": 10.0}, CARD, idempotency_key="order-1"),
+                             ORDER_PENDING)
+        self.assertEqual(primary.calls, 1)
+
+        card = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
+        processing = PaymentProcessing(gateway)
+        self.assertEqual(processing.process_payment({"total_amount": 10.0}, "credit_card", card), PAYMENT_PENDING)
+        self.assertEqual(processing.process_payments_batch([({"total_amount": 10.0}, "credit_card", card)]),
+                         [PAYMENT_PENDING])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+# python -m unittest test_idempotent_checkout.py
+import threading
+import time
+import unittest
+from unittest import mock
+from Order_Placement import Cart, OrderPlacement, PaymentMethod, RestaurantMenu, UserProfile
+from Payment_Processing import NotificationService, OrderController, PaymentGateway, PaymentService
+from result_cache import IdempotencyCache, TTLCache
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class CountingPaymentMethod(PaymentMethod):
+    def __init__(self, delay=0.0, approve=True):
+        self.delay = delay
+        self.approve = approve
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def process_payment(self, amount):
+        with self.lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        return self.approve
+
+class CountingGateway(PaymentGateway):
+    def __init__(self, fail_first=0):
+        self.calls = 0
+        self.fail_first = fail_first
+
+    def process_payment(self, method, details, amount):
+        self.calls += 1
+        if self.calls <= self.fail_first:
+            raise ConnectionError("Gateway unreachable")
+        time.sleep(0.05)
+        return super().process_payment(method, details, amount)
+
+def run_concurrently(count, target):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def run(index):
+        barrier.wait()
+        results[index] = target()
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+class TestTTLCache(unittest.TestCase):
+    def test_expiry_and_lru_eviction(self):
+        clock = FakeClock()
+        cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertEqual(cache.get("a"), 1)  # "b" is now least recently used
+        cache.set("c", 3)
+        self.assertNotIn("b", cache)
+        clock.now = 11
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+class TestIdempotentConfirmOrder(unittest.TestCase):
+    def setUp(self):
+        cart = Cart()
+        cart.add_item("Burger", 8.99, 2)
+        self.order = OrderPlacement(cart, UserProfile("123 Main St"), RestaurantMenu(["Burger"]),
+                                    idempotency_cache=IdempotencyCache())
+
+    def test_retry_returns_original_result_without_charging(self):
+        payment_method = CountingPaymentMethod()
+        first = self.order.confirm_order(payment_method, idempotency_key="checkout-1")
+        retry = self.order.confirm_order(payment_method, idempotency_key="checkout-1")
+        self.assertEqual(retry, first)
+        self.assertEqual(payment_method.calls, 1)
+
+        other = self.order.confirm_order(payment_method, idempotency_key="checkout-2")
+        self.assertNotEqual(other["order_id"], first["order_id"])
+        self.assertEqual(payment_method.calls, 2)
+
+    def test_concurrent_duplicates_charge_once(self):
+        payment_method = CountingPaymentMethod(delay=0.05)
+        results = run_concurrently(10, lambda: self.order.confirm_order(payment_method, idempotency_key="tap-tap"))
+        self.assertEqual(payment_method.calls, 1)
+        self.assertEqual(len({result["order_id"] for result in results}), 1)
+        self.assertEqual(self.order.idempotency_cache.replayed, 9)
+
+    def test_failures_are_not_cached(self):
+        declined = CountingPaymentMethod(approve=False)
+        self.assertFalse(self.order.confirm_order(declined, idempotency_key="checkout-1")["success"])
+        approved = CountingPaymentMethod()
+        self.assertTrue(self.order.confirm_order(approved, idempotency_key="checkout-1")["success"])
+        self.assertEqual((declined.calls, approved.calls), (1, 1))
+
+    def test_keys_are_scoped_to_the_order(self):
+        cart = Cart()
+        cart.add_item("Burger", 8.99, 2)
+        other = OrderPlacement(cart, UserProfile("123 Main St"), RestaurantMenu(["Burger"]),
+                               idempotency_cache=self.order.idempotency_cache)
+        payment_method = CountingPaymentMethod()
+        first = self.order.confirm_order(payment_method, idempotency_key="checkout-1")
+        second = other.confirm_order(payment_method, idempotency_key="checkout-1")
+        self.assertNotEqual(first["order_id"], second["order_id"])
+        self.assertEqual(payment_method.calls, 2)
+
+    def test_reused_key_with_different_cart_is_rejected(self):
+        payment_method = CountingPaymentMethod()
+        self.order.confirm_order(payment_method, idempotency_key="checkout-1")
+        self.order.cart.add_item("Burger", 8.99, 1)
+        with self.assertRaises(ValueError):
+            self.order.confirm_order(payment_method, idempotency_key="checkout-1")
+        self.assertEqual(payment_method.calls, 1)
+
+    def test_replays_are_copies(self):
+        payment_method = CountingPaymentMethod()
+        first = self.order.confirm_order(payment_method, idempotency_key="checkout-1")
+        first["message"] = "Changed by the caller"
+        retry = self.order.confirm_order(payment_method, idempotency_key="checkout-1")
+        self.assertEqual(retry["message"], "Order confirmed")
+        retry["message"] = "Changed again"
+        self.assertEqual(self.order.confirm_order(payment_method, idempotency_key="checkout-1")["message"],
+                         "Order confirmed")
+
+    def test_exceptions_are_not_cached(self):
+        class FlakyPaymentMethod(PaymentMethod):
+            calls = 0
+
+            def process_payment(self, amount):
+                self.calls += 1
+                if self.calls == 1:
+                    raise ConnectionError("Network dropped")
+                return True
+
+        payment_method = FlakyPaymentMethod()
+        with self.assertRaises(ConnectionError):
+            self.order.confirm_order(payment_method, idempotency_key="flaky")
+        self.assertTrue(self.order.confirm_order(payment_method, idempotency_key="flaky")["success"])
+
+class TestIdempotentPlaceOrder(unittest.TestCase):
+    payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+
+    def test_concurrent_duplicate_submissions(self):
+        gateway = CountingGateway()
+        controller = OrderController(PaymentService(gateway), NotificationService())
+        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        results = run_concurrently(8, lambda: controller.place_order({"total_amount": 10.0}, payment_details,
+                                                                     idempotency_key="order-42"))
+        self.assertEqual(results, ["Order Confirmed"] * 8)
+        self.assertEqual(gateway.calls, 1)
+
+    def test_failed_attempt_can_be_retried(self):
+        gateway = CountingGateway(fail_first=1)
+        controller = OrderController(PaymentService(gateway), NotificationService())
+        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        with self.assertRaises(ConnectionError):
+            controller.place_order({"total_amount": 10.0}, payment_details, idempotency_key="order-43")
+        self.assertEqual(controller.place_order({"total_amount": 10.0}, payment_details, idempotency_key="order-43"),
+                         "Order Confirmed")
+        self.assertEqual(controller.place_order({"total_amount": 10.0}, payment_details, idempotency_key="order-43"),
+                         "Order Confirmed")
+        self.assertEqual(gateway.calls, 2)
+
+    def test_declined_payment_can_be_retried(self):
+        gateway = CountingGateway()
+        controller = OrderController(PaymentService(gateway), NotificationService())
+        with mock.patch.object(gateway, "process_payment", return_value={"status": "failure"}):
+            self.assertEqual(controller.place_order({"total_amount": 10.0}, self.payment_details,
+                                                    idempotency_key="order-44"), "Order Failed")
+        self.assertEqual(controller.place_order({"total_amount": 10.0}, self.payment_details,
+                                                idempotency_key="order-44"), "Order Confirmed")
+
+    def test_keys_are_scoped_per_user_and_bound_to_the_request(self):
+        gateway = CountingGateway()
+        controller = OrderController(PaymentService(gateway), NotificationService())
+        for email in ("a@example.com", "b@example.com", "a@example.com"):
+            controller.place_order({"total_amount": 10.0, "email": email}, self.payment_details,
+                                   idempotency_key="order-45")
+        self.assertEqual(gateway.calls, 2)
+        with self.assertRaises(ValueError):
+            controller.place_order({"total_amount": 99.0, "email": "a@example.com"}, self.payment_details,
+                                   idempotency_key="order-45")
+        self.assertEqual(gateway.calls, 2)
+
+if __name__ == '__main__':
+    unittest.main()
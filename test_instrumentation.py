@@ -0,0 +1,74 @@
+# python -m unittest test_instrumentation.py
+import os
+import tempfile
+import time
+import unittest
+from instrumentation import Histogram, Metrics, metrics, start_file_export
+from Order_Placement import Cart, OrderPlacement, PaymentMethod, RestaurantMenu, UserProfile
+from Payment_Processing import PaymentProcessing
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+from User_Registration import UserRegistration
+
+class TestHistogram(unittest.TestCase):
+    def test_buckets_and_percentiles(self):
+        histogram = Histogram()
+        for nanoseconds in (500, 1024, 1025, 3000, 1_000_000):
+            histogram.record(nanoseconds)
+        self.assertEqual(histogram.buckets[:4], [2, 1, 1, 0])  # <=1024ns, <=2048ns, <=4096ns, <=8192ns
+        self.assertEqual((histogram.count, histogram.min, histogram.max), (5, 500, 1_000_000))
+        self.assertEqual(histogram.percentile(0.5), 2048)
+        self.assertEqual(histogram.percentile(1.0), 1_000_000)
+
+class TestMetrics(unittest.TestCase):
+    def setUp(self):
+        metrics.reset()
+        metrics.enabled = True
+
+    def tearDown(self):
+        metrics.enabled = False
+        metrics.reset()
+
+    def test_hot_paths_are_instrumented(self):
+        cart = Cart()
+        cart.add_item("Pizza", 12.99, 1)
+        order = OrderPlacement(cart, UserProfile("123 Main St"), RestaurantMenu(["Pizza"]))
+        order.confirm_order(PaymentMethod())
+        PaymentProcessing().process_payment({"total_amount": 10.0}, "paypal", {})
+        RestaurantBrowsing(RestaurantDatabase()).search_by_filters(cuisine_type="Italian")
+        UserRegistration().register("user@example.com", "Password123", "Password123")
+
+        snapshot = metrics.snapshot()
+        self.assertEqual({name: timer["count"] for name, timer in snapshot["timers"].items()},
+                         {"checkout.validate_order": 1, "checkout.confirm_order": 1, "payment.process_payment": 1,
+                          "browsing.search_by_filters": 1, "registration.register": 1})
+        self.assertEqual(snapshot["counters"], {"checkout.confirmed": 1})
+
+    def test_disabled_metrics_record_nothing(self):
+        metrics.enabled = False
+        UserRegistration().register("user@example.com", "Password123", "Password123")
+        self.assertEqual(metrics.snapshot(), {"counters": {}, "timers": {}})
+
+    def test_text_export(self):
+        registry = Metrics(enabled=True)
+        registry.increment("payment.failed", 2)
+        registry.observe("checkout.confirm_order", 1500)
+        with registry.timer("checkout.block"):
+            pass
+        text = registry.export_text()
+        self.assertIn("payment_failed_total 2\n", text)
+        self.assertIn('checkout_confirm_order_seconds_bucket{le="1.024e-06"} 0\n', text)
+        self.assertIn('checkout_confirm_order_seconds_bucket{le="2.048e-06"} 1\n', text)
+        self.assertIn("checkout_confirm_order_seconds_count 1\n", text)
+        self.assertIn("checkout_block_seconds_count 1\n", text)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "metrics.prom")
+            stop = start_file_export(path, interval=0.01, registry=registry)
+            time.sleep(0.05)
+            stop.set()
+            time.sleep(0.05)
+            with open(path) as f:
+                self.assertEqual(f.read(), text)
+
+if __name__ == '__main__':
+    unittest.main()
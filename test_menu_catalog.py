@@ -0,0 +1,40 @@
+# python -m unittest test_menu_catalog.py
+import unittest
+from Order_Placement import Cart, OrderPlacement, RestaurantMenu, UserProfile
+
+class TestRestaurantMenuCatalog(unittest.TestCase):
+    def setUp(self):
+        self.menu = RestaurantMenu({"Burger": 8.99, "Pizza": 12.99, "Salad": 7.49})
+
+    def test_prices(self):
+        self.assertEqual(self.menu.get_price("Pizza"), 12.99)
+        self.assertIsNone(self.menu.get_price("Pasta"))
+        self.assertIsNone(RestaurantMenu(["Pizza"]).get_price("Pizza"))
+
+    def test_check_items(self):
+        self.menu.set_availability("Salad", False)
+        self.assertEqual(self.menu.check_items(["Pasta", "Burger", "Salad", "Sushi"]), ["Pasta", "Salad", "Sushi"])
+        self.assertEqual(self.menu.available_items, ["Burger", "Pizza"])
+        self.menu.set_availability("Salad", True)
+        self.assertEqual(self.menu.check_items(["Salad"]), [])
+
+    def test_mutations_bump_version(self):
+        version = self.menu.version
+        self.menu.add_item("Pasta", 11.5)
+        self.menu.set_availability("Pasta", False)
+        self.menu.remove_item("Pasta")
+        self.menu.remove_item("Pasta")  # Already gone, no change
+        self.assertEqual(self.menu.version, version + 3)
+
+    def test_validate_order_lists_all_unavailable_items(self):
+        cart = Cart()
+        cart.add_item("Pasta", 11.5, 1)
+        cart.add_item("Burger", 8.99, 1)
+        cart.add_item("Sushi", 15.0, 1)
+        result = OrderPlacement(cart, UserProfile("123 Main St"), self.menu).validate_order()
+        self.assertFalse(result["success"])
+        self.assertEqual(result["message"], "Pasta, Sushi are not available")
+        self.assertEqual(result["unavailable_items"], ["Pasta", "Sushi"])
+
+if __name__ == '__main__':
+    unittest.main()
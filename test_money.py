@@ -0,0 +1,41 @@
+# python -m unittest test_money.py
+import unittest
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_EVEN, ROUND_HALF_UP
+from money import PricingRules, divide_rounded, from_minor, to_minor
+
+class TestMoney(unittest.TestCase):
+    def test_to_minor(self):
+        self.assertEqual(to_minor(8.99), 899)
+        self.assertEqual(to_minor(5), 500)
+        self.assertEqual(to_minor("12.34"), 1234)
+        self.assertEqual(to_minor(Decimal("0.1")), 10)
+        self.assertEqual(to_minor(0.005), 1)  # Sub-cent amounts use the rounding mode
+        self.assertEqual(to_minor(0.005, rounding=ROUND_DOWN), 0)
+        self.assertEqual(to_minor(-1.25), -125)
+
+    def test_from_minor(self):
+        self.assertEqual(from_minor(2478), 24.78)
+
+    def test_divide_rounded_matches_decimal(self):
+        for rounding in (ROUND_HALF_UP, ROUND_HALF_EVEN, ROUND_DOWN):
+            for numerator in range(-30, 31):
+                expected = (Decimal(numerator) / 4).quantize(Decimal(1), rounding=rounding)
+                self.assertEqual(divide_rounded(numerator, 4, rounding), int(expected), (numerator, rounding))
+
+    def test_pricing_rules(self):
+        pricing = PricingRules()
+        self.assertEqual(pricing.breakdown_minor(999), {"subtotal": 999, "tax": 100, "delivery_fee": 500, "total": 1599})
+        self.assertEqual(pricing.breakdown(999)["total"], 15.99)
+
+    def test_configurable_rounding(self):
+        half_even = PricingRules(tax_rate="0.10", rounding=ROUND_HALF_EVEN)
+        half_up = PricingRules(tax_rate="0.10", rounding=ROUND_HALF_UP)
+        self.assertEqual(half_even.calculate_tax(125), 12)  # 12.5 cents rounds to even
+        self.assertEqual(half_up.calculate_tax(125), 13)
+
+    def test_invalid_rounding_mode(self):
+        with self.assertRaises(ValueError):
+            PricingRules(rounding="ROUND_SIDEWAYS")
+
+if __name__ == '__main__':
+    unittest.main()
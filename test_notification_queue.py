@@ -0,0 +1,147 @@
+# python -m unittest test_notification_queue.py
+import threading
+import time
+import unittest
+from Payment_Processing import (InProcessTransport, OrderController, PaymentGateway, PaymentService,
+                                QueuedNotificationService)
+
+class SlowTransport(InProcessTransport):
+    def __init__(self, delay):
+        super().__init__()
+        self.delay = delay
+
+    def deliver(self, recipient, messages):
+        time.sleep(self.delay)
+        super().deliver(recipient, messages)
+
+class FailingTransport(InProcessTransport):
+    def __init__(self, failures=float("inf")):
+        super().__init__()
+        self.failures = failures
+
+    def deliver(self, recipient, messages):
+        if recipient == "broken@example.com" and self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("Transport unavailable")
+        super().deliver(recipient, messages)
+
+class TestQueuedNotificationService(unittest.TestCase):
+    def setUp(self):
+        self.transport = InProcessTransport()
+        self.service = QueuedNotificationService(self.transport, flush_interval=60)
+
+    def tearDown(self):
+        self.service.close()
+
+    def test_batches_per_recipient_and_deduplicates(self):
+        for message in ("Order placed", "Order placed", "Out for delivery"):
+            self.service.send_notification(message, recipient="a@example.com")
+        self.service.send_notification("Order placed", recipient="b@example.com")
+        self.assertEqual(self.transport.batches, [])  # Nothing is sent until the window closes
+
+        self.assertEqual(self.service.flush(), 2)
+        self.assertEqual(self.transport.batches, [("a@example.com", ["Order placed", "Out for delivery"]),
+                                                  ("b@example.com", ["Order placed"])])
+        self.assertEqual((self.service.sent, self.service.deduplicated, self.service.batches), (3, 1, 2))
+
+        # Duplicates are only dropped within a window
+        self.service.send_notification("Order placed", recipient="a@example.com")
+        self.service.flush()
+        self.assertEqual(self.transport.batches[-1], ("a@example.com", ["Order placed"]))
+
+    def test_flush_window_and_batch_size(self):
+        service = QueuedNotificationService(self.transport, flush_interval=0.02, max_batch_size=3)
+        try:
+            service.send_notification("Hello", recipient="a@example.com")
+            deadline = time.monotonic() + 5
+            while not self.transport.batches and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.transport.batches, [("a@example.com", ["Hello"])])
+        finally:
+            service.close()
+
+        service = QueuedNotificationService(self.transport, flush_interval=60, max_batch_size=3)
+        try:
+            for i in range(3):
+                service.send_notification(f"Message {i}", recipient="c@example.com")
+            deadline = time.monotonic() + 5
+            while len(self.transport.batches) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            self.assertEqual(self.transport.batches[-1], ("c@example.com", ["Message 0", "Message 1", "Message 2"]))
+        finally:
+            service.close()
+
+    def test_close_delivers_remaining_messages(self):
+        self.service.send_notification("Bye")
+        self.service.close()
+        self.assertEqual(self.transport.batches, [(None, ["Bye"])])
+        with self.assertRaises(RuntimeError):
+            self.service.send_notification("Too late")
+
+    def test_transport_failure_is_isolated(self):
+        service = QueuedNotificationService(FailingTransport(), flush_interval=60)
+        service.send_notification("Hi", recipient="broken@example.com")
+        service.send_notification("Hi", recipient="ok@example.com")
+        with self.assertLogs("Payment_Processing", level="ERROR"):
+            service.flush()
+        self.assertEqual((service.failed, service.sent), (1, 1))
+        with self.assertLogs("Payment_Processing", level="ERROR"):
+            service.close()
+        self.assertEqual((service.failed, service.dropped), (3, 1))
+
+    def test_failed_batches_are_requeued(self):
+        transport = FailingTransport(failures=1)
+        service = QueuedNotificationService(transport, flush_interval=60)
+        service.send_notification("Order placed", recipient="broken@example.com")
+        with self.assertLogs("Payment_Processing", level="ERROR"):
+            self.assertEqual(service.flush(), 0)
+        service.send_notification("Out for delivery", recipient="broken@example.com")
+        self.assertEqual(service.flush(), 1)
+        self.assertEqual(transport.batches, [("broken@example.com", ["Order placed", "Out for delivery"])])
+        self.assertEqual((service.failed, service.sent, service.dropped), (1, 2, 0))
+        service.close()
+
+    def test_identical_messages_for_different_orders_are_all_sent(self):
+        for order_id in ("A1", "A2", "A1"):
+            self.service.send_notification("Order placed", order_id=order_id)
+        self.service.send_notification("Order placed", recipient="a@example.com", order_id="A1")
+        self.service.send_notification("Order placed", recipient="a@example.com", order_id="A2")
+        self.service.send_notification("Anonymous")
+        self.service.send_notification("Anonymous")
+        self.service.flush()
+        self.assertEqual(self.transport.batches,
+                         [(None, ["Order placed", "Order placed", "Anonymous", "Anonymous"]),
+                          ("a@example.com", ["Order placed", "Order placed"])])
+        self.assertEqual(self.service.deduplicated, 1)
+
+    def test_concurrent_senders(self):
+        def send(worker):
+            for i in range(500):
+                self.service.send_notification(f"Update {i % 50}", recipient=f"user{worker}@example.com")
+
+        threads = [threading.Thread(target=send, args=(worker,)) for worker in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.service.flush()
+        self.assertEqual(self.service.sent, 400)
+        self.assertEqual(self.service.deduplicated, 3600)
+
+class TestPlaceOrderNotifications(unittest.TestCase):
+    def test_place_order_does_not_wait_for_delivery(self):
+        transport = SlowTransport(delay=0.5)
+        service = QueuedNotificationService(transport, flush_interval=0.01)
+        controller = OrderController(PaymentService(PaymentGateway()), service)
+        order = {"total_amount": 100.00, "email": "user@example.com"}
+        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+
+        start_time = time.perf_counter()
+        self.assertEqual(controller.place_order(order, payment_details), "Order Confirmed")
+        self.assertLess(time.perf_counter() - start_time, 0.25)
+
+        service.close()
+        self.assertEqual(transport.batches, [("user@example.com", ["Order placed successfully!"])])
+
+if __name__ == '__main__':
+    unittest.main()
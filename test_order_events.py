@@ -0,0 +1,102 @@
+# python -m unittest test_order_events.py
+import threading
+import unittest
+from order_events import OrderStatusBus, validate_status_transition
+from Order_Placement import Cart, OrderPlacement, RestaurantMenu, UserProfile
+
+class TestStatusTransitions(unittest.TestCase):
+    def test_forward_transitions_and_cancellation(self):
+        validate_status_transition("Pending", "Confirmed")
+        validate_status_transition("Pending", "Out for Delivery")
+        validate_status_transition("Preparing", "Cancelled")
+
+    def test_invalid_transitions(self):
+        for current, new_status in (("Preparing", "Pending"), ("Delivered", "Cancelled"),
+                                    ("Cancelled", "Preparing"), ("Pending", "Pending"), ("Pending", "Lost")):
+            with self.assertRaises(ValueError):
+                validate_status_transition(current, new_status)
+
+class TestOrderStatusBus(unittest.TestCase):
+    def setUp(self):
+        self.bus = OrderStatusBus(max_workers=4)
+        self.order = OrderPlacement(Cart(), UserProfile("123 Main St"), RestaurantMenu(["Pizza"]),
+                                    status_bus=self.bus)
+
+    def tearDown(self):
+        self.bus.close()
+
+    def test_every_subscriber_receives_events(self):
+        first, second = [], []
+        self.bus.subscribe(lambda event: first.append(event.status))
+        callback = self.bus.subscribe(lambda event: second.append(event.status))
+        self.order.update_status("Confirmed")
+        self.assertTrue(self.bus.flush(timeout=5))
+        self.bus.unsubscribe(callback)
+        self.order.update_status("Delivered")
+        self.assertTrue(self.bus.flush(timeout=5))
+        self.assertEqual(first, ["Confirmed", "Delivered"])
+        self.assertEqual(second, ["Confirmed"])
+
+    def test_slow_subscriber_does_not_block_status_changes(self):
+        started, release = threading.Event(), threading.Event()
+        received = []
+
+        def slow_subscriber(event):
+            started.set()
+            release.wait(5)
+            received.append(event)
+
+        self.bus.subscribe(slow_subscriber)
+        self.order.update_status("Confirmed")
+        self.assertTrue(started.wait(5))
+        for status in ("Preparing", "Out for Delivery", "Delivered"):
+            self.order.update_status(status)
+        self.assertEqual(self.order.status, "Delivered")
+
+        release.set()
+        self.assertTrue(self.bus.flush(timeout=5))
+        # The first event was in delivery; the rest were coalesced into the latest status.
+        self.assertEqual([event.status for event in received], ["Confirmed", "Delivered"])
+        self.assertEqual(received[-1].previous, "Out for Delivery")
+        self.assertEqual(self.bus.coalesced, 2)
+
+    def test_failing_subscriber_does_not_affect_others(self):
+        received = []
+        self.bus.subscribe(lambda event: 1 / 0)
+        self.bus.subscribe(lambda event: received.append(event.status))
+        with self.assertLogs("order_events", level="ERROR"):
+            self.order.update_status("Cancelled")
+            self.assertTrue(self.bus.flush(timeout=5))
+        self.assertEqual(received, ["Cancelled"])
+
+    def test_concurrent_updates_deliver_the_final_status(self):
+        received = []
+        self.bus.subscribe(received.append)
+        for _ in range(50):
+            order = OrderPlacement(Cart(), UserProfile("123 Main St"), RestaurantMenu(["Pizza"]),
+                                   concurrent=True, status_bus=self.bus)
+
+            def update(status):
+                try:
+                    order.update_status(status)
+                except ValueError:
+                    pass  # Another thread already moved the order past this status.
+
+            threads = [threading.Thread(target=update, args=(status,))
+                       for status in ("Confirmed", "Preparing", "Out for Delivery", "Delivered")]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertTrue(self.bus.flush(timeout=5))
+            self.assertEqual(received[-1].status, order.status)
+
+    def test_invalid_transition_is_not_published(self):
+        self.order.update_status("Delivered")
+        with self.assertRaises(ValueError):
+            self.order.update_status("Preparing")
+        self.assertEqual(self.order.status, "Delivered")
+        self.assertEqual(self.bus.published, 1)
+
+if __name__ == '__main__':
+    unittest.main()
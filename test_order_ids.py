@@ -0,0 +1,134 @@
+# python -m unittest test_order_ids.py
+import multiprocessing
+import os
+import threading
+import unittest
+from unittest import mock
+from order_ids import (MAX_SEQUENCE, OrderIdGenerator, default_generator, default_worker_id, format_order_id,
+                       order_id_for_time, parse_order_id, timestamp_of)
+from order_history import OrderHistory
+from Order_Placement import Cart, OrderPlacement, PaymentMethod, RestaurantMenu, UserProfile
+
+def issue_ids(queue, worker_id):
+    default_generator.set_worker_id(worker_id)
+    queue.put(default_generator.next_ids(1000))
+
+def issue_without_worker_id(queue):
+    try:
+        default_generator.next_id()
+    except RuntimeError as e:
+        queue.put(str(e))
+
+def confirm_without_worker_id(queue):
+    class ChargingPaymentMethod(PaymentMethod):
+        charged = False
+
+        def process_payment(self, amount):
+            self.charged = True
+            return True
+
+    cart = Cart()
+    cart.add_item("Burger", 8.99, 1)
+    payment_method = ChargingPaymentMethod()
+    try:
+        OrderPlacement(cart, UserProfile("123 Main St"), RestaurantMenu(["Burger"])).confirm_order(payment_method)
+    except RuntimeError:
+        pass
+    queue.put(payment_method.charged)
+
+class FakeClock:
+    def __init__(self, ms):
+        self.ms = ms
+
+    def __call__(self):
+        return self.ms * 1_000_000
+
+class TestOrderIdGenerator(unittest.TestCase):
+    def test_ids_are_increasing_and_formatted(self):
+        generator = OrderIdGenerator(worker_id=5)
+        ids = [generator.next_order_id() for _ in range(10_000)]
+        self.assertEqual(ids, sorted(set(ids)))
+        self.assertRegex(ids[0], r"^ORD\d{19}$")
+        self.assertEqual(format_order_id(parse_order_id(ids[0])), ids[0])
+
+    def test_sequence_overflow_and_clock_rollback(self):
+        clock = FakeClock(1_800_000_000_000)
+        generator = OrderIdGenerator(worker_id=1, clock=clock)
+        ids = [generator.next_id() for _ in range(MAX_SEQUENCE + 10)]
+        clock.ms -= 5_000  # The system clock steps backwards
+        ids += generator.next_ids(10) + [generator.next_id()]
+        self.assertEqual(ids, sorted(set(ids)))
+
+    def test_thread_safety(self):
+        generator = OrderIdGenerator(worker_id=2)
+        results = []
+        threads = [threading.Thread(target=lambda: results.extend(generator.next_id() for _ in range(5000)))
+                   for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(set(results)), 40_000)
+
+    def test_worker_processes_do_not_collide(self):
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        processes = [context.Process(target=issue_ids, args=(queue, worker_id)) for worker_id in range(1, 5)]
+        for process in processes:
+            process.start()
+        ids = [order_id for _ in processes for order_id in queue.get(timeout=10)]
+        for process in processes:
+            process.join()
+        self.assertEqual(len(set(ids)), 4000)
+
+    def test_forked_child_needs_its_own_worker_id(self):
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        process = context.Process(target=issue_without_worker_id, args=(queue,))
+        process.start()
+        self.assertIn("set_worker_id", queue.get(timeout=10))
+        process.join()
+        default_generator.next_id()  # The parent is unaffected.
+
+    def test_forked_child_is_not_charged_without_an_order_id(self):
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        process = context.Process(target=confirm_without_worker_id, args=(queue,))
+        process.start()
+        self.assertFalse(queue.get(timeout=10))
+        process.join()
+
+    def test_invalid_worker_id(self):
+        for worker_id in (1024, -1, None, "5", 1.0):
+            with self.assertRaises(ValueError):
+                OrderIdGenerator(worker_id)
+        with self.assertRaises(ValueError):
+            OrderIdGenerator(1).set_worker_id(2048)
+
+    def test_worker_id_from_environment(self):
+        with mock.patch.dict(os.environ, {"ORDER_WORKER_ID": "17"}):
+            self.assertEqual(default_worker_id(), 17)
+        for configured in ("1024", "-1", "abc"):
+            with mock.patch.dict(os.environ, {"ORDER_WORKER_ID": configured}), self.assertRaises(ValueError):
+                default_worker_id()
+        with mock.patch.dict(os.environ):
+            os.environ.pop("ORDER_WORKER_ID", None)
+            self.assertEqual(default_worker_id(), 0)
+
+    def test_order_history_range_scan(self):
+        clock = FakeClock(1_800_000_000_000)
+        generator = OrderIdGenerator(worker_id=3, clock=clock)
+        history = OrderHistory()
+        for minute in range(10):
+            clock.ms += 60_000
+            history.add_order("user@example.com", {"order_id": generator.next_order_id(), "minute": minute})
+
+        order = history.orders["user@example.com"][4]
+        self.assertEqual(timestamp_of(order["order_id"]), clock.ms / 1000 - 5 * 60)
+        start = order_id_for_time(timestamp_of(order["order_id"]))
+        end = order_id_for_time(timestamp_of(order["order_id"]) + 180)
+        orders = history.view_orders_between("user@example.com", start, end)
+        self.assertEqual([order["minute"] for order in orders], [4, 5, 6])
+
+if __name__ == '__main__':
+    unittest.main()
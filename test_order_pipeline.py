@@ -0,0 +1,92 @@
+# python -m unittest test_order_pipeline.py
+import queue
+import threading
+import unittest
+from order_history import OrderHistory
+from order_pipeline import OrderPipeline, OrderRejected, PipelineStage, build_checkout_pipeline
+from Order_Placement import Cart, RestaurantMenu
+from Payment_Processing import InProcessTransport, PaymentGateway, PaymentService, QueuedNotificationService
+
+VALID_CARD = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+
+def make_cart(*items):
+    cart = Cart()
+    for name, price, quantity in items:
+        cart.add_item(name, price, quantity)
+    return cart
+
+class TestCheckoutPipeline(unittest.TestCase):
+    def setUp(self):
+        self.history = OrderHistory()
+        self.transport = InProcessTransport()
+        self.notifications = QueuedNotificationService(self.transport, flush_interval=60)
+        self.pipeline = build_checkout_pipeline(RestaurantMenu({"Burger": 8.99, "Pizza": 12.99}),
+                                                PaymentService(PaymentGateway()), self.history, self.notifications)
+
+    def tearDown(self):
+        self.pipeline.close()
+        self.notifications.close()
+
+    def test_successful_order_passes_every_stage(self):
+        future = self.pipeline.submit({"email": "user@example.com", "cart": make_cart(("Burger", 8.99, 2)),
+                                       "payment_details": VALID_CARD})
+        result = future.result(timeout=5)
+        self.assertTrue(result["success"])
+        self.assertEqual(result["total_info"]["total"], 24.78)
+        self.assertEqual(self.history.orders["user@example.com"][0]["order_id"], result["order_id"])
+        self.notifications.flush()
+        self.assertEqual(self.transport.batches, [("user@example.com", ["Order placed successfully!"])])
+
+    def test_rejections_report_their_stage(self):
+        orders = [
+            {"email": "a@example.com", "cart": Cart(), "payment_details": VALID_CARD},
+            {"email": "b@example.com", "cart": make_cart(("Sushi", 5.0, 1)), "payment_details": VALID_CARD},
+            {"email": "c@example.com", "cart": make_cart(("Pizza", 12.99, 1)), "payment_details": {"card_number": "1"}},
+        ]
+        results = [self.pipeline.submit(order).result(timeout=5) for order in orders]
+        self.assertEqual([(result["stage"], result["message"]) for result in results],
+                         [("validate", "Cart is empty"), ("validate", "Sushi is not available"),
+                          ("authorize", "Invalid payment details")])
+        self.assertEqual(self.history.orders, {})
+        stats = self.pipeline.stats()
+        self.assertEqual((stats["validate"]["rejected"], stats["authorize"]["rejected"]), (2, 1))
+
+    def test_many_orders_are_all_persisted_in_id_order(self):
+        cart = make_cart(("Pizza", 12.99, 1))
+        futures = [self.pipeline.submit({"email": f"user{i % 5}@example.com", "cart": cart,
+                                         "payment_details": VALID_CARD}) for i in range(1000)]
+        self.assertTrue(all(future.result(timeout=10)["success"] for future in futures))
+        for orders in self.history.orders.values():
+            self.assertEqual(len(orders), 200)
+            ids = [order["order_id"] for order in orders]
+            self.assertEqual(ids, sorted(ids))
+        self.assertEqual(self.pipeline.stats()["notify"]["processed"], 1000)
+
+class TestPipelineBackpressure(unittest.TestCase):
+    def test_full_queue_blocks_submit(self):
+        release = threading.Event()
+        stage = PipelineStage("slow", lambda order: release.wait(5) and order, workers=1, queue_size=2)
+        with OrderPipeline([stage]) as pipeline:
+            futures = [pipeline.submit(i) for i in range(3)]  # One in progress, two queued
+            with self.assertRaises(queue.Full):
+                pipeline.submit(3, timeout=0.05)
+            release.set()
+            self.assertEqual([future.result(timeout=5) for future in futures], [0, 1, 2])
+
+    def test_stage_errors_fail_the_future(self):
+        def explode(order):
+            raise KeyError("missing")
+
+        def reject(order):
+            raise OrderRejected("no thanks")
+
+        with OrderPipeline([PipelineStage("explode", explode)]) as pipeline:
+            with self.assertRaises(KeyError):
+                pipeline.submit({}).result(timeout=5)
+            self.assertEqual(pipeline.stats()["explode"]["failed"], 1)
+        with OrderPipeline([PipelineStage("reject", reject)]) as pipeline:
+            self.assertEqual(pipeline.submit({}).result(timeout=5),
+                             {"success": False, "stage": "reject", "message": "no thanks"})
+
+if __name__ == '__main__':
+    unittest.main()
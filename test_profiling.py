@@ -0,0 +1,124 @@
+# python -m unittest test_profiling.py
+import io
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+from profiling import SamplingProfiler, default_profiler, main, sampled, summarize
+from Payment_Processing import NotificationService, OrderController, PaymentGateway, PaymentService
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+from User_Registration import UserRegistration
+
+def fibonacci(n):
+    return n if n < 2 else fibonacci(n - 1) + fibonacci(n - 2)
+
+class TestSamplingProfiler(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def files(self, suffix=".prof"):
+        return sorted(name for name in os.listdir(self.directory) if name.endswith(suffix))
+
+    def test_unsampled_calls_write_nothing(self):
+        profiler = SamplingProfiler(rate=0.0, directory=self.directory)
+        traced = sampled("fibonacci", profiler)(fibonacci)
+        self.assertEqual(traced(10), 55)
+        self.assertEqual(profiler.written, 0)
+        self.assertEqual(self.files(), [])
+
+    def test_sampled_calls_are_profiled(self):
+        profiler = SamplingProfiler(rate=1.0, directory=self.directory)
+        traced = sampled("fibonacci", profiler)(fibonacci)
+        self.assertEqual(traced(10), 55)
+        self.assertEqual(profiler.written, 1)
+        self.assertTrue(self.files()[0].startswith("fibonacci-"))
+
+    def test_rate_controls_the_sampled_fraction(self):
+        profiler = SamplingProfiler(rate=0.25, directory=self.directory)
+        samples = sum(profiler.should_sample() for _ in range(10_000))
+        self.assertTrue(2000 < samples < 3000, samples)
+
+    def test_nested_calls_are_profiled_once(self):
+        profiler = SamplingProfiler(rate=1.0, directory=self.directory)
+        inner = sampled("inner", profiler)(fibonacci)
+        outer = sampled("outer", profiler)(lambda: inner(5))
+        self.assertEqual(outer(), 5)
+        self.assertEqual([name.split("-")[0] for name in self.files()], ["outer"])
+
+    def test_exceptions_are_profiled_and_reraised(self):
+        profiler = SamplingProfiler(rate=1.0, directory=self.directory)
+        traced = sampled("fails", profiler)(lambda: 1 / 0)
+        with self.assertRaises(ZeroDivisionError):
+            traced()
+        self.assertEqual(len(self.files()), 1)
+
+    def test_unwritable_directory_does_not_fail_the_call(self):
+        blocker = os.path.join(self.directory, "not-a-directory")
+        open(blocker, "w").close()
+        profiler = SamplingProfiler(rate=1.0, directory=os.path.join(blocker, "profiles"))
+        traced = sampled("answer", profiler)(lambda: 42)
+        with self.assertLogs("profiling", level="ERROR"):
+            self.assertEqual(traced(), 42)
+        self.assertEqual(profiler.written, 0)
+
+    def test_directory_is_rotated(self):
+        profiler = SamplingProfiler(rate=1.0, directory=self.directory, max_files=3)
+        traced = sampled("fibonacci", profiler)(fibonacci)
+        for _ in range(6):
+            traced(5)
+        self.assertEqual(profiler.written, 6)
+        self.assertEqual(len(self.files()), 3)
+
+    def test_memory_snapshots(self):
+        profiler = SamplingProfiler(rate=1.0, directory=self.directory, trace_memory=True)
+        sampled("allocate", profiler)(lambda: [str(i) for i in range(1000)])()
+        self.assertEqual(len(self.files(".tracemalloc")), 1)
+        output = io.StringIO()
+        summarize(self.directory, memory=True, stream=output)
+        self.assertIn("allocation sites", output.getvalue())
+
+    def test_summary_merges_profiles(self):
+        profiler = SamplingProfiler(rate=1.0, directory=self.directory)
+        sampled("fibonacci", profiler)(fibonacci)(8)
+        sampled("other", profiler)(fibonacci)(8)
+        output = io.StringIO()
+        self.assertEqual(summarize(self.directory, stream=output), 2)
+        self.assertIn("fibonacci", output.getvalue())
+        self.assertEqual(summarize(self.directory, name="other", stream=io.StringIO()), 1)
+        self.assertEqual(summarize(os.path.join(self.directory, "missing"), stream=io.StringIO()), 0)
+
+    def test_command_line(self):
+        sampled("fibonacci", SamplingProfiler(rate=1.0, directory=self.directory))(fibonacci)(5)
+        with mock.patch("sys.stdout", new_callable=io.StringIO) as stdout:
+            self.assertEqual(main([self.directory, "--top", "5", "--sort", "tottime"]), 0)
+        self.assertIn("Merged 1 profiles", stdout.getvalue())
+
+class TestProfiledEndpoints(unittest.TestCase):
+    """
+    place_order, search_by_filters and register are sampled by the default profiler.
+    """
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        default_profiler.directory = self.directory
+        default_profiler.rate = 1.0
+
+    def tearDown(self):
+        default_profiler.rate = 0.0
+        default_profiler.directory = "profiles"
+        shutil.rmtree(self.directory)
+
+    def test_endpoints_are_sampled(self):
+        UserRegistration().register("user@example.com", "Password123", "Password123")
+        RestaurantBrowsing(RestaurantDatabase()).search_by_filters(cuisine_type="Italian")
+        controller = OrderController(PaymentService(PaymentGateway()), NotificationService())
+        self.assertEqual(controller.place_order({"total_amount": 20.0}, {"card_number": "1234567812345678"}),
+                         "Order Confirmed")
+        names = sorted(name.split("-")[0] for name in os.listdir(self.directory))
+        self.assertEqual(names, ["place_order", "register", "search_by_filters"])
+
+if __name__ == '__main__':
+    unittest.main()
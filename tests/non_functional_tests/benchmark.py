@@ -0,0 +1,191 @@
+"""
+Helpers for statistical micro-benchmarks.
+
+Each benchmark runs a function repeatedly after a warmup, timing every run with
+time.perf_counter_ns, and reports percentiles rather than a single wall-clock reading.
+Results can be compared against a JSON baseline to flag regressions.
+
+Environment variables:
+    BENCHMARK_UPDATE_BASELINE=1  Write the current results to the baseline file.
+    BENCHMARK_ENFORCE=1          Fail when a benchmark regresses beyond the threshold
+                                 (by default regressions are only reported, since the
+                                 baseline may come from a different machine).
+    BENCHMARK_THRESHOLD=0.25     Allowed slowdown of p50 against the baseline, as a fraction.
+"""
+import gc
+import json
+import math
+import os
+import time
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+DEFAULT_THRESHOLD = 0.25
+
+
+def percentile(sorted_samples, fraction):
+    """
+    Returns a percentile of pre-sorted samples using linear interpolation between ranks.
+
+    Args:
+        sorted_samples (list): The samples, in ascending order.
+        fraction (float): The percentile as a fraction, e.g. 0.95.
+
+    Returns:
+        float: The interpolated percentile.
+    """
+    position = (len(sorted_samples) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_samples) - 1)
+    return sorted_samples[lower] + (sorted_samples[upper] - sorted_samples[lower]) * (position - lower)
+
+
+class BenchmarkResult:
+    """
+    Timing statistics for one benchmark.
+
+    Attributes:
+        name (str): The benchmark name, e.g. "cart.add_item[n=1000]".
+        samples (list): Nanoseconds per call for each timed run, sorted.
+        p50, p95, p99 (float): Percentiles of the samples, in nanoseconds.
+        mean (float): The mean of the samples, in nanoseconds.
+    """
+    def __init__(self, name, samples):
+        self.name = name
+        self.samples = sorted(samples)
+        self.p50 = percentile(self.samples, 0.50)
+        self.p95 = percentile(self.samples, 0.95)
+        self.p99 = percentile(self.samples, 0.99)
+        self.mean = sum(self.samples) / len(self.samples)
+
+    def to_dict(self):
+        return {"p50": round(self.p50, 1), "p95": round(self.p95, 1), "p99": round(self.p99, 1),
+                "mean": round(self.mean, 1), "runs": len(self.samples)}
+
+    def __str__(self):
+        return (f"{self.name:<40} p50 {format_ns(self.p50):>10}  p95 {format_ns(self.p95):>10}  "
+                f"p99 {format_ns(self.p99):>10}  ({len(self.samples)} runs)")
+
+
+def format_ns(nanoseconds):
+    """
+    Formats a duration in the most readable unit.
+
+    Args:
+        nanoseconds (float): The duration.
+
+    Returns:
+        str: e.g. "850ns", "12.3us" or "4.56ms".
+    """
+    if nanoseconds < 1_000:
+        return f"{nanoseconds:.0f}ns"
+    if nanoseconds < 1_000_000:
+        return f"{nanoseconds / 1_000:.1f}us"
+    return f"{nanoseconds / 1_000_000:.2f}ms"
+
+
+def measure(name, func, setup=None, warmup=3, repeats=50, number=1):
+    """
+    Times a function over repeated runs.
+
+    Args:
+        name (str): The benchmark name.
+        func (callable): The code under test. Called with setup()'s return value if setup is given.
+        setup (callable, optional): Builds fresh input before every run; not timed.
+        warmup (int, optional): Untimed runs before measuring, to warm caches.
+        repeats (int, optional): The number of timed runs.
+        number (int, optional): Calls of func per timed run; each sample is the time per call.
+
+    Returns:
+        BenchmarkResult: The timing statistics.
+    """
+    samples = []
+    gc_was_enabled = gc.isenabled()
+    gc.disable()  # Keep collector pauses out of individual samples.
+    try:
+        for run in range(warmup + repeats):
+            args = (setup(),) if setup else ()
+            start = time.perf_counter_ns()
+            for _ in range(number):
+                func(*args)
+            elapsed = time.perf_counter_ns() - start
+            if run >= warmup:
+                samples.append(elapsed / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return BenchmarkResult(name, samples)
+
+
+def load_baseline(path=BASELINE_PATH):
+    """
+    Reads stored benchmark results.
+
+    Args:
+        path (str, optional): The baseline JSON file.
+
+    Returns:
+        dict: Maps benchmark name -> statistics dictionary; empty if there is no baseline.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    """
+    Merges results into the stored baseline.
+
+    Args:
+        results (list): BenchmarkResult objects.
+        path (str, optional): The baseline JSON file.
+    """
+    baseline = load_baseline(path)
+    baseline.update({result.name: result.to_dict() for result in results})
+    with open(path, "w") as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def find_regressions(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compares results with a baseline.
+
+    Args:
+        results (list): BenchmarkResult objects.
+        baseline (dict): Stored statistics, as returned by load_baseline.
+        threshold (float, optional): Allowed slowdown of p50, as a fraction.
+
+    Returns:
+        list: A message for each benchmark whose p50 is more than threshold slower than its baseline.
+    """
+    regressions = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if expected and result.p50 > expected["p50"] * (1 + threshold):
+            regressions.append(f"{result.name}: p50 {format_ns(result.p50)} vs baseline "
+                               f"{format_ns(expected['p50'])} (+{result.p50 / expected['p50'] - 1:.0%})")
+    return regressions
+
+
+def report(results):
+    """
+    Prints results, compares them with the baseline and, if requested, updates it.
+
+    Args:
+        results (list): BenchmarkResult objects.
+
+    Returns:
+        list: Regression messages that should fail the run; empty unless BENCHMARK_ENFORCE is set.
+    """
+    print()
+    for result in results:
+        print(result)
+    if os.environ.get("BENCHMARK_UPDATE_BASELINE") == "1":
+        save_baseline(results)
+        return []
+    threshold = float(os.environ.get("BENCHMARK_THRESHOLD", DEFAULT_THRESHOLD))
+    regressions = find_regressions(results, load_baseline(), threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return regressions if os.environ.get("BENCHMARK_ENFORCE") == "1" else []
@@ -0,0 +1,63 @@
+# python -m unittest tests/non_functional_tests/test_performance_async_checkout.py
+import asyncio
+import random
+import time
+import unittest
+from Order_Placement import Cart, OrderPlacement, PaymentMethod, RestaurantMenu, UserProfile
+
+class FakeGatewayPaymentMethod(PaymentMethod):
+    """
+    A payment method backed by a local fake gateway that takes 100-500 ms to respond.
+    """
+    def __init__(self, seed=0):
+        self.random = random.Random(seed)
+
+    def latency(self):
+        return self.random.uniform(0.1, 0.5)
+
+    def process_payment(self, amount):
+        time.sleep(self.latency())
+        return True
+
+    async def process_payment_async(self, amount):
+        await asyncio.sleep(self.latency())
+        return True
+
+class TestAsyncCheckoutPerformance(unittest.TestCase):
+    """
+    Compares checkout throughput of the blocking confirm_order path with confirm_order_async
+    running many checkouts concurrently on one event loop.
+    """
+    SYNC_CHECKOUTS = 5
+    ASYNC_CHECKOUTS = 2000
+
+    def make_orders(self, count):
+        cart = Cart()
+        cart.add_item("Burger", 8.99, 2)
+        menu = RestaurantMenu(available_items=["Burger"])
+        return [OrderPlacement(cart, UserProfile("123 Main St"), menu) for _ in range(count)]
+
+    def test_async_checkout_throughput(self):
+        payment_method = FakeGatewayPaymentMethod()
+
+        orders = self.make_orders(self.SYNC_CHECKOUTS)
+        start_time = time.perf_counter()
+        for order in orders:
+            self.assertTrue(order.confirm_order(payment_method)["success"])
+        sync_rate = self.SYNC_CHECKOUTS / (time.perf_counter() - start_time)
+
+        async def run_checkouts(orders):
+            return await asyncio.gather(*(order.confirm_order_async(payment_method, timeout=5) for order in orders))
+
+        orders = self.make_orders(self.ASYNC_CHECKOUTS)
+        start_time = time.perf_counter()
+        results = asyncio.run(run_checkouts(orders))
+        async_rate = self.ASYNC_CHECKOUTS / (time.perf_counter() - start_time)
+
+        self.assertTrue(all(result["success"] for result in results))
+        print(f"\nSync checkout: {sync_rate:.1f} orders/s; async checkout ({self.ASYNC_CHECKOUTS} in flight): "
+              f"{async_rate:.1f} orders/s")
+        self.assertGreater(async_rate, sync_rate * 100)
+
+if __name__ == '__main__':
+    unittest.main()
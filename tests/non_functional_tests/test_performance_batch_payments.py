@@ -0,0 +1,52 @@
+# python -m unittest tests/non_functional_tests/test_performance_batch_payments.py
+import time
+import unittest
+from Payment_Processing import FakePaymentGateway, PaymentProcessing
+from tests.non_functional_tests.benchmark import format_ns, measure
+
+CARD = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
+
+class RoundTripGateway(FakePaymentGateway):
+    """
+    A fake gateway where every call, single or batch, costs one simulated network round trip.
+    """
+    round_trip = 0.0005
+
+    def process_payment(self, method, details, amount):
+        time.sleep(self.round_trip)
+        return super().process_payment(method, details, amount)
+
+    def process_payments_batch(self, requests):
+        time.sleep(self.round_trip)
+        return [FakePaymentGateway.process_payment(self, *request) for request in requests]
+
+class TestBatchPaymentPerformance(unittest.TestCase):
+    """
+    Compares process_payments_batch with a loop over process_payment.
+    """
+    orders = [({"total_amount": 10.0 + i}, "credit_card", CARD) for i in range(500)]
+
+    def test_in_process_gateway(self):
+        payment_processing = PaymentProcessing()
+        loop = measure("payment.process_payment[loop x500]",
+                       lambda: [payment_processing.process_payment(*order) for order in self.orders], repeats=20)
+        batch = measure("payment.process_payments_batch[500]",
+                        lambda: payment_processing.process_payments_batch(self.orders), repeats=20)
+        print(f"\n500 payments: loop {format_ns(loop.p50)}, batch {format_ns(batch.p50)} "
+              f"({len(self.orders) / (batch.p50 / 1e9):,.0f} payments/s)")
+
+    def test_gateway_round_trips(self):
+        payment_processing = PaymentProcessing(RoundTripGateway())
+        orders = self.orders[:100]
+        gateway = payment_processing.payment_gateway
+        loop = measure("gateway round trips[loop x100]",
+                       lambda: [gateway.process_payment(method, details, order["total_amount"])
+                                for order, method, details in orders], warmup=1, repeats=5)
+        batch = measure("gateway round trips[batch 100]",
+                        lambda: payment_processing.process_payments_batch(orders), warmup=1, repeats=5)
+        print(f"\n100 payments with a {RoundTripGateway.round_trip * 1000:.1f}ms round trip: "
+              f"loop {format_ns(loop.p50)}, batch {format_ns(batch.p50)}")
+        self.assertLess(batch.p50, loop.p50)
+
+if __name__ == '__main__':
+    unittest.main()
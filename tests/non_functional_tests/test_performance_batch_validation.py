@@ -0,0 +1,43 @@
+# python -m unittest tests/non_functional_tests/test_performance_batch_validation.py
+import random
+import time
+import unittest
+from Order_Placement import BatchOrderValidator, Cart, RestaurantMenu
+
+class TestBatchValidationPerformance(unittest.TestCase):
+    """
+    Validates up to 100k pending orders spread over 200 restaurant menus.
+    """
+    SIZES = (10_000, 100_000)
+    MENUS = 200
+    SKUS_PER_MENU = 300
+
+    @classmethod
+    def setUpClass(cls):
+        rng = random.Random(7)
+        cls.menus = [RestaurantMenu({f"R{m}-SKU{i}": 9.99 for i in range(cls.SKUS_PER_MENU)}) for m in range(cls.MENUS)]
+        cls.orders = []
+        for _ in range(max(cls.SIZES)):
+            m = rng.randrange(cls.MENUS)
+            cart = Cart()
+            for _ in range(3):
+                # Roughly 1 in 20 lines refers to an item the menu does not carry.
+                cart.add_item(f"R{m}-SKU{rng.randrange(cls.SKUS_PER_MENU + 15)}", 9.99, 1)
+            cls.orders.append((cart, cls.menus[m]))
+
+    def time_batch(self, count):
+        start_time = time.perf_counter()
+        results = BatchOrderValidator().validate(self.orders[:count])
+        return results, time.perf_counter() - start_time
+
+    def test_batch_validation_scales_linearly(self):
+        (small_results, small_time), (large_results, large_time) = (self.time_batch(size) for size in self.SIZES)
+        failed = sum(1 for result in large_results if not result["success"])
+        print(f"\n{self.SIZES[0]} orders: {small_time:.3f}s; {self.SIZES[1]} orders: {large_time:.3f}s "
+              f"({self.SIZES[1] / large_time:,.0f} orders/s, {failed} failed)")
+        self.assertEqual(len(large_results), self.SIZES[1])
+        self.assertEqual(large_results[:self.SIZES[0]], small_results)
+        self.assertLess(large_time, max(small_time, 1e-3) * self.SIZES[1] / self.SIZES[0] * 3)
+
+if __name__ == '__main__':
+    unittest.main()
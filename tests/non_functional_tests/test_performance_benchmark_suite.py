@@ -0,0 +1,111 @@
+# python -m unittest tests/non_functional_tests/test_performance_benchmark_suite.py
+# BENCHMARK_UPDATE_BASELINE=1 python -m unittest tests/non_functional_tests/test_performance_benchmark_suite.py
+import unittest
+from Order_Placement import Cart, OrderPlacement, PaymentMethod, RestaurantMenu, UserProfile
+from Payment_Processing import PaymentProcessing
+from Restaurant_Browsing import RestaurantBrowsing, RestaurantDatabase
+from User_Registration import UserRegistration
+from tests.non_functional_tests.benchmark import BenchmarkResult, find_regressions, measure, percentile, report
+
+SIZES = (10, 100, 1000)
+
+
+def filled_cart(size):
+    cart = Cart()
+    for i in range(size):
+        cart.add_item(f"Item {i}", 5.0, 1)
+    return cart
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """
+    Percentile benchmarks of the main operations of each module across input sizes.
+    Results are compared with benchmark_baseline.json; see benchmark.py for the options.
+    """
+    def check(self, results):
+        regressions = report(results)
+        self.assertEqual(regressions, [], "Benchmarks regressed against the baseline")
+
+    def test_cart(self):
+        results = []
+        for size in SIZES:
+            names = [f"Item {i}" for i in range(size)]
+
+            def add_items(cart):
+                for name in names:
+                    cart.add_item(name, 5.0, 1)
+
+            results.append(measure(f"cart.add_item[n={size}]", add_items, setup=Cart))
+            cart = filled_cart(size)
+            results.append(measure(f"cart.calculate_total[n={size}]", cart.calculate_total, number=100))
+            results.append(measure(f"cart.view_cart[n={size}]", cart.view_cart, number=10))
+        self.check(results)
+
+    def test_order_placement(self):
+        results = []
+        payment_method = PaymentMethod()
+        for size in SIZES:
+            cart = filled_cart(size)
+            menu = RestaurantMenu([f"Item {i}" for i in range(size)])
+            order = OrderPlacement(cart, UserProfile("123 Main St"), menu)
+            results.append(measure(f"order.validate_order[n={size}]", order.validate_order, number=10))
+
+            def checkout():
+                order.invalidate_checkout()
+                order.proceed_to_checkout()
+                order.confirm_order(payment_method)
+
+            results.append(measure(f"order.checkout[n={size}]", checkout, number=5))
+        self.check(results)
+
+    def test_payment_processing(self):
+        processing = PaymentProcessing()
+        order = {"total_amount": 100.0}
+        details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
+        results = [
+            measure("payment.process_payment", lambda: processing.process_payment(order, "credit_card", details),
+                    number=1000),
+            measure("payment.validate_credit_card", lambda: processing.validate_credit_card(details), number=1000),
+        ]
+        self.check(results)
+
+    def test_restaurant_browsing(self):
+        results = []
+        for size in SIZES:
+            database = RestaurantDatabase()
+            template = database.restaurants
+            database.restaurants = [dict(template[i % len(template)], name=f"Restaurant {i}") for i in range(size)]
+            browsing = RestaurantBrowsing(database)
+            results.append(measure(f"browsing.search_by_filters[n={size}]",
+                                   lambda: browsing.search_by_filters("Italian", "Downtown", 4.0), number=10))
+        self.check(results)
+
+    def test_user_registration(self):
+        results = []
+        for size in SIZES:
+            emails = [f"user{i}@example.com" for i in range(size)]
+
+            def register_all(registration):
+                for email in emails:
+                    registration.register(email, "Password123", "Password123")
+
+            results.append(measure(f"registration.register[n={size}]", register_all, setup=UserRegistration))
+        self.check(results)
+
+class TestBenchmarkHelpers(unittest.TestCase):
+    def test_percentiles(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 0.5), 50.5)
+        self.assertAlmostEqual(percentile(samples, 0.99), 99.01)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_regressions_are_flagged_above_threshold(self):
+        baseline = {"fast": {"p50": 100.0}, "slow": {"p50": 100.0}}
+        results = [BenchmarkResult("fast", [110.0] * 5), BenchmarkResult("slow", [150.0] * 5),
+                   BenchmarkResult("new", [1.0])]
+        regressions = find_regressions(results, baseline, threshold=0.25)
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("slow:"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+# python -m unittest tests/non_functional_tests/test_performance_card_validation.py
+import datetime
+import random
+import unittest
+import card_validation
+from card_validation import card_error, validate_cards
+from tests.non_functional_tests.benchmark import format_ns, measure
+
+TODAY = datetime.date(2026, 10, 18)
+
+def random_cards(count, seed=7):
+    rng = random.Random(seed)
+    cards = []
+    for _ in range(count):
+        body = "4" + "".join(rng.choice("0123456789") for _ in range(14))
+        for check in "0123456789":
+            if card_validation.luhn_valid(body + check):
+                break
+        cards.append({"card_number": body + check, "expiry_date": f"{rng.randint(1, 12):02d}/{rng.randint(24, 32)}",
+                      "cvv": "123"})
+    return cards
+
+class TestCardValidationPerformance(unittest.TestCase):
+    def test_single_card(self):
+        details = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
+        result = measure("card_error", lambda: card_error(details, TODAY), number=10_000, repeats=20)
+        print(f"\ncard_error per checkout: {format_ns(result.p50)}")
+        self.assertLess(result.p50, 50_000)
+
+    def test_batch_vs_loop(self):
+        cards = random_cards(10_000)
+        loop = measure("card_error[loop x10000]", lambda: [card_error(details, TODAY) for details in cards],
+                       warmup=1, repeats=10)
+        batch = measure("validate_cards[10000]", lambda: validate_cards(cards, TODAY), warmup=1, repeats=10)
+        engine = "NumPy" if card_validation.numpy is not None else "scalar fallback"
+        print(f"\n10,000 cards: loop {format_ns(loop.p50)}, validate_cards ({engine}) {format_ns(batch.p50)} "
+              f"({len(cards) / (batch.p50 / 1e9):,.0f} cards/s)")
+        self.assertEqual(validate_cards(cards, TODAY), [card_error(details, TODAY) for details in cards])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+# python -m unittest tests/non_functional_tests/test_performance_card_vault.py
+import datetime
+import unittest
+from card_vault import CardVault
+from Payment_Processing import PaymentProcessing
+from tests.non_functional_tests.benchmark import format_ns, measure
+
+TODAY = datetime.date(2026, 10, 18)
+CARD = {"card_number": "4111111111111111", "expiry_date": "12/30", "cvv": "123"}
+
+class TestCardVaultPerformance(unittest.TestCase):
+    def test_token_vs_raw_card_payments(self):
+        """
+        Compares process_payment with raw card details (validated every time) and with a saved-card token.
+        """
+        vault = CardVault()
+        payment_processing = PaymentProcessing(today=lambda: TODAY, vault=vault)
+        order = {"total_amount": 25.0}
+        token = payment_processing.tokenize_card(CARD)
+        raw = measure("process_payment[raw card]",
+                      lambda: payment_processing.process_payment(order, "credit_card", CARD), number=1000, repeats=20)
+        tokenized = measure("process_payment[token]",
+                            lambda: payment_processing.process_payment(order, "credit_card", token), number=1000,
+                            repeats=20)
+        stats = vault.stats()
+        print(f"\nprocess_payment raw card {format_ns(raw.p50)}, token {format_ns(tokenized.p50)}")
+        print(f"vault hit rate {stats['hit_rate']:.2%}, {stats['validations']} validation(s) at "
+              f"{format_ns(stats['average_validation_ns'])}, saved {format_ns(stats['validation_ns_saved'])}")
+        self.assertGreater(stats["hit_rate"], 0.99)
+
+if __name__ == '__main__':
+    unittest.main()
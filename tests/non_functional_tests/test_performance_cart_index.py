@@ -0,0 +1,64 @@
+# python -m unittest tests/non_functional_tests/test_performance_cart_index.py
+import time
+import unittest
+from Order_Placement import Cart
+
+class TestCartIndexPerformance(unittest.TestCase):
+    """
+    Benchmarks add/update/remove on carts with a large number of line items.
+    Each operation is constant time, so per-item cost should stay flat as the cart grows.
+    """
+    SIZES = (10_000, 100_000)
+
+    def time_operations(self, size):
+        """
+        Times adding, updating and removing `size` distinct line items.
+
+        Returns:
+            dict: Elapsed seconds for each operation.
+        """
+        cart = Cart()
+        names = [f"Item {i}" for i in range(size)]
+
+        start_time = time.perf_counter()
+        for name in names:
+            cart.add_item(name, 10.0, 1)
+        add_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for name in names:
+            cart.update_item_quantity(name, 2)
+        update_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for name in names:
+            cart.remove_item(name)
+        remove_time = time.perf_counter() - start_time
+
+        self.assertEqual(cart.view_cart(), [])
+        return {"add": add_time, "update": update_time, "remove": remove_time}
+
+    def test_cart_mutations_scale_linearly(self):
+        small, large = (self.time_operations(size) for size in self.SIZES)
+        growth = self.SIZES[1] / self.SIZES[0]
+
+        for operation in ("add", "update", "remove"):
+            print(f"\n{operation:>6}: {self.SIZES[0]} items {small[operation]:.4f}s, "
+                  f"{self.SIZES[1]} items {large[operation]:.4f}s")
+            # A quadratic implementation would grow by ~growth**2; allow for cache effects over linear.
+            self.assertLess(large[operation], max(small[operation], 1e-3) * growth * 5,
+                            f"{operation} does not scale linearly")
+
+    def test_view_cart_keeps_insertion_order(self):
+        cart = Cart()
+        for i in range(1000):
+            cart.add_item(f"Item {i}", 1.0, 1)
+        for i in range(0, 1000, 2):
+            cart.remove_item(f"Item {i}")
+        cart.add_item("Item 1", 1.0, 1)  # Existing line keeps its position.
+
+        names = [line["name"] for line in cart.view_cart()]
+        self.assertEqual(names, [f"Item {i}" for i in range(1, 1000, 2)])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+# python -m unittest tests/non_functional_tests/test_performance_cart_snapshot.py
+import json
+import pickle
+import time
+import unittest
+from Order_Placement import Cart, CartItem
+
+class TestCartSnapshotPerformance(unittest.TestCase):
+    """
+    Compares the binary cart snapshot with json and pickle for 10 to 10k line carts.
+    """
+    SIZES = (10, 100, 1_000, 10_000)
+    REPEAT = 20
+
+    def build_cart(self, lines):
+        cart = Cart()
+        for i in range(lines):
+            cart.add_item(f"Item {i}", 1.0 + i % 500 / 100, 1 + i % 3)
+        return cart
+
+    @staticmethod
+    def json_dumps(cart):
+        return json.dumps([[item.name, item.price_minor, item.quantity] for item in cart.items]).encode()
+
+    @staticmethod
+    def json_loads(data):
+        cart = Cart()
+        items = []
+        for name, price_minor, quantity in json.loads(data):
+            item = CartItem(name, 0, quantity)
+            item.price_minor = price_minor
+            items.append(item)
+        cart.items = items
+        return cart
+
+    def time_round_trip(self, dumps, loads, cart):
+        start_time = time.perf_counter()
+        for _ in range(self.REPEAT):
+            data = dumps(cart)
+        encode_time = (time.perf_counter() - start_time) / self.REPEAT
+
+        start_time = time.perf_counter()
+        for _ in range(self.REPEAT):
+            restored = loads(data)
+        decode_time = (time.perf_counter() - start_time) / self.REPEAT
+
+        self.assertEqual(restored.view_cart(), cart.view_cart())
+        return len(data), encode_time, decode_time
+
+    def test_snapshot_versus_json_and_pickle(self):
+        formats = {
+            "binary": (Cart.to_bytes, Cart.from_bytes),
+            "json": (self.json_dumps, self.json_loads),
+            "pickle": (pickle.dumps, pickle.loads),
+        }
+        for lines in self.SIZES:
+            cart = self.build_cart(lines)
+            results = {name: self.time_round_trip(dumps, loads, cart) for name, (dumps, loads) in formats.items()}
+            print(f"\n{lines} lines: " + "; ".join(
+                f"{name} {size} B, encode {encode * 1e6:.0f} us, decode {decode * 1e6:.0f} us"
+                for name, (size, encode, decode) in results.items()))
+            self.assertLess(results["binary"][0], results["json"][0])
+            self.assertLess(results["binary"][0], results["pickle"][0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+# python -m unittest tests/non_functional_tests/test_performance_columnar_cart.py
+import time
+import tracemalloc
+import unittest
+from Order_Placement import Cart, ColumnarCart
+
+class TestColumnarCartPerformance(unittest.TestCase):
+    """
+    Compares memory use and total computation of the object-per-line Cart and ColumnarCart.
+    """
+    LINES = 50_000
+
+    def build(self, cart_class, names):
+        cart = cart_class()
+        for i, name in enumerate(names):
+            cart.add_item(name, 1.0 + i % 100 / 10, 1 + i % 5)
+        return cart
+
+    def measure_memory(self, cart_class, names):
+        tracemalloc.start()
+        cart = self.build(cart_class, names)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return cart, current
+
+    def time_subtotal(self, cart, repeat=20):
+        start_time = time.perf_counter()
+        for _ in range(repeat):
+            cart._recalculate_subtotal()
+        return (time.perf_counter() - start_time) / repeat
+
+    def test_memory_and_total_computation(self):
+        names = [f"SKU-{i:06d}" for i in range(self.LINES)]  # Shared by both carts, so not counted
+        object_cart, object_bytes = self.measure_memory(Cart, names)
+        columnar_cart, columnar_bytes = self.measure_memory(ColumnarCart, names)
+        object_time = self.time_subtotal(object_cart)
+        columnar_time = self.time_subtotal(columnar_cart)
+
+        print(f"\n{self.LINES} lines: Cart {object_bytes / self.LINES:.1f} B/line, {object_time * 1000:.2f} ms/total; "
+              f"ColumnarCart {columnar_bytes / self.LINES:.1f} B/line, {columnar_time * 1000:.2f} ms/total")
+        self.assertEqual(object_cart.calculate_total(), columnar_cart.calculate_total())
+        self.assertLess(columnar_bytes, object_bytes)
+        self.assertLess(columnar_time, object_time)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# python -m unittest tests/non_functional_tests/test_performance_concurrent_cart.py
+import threading
+import time
+import unittest
+from Order_Placement import Cart
+
+class TestConcurrentCartPerformance(unittest.TestCase):
+    """
+    Hammers one shared cart from many threads and reports throughput against the same
+    operations on an unlocked cart in a single thread.
+    """
+    THREADS = 16
+    OPERATIONS = 20_000  # Per thread.
+
+    def hammer(self, cart, worker):
+        for i in range(self.OPERATIONS):
+            name = f"Item {(worker * 7 + i) % 100}"
+            if i % 4 == 3:
+                cart.remove_item(name)
+            elif i % 4 == 2:
+                cart.update_item_quantity(name, i % 5 + 1)
+            else:
+                cart.add_item(name, 2.5, 1)
+
+    def test_contention(self):
+        cart = Cart()
+        start_time = time.perf_counter()
+        for worker in range(self.THREADS):
+            self.hammer(cart, worker)
+        unlocked_time = time.perf_counter() - start_time
+
+        cart = Cart(debug=True, concurrent=True)
+        threads = [threading.Thread(target=self.hammer, args=(cart, worker)) for worker in range(self.THREADS)]
+        start_time = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        concurrent_time = time.perf_counter() - start_time
+
+        operations = self.THREADS * self.OPERATIONS
+        print(f"\nUnlocked, 1 thread: {operations / unlocked_time:,.0f} ops/s; "
+              f"concurrent, {self.THREADS} threads: {operations / concurrent_time:,.0f} ops/s")
+        cart.calculate_total()  # Debug mode raises if concurrent edits corrupted the subtotal.
+        self.assertLess(concurrent_time, unlocked_time * 10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,33 @@
+# python -m unittest tests/non_functional_tests/test_performance_delivery_eta.py
+import time
+import unittest
+from delivery_eta import EtaCalculator
+from Restaurant_Browsing import RestaurantDatabase
+
+class TestDeliveryEtaPerformance(unittest.TestCase):
+    """
+    Measures the per-lookup cost of ETA estimates for search results, which should be a
+    few microseconds once addresses and (restaurant, zone) pairs are memoized.
+    """
+    LOOKUPS = 200_000
+
+    def test_lookup_latency(self):
+        database = RestaurantDatabase()
+        calculator = EtaCalculator(database)
+        names = [restaurant["name"] for restaurant in database.get_restaurants()]
+        addresses = ["123 Main St", "500 Park Ave", "1 Hill Rd", "9 Uptown Plaza"]
+
+        start_time = time.perf_counter()
+        calculator.estimate(names[0], addresses[0])
+        cold_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for i in range(self.LOOKUPS):
+            calculator.estimate(names[i % len(names)], addresses[i % len(addresses)])
+        per_lookup = (time.perf_counter() - start_time) / self.LOOKUPS
+
+        print(f"\nFirst estimate: {cold_time * 1e6:.1f}us; memoized estimate: {per_lookup * 1e6:.2f}us")
+        self.assertLess(per_lookup, 5e-6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+# python -m unittest tests/non_functional_tests/test_performance_gateway_client.py
+import asyncio
+import time
+import unittest
+from payment_gateway_client import GatewayClient, HttpPaymentGateway, LocalGatewayServer
+from tests.non_functional_tests.benchmark import format_ns, measure
+
+CARD = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+
+class TestGatewayClientPerformance(unittest.TestCase):
+    def setUp(self):
+        self.server = LocalGatewayServer().start()
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_keep_alive_vs_new_connections(self):
+        """
+        Measures a blocking payment over a pooled keep-alive connection and over a new connection per request.
+        """
+        with HttpPaymentGateway("127.0.0.1", self.server.port) as gateway:
+            pooled = measure("gateway.process_payment[pooled]",
+                             lambda: gateway.process_payment("credit_card", CARD, 5.0), number=20)
+
+            def fresh_connection():
+                async def pay():
+                    client = GatewayClient("127.0.0.1", self.server.port)
+                    await client.process_payment("credit_card", CARD, 5.0)
+                    await client.close()
+                gateway._loop_thread.run(pay())
+
+            fresh = measure("gateway.process_payment[new connection]", fresh_connection, number=20)
+
+        print(f"\nPayment over keep-alive connection {format_ns(pooled.p50)}, "
+              f"new connection per request {format_ns(fresh.p50)}")
+        self.assertLess(pooled.p50, fresh.p50)
+
+    def test_pool_size_throughput(self):
+        """
+        Measures concurrent throughput against a gateway with 5ms latency for several pool sizes.
+        """
+        self.server.latency = 0.005
+        requests = 200
+        throughput = {}
+        for pool_size in (1, 8, 32):
+            async def run():
+                client = GatewayClient("127.0.0.1", self.server.port, pool_size=pool_size)
+                start = time.perf_counter()
+                await asyncio.gather(*(client.process_payment("credit_card", CARD, 5.0) for _ in range(requests)))
+                elapsed = time.perf_counter() - start
+                await client.close()
+                return elapsed
+
+            throughput[pool_size] = requests / asyncio.run(run())
+            print(f"\npool_size={pool_size:<3} {throughput[pool_size]:8.0f} payments/s")
+        self.assertGreater(throughput[8], throughput[1] * 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+# python -m unittest tests/non_functional_tests/test_performance_gateway_resilience.py
+import random
+import time
+import unittest
+from gateway_resilience import ResilientGateway
+from Payment_Processing import FakePaymentGateway
+from tests.non_functional_tests.benchmark import BenchmarkResult, format_ns
+
+CARD = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+
+class SpikyGateway(FakePaymentGateway):
+    """
+    Usually answers in 1ms, but 5% of calls hit a 50ms latency spike.
+    """
+    def __init__(self, seed):
+        self.random = random.Random(seed)
+
+    def process_payment(self, method, details, amount):
+        time.sleep(0.05 if self.random.random() < 0.05 else 0.001)
+        return super().process_payment(method, details, amount)
+
+class TestHedgingTailLatency(unittest.TestCase):
+    def run_payments(self, name, gateway, calls=200):
+        samples = []
+        for _ in range(calls):
+            start = time.perf_counter_ns()
+            gateway.process_payment("credit_card", CARD, 10.0)
+            samples.append(time.perf_counter_ns() - start)
+        return BenchmarkResult(name, samples)
+
+    def test_hedging_cuts_p99(self):
+        """
+        Compares latency percentiles with and without hedging to a secondary gateway after 5ms.
+        """
+        plain = self.run_payments("payment[no hedging]", ResilientGateway(SpikyGateway(1)))
+        hedging = ResilientGateway(SpikyGateway(1), SpikyGateway(2), hedge_delay=0.005)
+        hedged = self.run_payments("payment[hedge after 5ms]", hedging)
+        hedging.close()
+
+        print(f"\n{plain}\n{hedged}\nhedged {hedging.hedges} of 200 calls, secondary won {hedging.hedge_wins}")
+        print(f"p99 {format_ns(plain.p99)} -> {format_ns(hedged.p99)}")
+        self.assertLess(hedged.p99, plain.p99)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+# python -m unittest tests/non_functional_tests/test_performance_idempotency.py
+import time
+import unittest
+from Order_Placement import Cart, OrderPlacement, PaymentMethod, RestaurantMenu, UserProfile
+from result_cache import IdempotencyCache
+
+class SlowPaymentMethod(PaymentMethod):
+    def process_payment(self, amount):
+        time.sleep(0.02)  # Gateway round trip
+        return True
+
+class TestIdempotencyPerformance(unittest.TestCase):
+    """
+    Compares the latency of a first confirm_order with retries answered from the idempotency cache.
+    """
+    RETRIES = 10_000
+
+    def test_retry_latency(self):
+        cart = Cart()
+        cart.add_item("Burger", 8.99, 2)
+        order = OrderPlacement(cart, UserProfile("123 Main St"), RestaurantMenu(["Burger"]),
+                               idempotency_cache=IdempotencyCache(maxsize=1000))
+        payment_method = SlowPaymentMethod()
+
+        start_time = time.perf_counter()
+        order.confirm_order(payment_method, idempotency_key="first")
+        first_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        for _ in range(self.RETRIES):
+            order.confirm_order(payment_method, idempotency_key="first")
+        retry_time = (time.perf_counter() - start_time) / self.RETRIES
+
+        print(f"\nFirst attempt: {first_time * 1000:.2f}ms; replayed retry: {retry_time * 1e6:.2f}us")
+        self.assertLess(retry_time, first_time / 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+# python -m unittest tests/non_functional_tests/test_performance_instrumentation.py
+import unittest
+from instrumentation import metrics
+from Order_Placement import Cart, OrderPlacement, RestaurantMenu, UserProfile
+from tests.non_functional_tests.benchmark import format_ns, measure
+
+class TestInstrumentationOverhead(unittest.TestCase):
+    """
+    Compares validate_order latency with metrics disabled (a single attribute check) and enabled.
+    """
+    def test_overhead(self):
+        cart = Cart()
+        cart.add_item("Pizza", 12.99, 1)
+        order = OrderPlacement(cart, UserProfile("123 Main St"), RestaurantMenu(["Pizza"]))
+        disabled = measure("validate_order[disabled]", order.validate_order, number=10_000, repeats=20)
+        metrics.enabled = True
+        try:
+            enabled = measure("validate_order[enabled]", order.validate_order, number=10_000, repeats=20)
+        finally:
+            metrics.enabled = False
+            metrics.reset()
+
+        print(f"\nvalidate_order with metrics disabled {format_ns(disabled.p50)}, enabled {format_ns(enabled.p50)}")
+        self.assertLess(disabled.p50, enabled.p50)
+
+if __name__ == '__main__':
+    unittest.main()
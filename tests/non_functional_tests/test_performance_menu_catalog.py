@@ -0,0 +1,36 @@
+# python -m unittest tests/non_functional_tests/test_performance_menu_catalog.py
+import time
+import unittest
+from Order_Placement import Cart, OrderPlacement, RestaurantMenu, UserProfile
+
+class TestMenuCatalogPerformance(unittest.TestCase):
+    """
+    Validates large carts against a chain menu with thousands of SKUs.
+    """
+    SKUS = 5_000
+    CART_LINES = 2_000
+
+    def test_validate_order_against_large_menu(self):
+        skus = [f"SKU-{i}" for i in range(self.SKUS)]
+        menu = RestaurantMenu({sku: 1.0 + i % 20 for i, sku in enumerate(skus)})
+        cart = Cart()
+        for sku in skus[-self.CART_LINES:]:  # Worst case for a linear scan of the menu
+            cart.add_item(sku, menu.get_price(sku), 1)
+        order = OrderPlacement(cart, UserProfile("123 Main St"), menu)
+
+        start_time = time.perf_counter()
+        result = order.validate_order()
+        indexed_time = time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        linear_result = all(item.name in skus for item in cart.items)  # The previous list-based lookup
+        linear_time = time.perf_counter() - start_time
+
+        print(f"\n{self.CART_LINES} lines x {self.SKUS} SKUs: catalog {indexed_time * 1000:.2f} ms, "
+              f"list scan {linear_time * 1000:.2f} ms")
+        self.assertTrue(result["success"])
+        self.assertTrue(linear_result)
+        self.assertLess(indexed_time, linear_time)
+
+if __name__ == '__main__':
+    unittest.main()
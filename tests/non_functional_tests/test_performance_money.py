@@ -0,0 +1,66 @@
+# python -m unittest tests/non_functional_tests/test_performance_money.py
+import random
+import time
+import unittest
+from decimal import Decimal, ROUND_HALF_UP
+from money import DEFAULT_PRICING, to_minor
+
+class TestMoneyPerformance(unittest.TestCase):
+    """
+    Prices a million two-line carts with float, Decimal and integer-cents arithmetic.
+    """
+    CARTS = 1_000_000
+
+    def setUp(self):
+        rng = random.Random(42)
+        self.lines = [(rng.randint(1, 5000), rng.randint(1, 5)) for _ in range(1000)]  # (price in cents, quantity)
+
+    def carts(self):
+        lines, count = self.lines, len(self.lines)
+        for i in range(self.CARTS):
+            yield lines[i % count], lines[(i * 7 + 3) % count]
+
+    def price_float(self):
+        prices = {cents: cents / 100 for cents, _ in self.lines}
+        totals = []
+        for (price_a, qty_a), (price_b, qty_b) in self.carts():
+            subtotal = prices[price_a] * qty_a + prices[price_b] * qty_b
+            totals.append(subtotal + subtotal * 0.10 + 5.00)
+        return totals
+
+    def price_decimal(self):
+        prices = {cents: Decimal(cents) / 100 for cents, _ in self.lines}
+        rate, fee, cent = Decimal("0.10"), Decimal("5.00"), Decimal("0.01")
+        totals = []
+        for (price_a, qty_a), (price_b, qty_b) in self.carts():
+            subtotal = prices[price_a] * qty_a + prices[price_b] * qty_b
+            totals.append(subtotal + (subtotal * rate).quantize(cent, rounding=ROUND_HALF_UP) + fee)
+        return totals
+
+    def price_minor(self):
+        calculate_tax, fee = DEFAULT_PRICING.calculate_tax, DEFAULT_PRICING.delivery_fee
+        totals = []
+        for (price_a, qty_a), (price_b, qty_b) in self.carts():
+            subtotal = price_a * qty_a + price_b * qty_b
+            totals.append(subtotal + calculate_tax(subtotal) + fee)
+        return totals
+
+    def timed(self, pricer):
+        start_time = time.perf_counter()
+        totals = pricer()
+        return totals, time.perf_counter() - start_time
+
+    def test_integer_cents_is_exact_and_faster_than_decimal(self):
+        float_totals, float_time = self.timed(self.price_float)
+        decimal_totals, decimal_time = self.timed(self.price_decimal)
+        minor_totals, minor_time = self.timed(self.price_minor)
+        print(f"\n{self.CARTS} carts: float {float_time:.2f}s, Decimal {decimal_time:.2f}s, "
+              f"integer cents {minor_time:.2f}s")
+
+        self.assertEqual(minor_totals, [to_minor(total) for total in decimal_totals])
+        inexact = sum(1 for f, d in zip(float_totals, decimal_totals) if Decimal(repr(f)) != d)
+        print(f"float totals differing from exact Decimal: {inexact}")
+        self.assertLess(minor_time, decimal_time)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# python -m unittest tests/non_functional_tests/test_performance_notifications.py
+import time
+import unittest
+from Payment_Processing import (InProcessTransport, NotificationService, OrderController, PaymentGateway,
+                                PaymentService, QueuedNotificationService)
+
+DELIVERY_LATENCY = 0.002  # Seconds per transport call, e.g. one request to a push or email provider.
+
+class SlowTransport(InProcessTransport):
+    def deliver(self, recipient, messages):
+        time.sleep(DELIVERY_LATENCY)
+        super().deliver(recipient, messages)
+
+class InlineNotificationService(NotificationService):
+    """
+    Sends each notification as its own transport call, in the caller's thread.
+    """
+    def __init__(self, transport):
+        self.transport = transport
+
+    def send_notification(self, message, recipient=None, order_id=None):
+        self.transport.deliver(recipient, [message])
+        return f"Notification sent: {message}"
+
+class TestNotificationPerformance(unittest.TestCase):
+    """
+    Compares place_order latency and transport calls with inline and queued notification delivery.
+    """
+    ORDERS = 500
+    RECIPIENTS = 20
+
+    def place_orders(self, notification_service):
+        controller = OrderController(PaymentService(PaymentGateway()), notification_service)
+        payment_details = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+        start_time = time.perf_counter()
+        for i in range(self.ORDERS):
+            order = {"total_amount": 10.0, "email": f"user{i % self.RECIPIENTS}@example.com"}
+            controller.place_order(order, payment_details)
+        return (time.perf_counter() - start_time) / self.ORDERS
+
+    def test_place_order_latency(self):
+        inline_transport = SlowTransport()
+        inline_latency = self.place_orders(InlineNotificationService(inline_transport))
+
+        queued_transport = SlowTransport()
+        service = QueuedNotificationService(queued_transport, flush_interval=0.05)
+        queued_latency = self.place_orders(service)
+        service.close()
+
+        print(f"\nplace_order latency: inline {inline_latency * 1e6:.0f}us "
+              f"({len(inline_transport.batches)} transport calls), queued {queued_latency * 1e6:.0f}us "
+              f"({len(queued_transport.batches)} transport calls, {service.deduplicated} duplicates dropped)")
+        self.assertLess(queued_latency, inline_latency / 5)
+        self.assertLess(len(queued_transport.batches), len(inline_transport.batches))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+# python -m unittest tests/non_functional_tests/test_performance_order_events.py
+import time
+import unittest
+from order_events import ORDER_STATUSES, OrderStatusBus
+from Order_Placement import Cart, OrderPlacement, RestaurantMenu, UserProfile
+
+class TestOrderEventsPerformance(unittest.TestCase):
+    """
+    Moves 100k orders through their whole lifecycle and measures how quickly status changes
+    are published and delivered, and how many updates coalescing saves subscribers.
+    """
+    ORDERS = 100_000
+
+    def test_status_fan_out(self):
+        cart, profile, menu = Cart(), UserProfile("123 Main St"), RestaurantMenu(["Pizza"])
+        latest = {}
+        with OrderStatusBus(max_workers=4) as bus:
+            bus.subscribe(lambda event: latest.__setitem__(event.order_id, event.status))
+            bus.subscribe(lambda event: None)
+            orders = [OrderPlacement(cart, profile, menu, status_bus=bus) for _ in range(self.ORDERS)]
+            for index, order in enumerate(orders):
+                order.order_id = index
+
+            start_time = time.perf_counter()
+            for order in orders:
+                for status in ORDER_STATUSES[1:]:  # Rapid successive updates to the same order
+                    order.update_status(status)
+            publish_time = time.perf_counter() - start_time
+            self.assertTrue(bus.flush(timeout=60))
+            total_time = time.perf_counter() - start_time
+
+        print(f"\n{bus.published:,} status changes published in {publish_time:.2f}s "
+              f"({bus.published / publish_time:,.0f}/s), delivered in {total_time:.2f}s; "
+              f"{bus.delivered:,} deliveries, {bus.coalesced:,} coalesced")
+        self.assertEqual(bus.delivered + bus.coalesced, bus.published)
+        self.assertEqual(len(latest), self.ORDERS)
+        self.assertTrue(all(status == "Delivered" for status in latest.values()))
+
+if __name__ == '__main__':
+    unittest.main()
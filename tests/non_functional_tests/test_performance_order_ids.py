@@ -0,0 +1,29 @@
+# python -m unittest tests/non_functional_tests/test_performance_order_ids.py
+import time
+import unittest
+from order_ids import OrderIdGenerator
+
+class TestOrderIdPerformance(unittest.TestCase):
+    """
+    Measures order ID issue rate for single IDs and for blocks of IDs.
+    """
+    COUNT = 500_000
+
+    def test_issue_rate(self):
+        generator = OrderIdGenerator(worker_id=1)
+        next_id = generator.next_id
+        start_time = time.perf_counter()
+        for _ in range(self.COUNT):
+            next_id()
+        single_rate = self.COUNT / (time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        for _ in range(self.COUNT // 1000):
+            generator.next_ids(1000)
+        block_rate = self.COUNT / (time.perf_counter() - start_time)
+
+        print(f"\nnext_id: {single_rate:,.0f} IDs/s; next_ids(1000): {block_rate:,.0f} IDs/s")
+        self.assertGreater(single_rate, 100_000)
+
+if __name__ == '__main__':
+    unittest.main()
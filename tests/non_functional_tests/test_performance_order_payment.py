@@ -1,23 +1,20 @@
 import time
 import unittest
 from Order_Placement import Cart, UserProfile, RestaurantMenu, OrderPlacement, PaymentMethod
+from tests.non_functional_tests.benchmark import format_ns, measure
 
 class TestPerformance(unittest.TestCase):
     def test_add_items_to_cart_performance(self):
-        # Set up a large number of items to simulate load
-        cart = Cart()
-        
-        # Simulate adding 1000 items to the cart
-        start_time = time.time()
-        
-        for i in range(1000):
-            cart.add_item(f"Item {i}", 10.0, 1)
-        
-        end_time = time.time()
-        elapsed_time = end_time - start_time
-        
-        # Assert that adding 1000 items should take less than 5 seconds (for example)
-        self.assertLess(elapsed_time, 5, f"Adding 1000 items took too long: {elapsed_time:.2f} seconds")
+        # Simulate adding 1000 items to a fresh cart, over repeated runs
+        def add_items(cart):
+            for i in range(1000):
+                cart.add_item(f"Item {i}", 10.0, 1)
+
+        result = measure("order_payment.add_1000_items", add_items, setup=Cart, repeats=20)
+        print(f"\n{result}")
+
+        # Assert that adding 1000 items takes well under a second even at the 99th percentile
+        self.assertLess(result.p99, 1e9, f"Adding 1000 items took too long: {format_ns(result.p99)} at p99")
         
     def test_checkout_performance(self):
         # Simulate a full checkout process for performance testing
@@ -29,19 +26,44 @@ class TestPerformance(unittest.TestCase):
         restaurant_menu = RestaurantMenu(["Burger", "Pizza", "Pasta"])
         
         order_placement = OrderPlacement(cart, user_profile, restaurant_menu)
-        
-        start_time = time.time()
-        
-        # Simulate the checkout process
-        order_placement.validate_order()
-        order_placement.proceed_to_checkout()
-        order_placement.confirm_order(PaymentMethod())
-        
-        end_time = time.time()
-        elapsed_time = end_time - start_time
-        
-        # Assert that the checkout process completes within a reasonable time (e.g., 2 seconds)
-        self.assertLess(elapsed_time, 2, f"Checkout took too long: {elapsed_time:.2f} seconds")
+        payment_method = PaymentMethod()
+
+        def checkout():
+            order_placement.invalidate_checkout()
+            order_placement.validate_order()
+            order_placement.proceed_to_checkout()
+            order_placement.confirm_order(payment_method)
+
+        result = measure("order_payment.checkout", checkout, repeats=200)
+        print(f"\n{result}")
+
+        # Assert that the checkout process completes within a reasonable time at the 99th percentile
+        self.assertLess(result.p99, 1e8, f"Checkout took too long: {format_ns(result.p99)} at p99")
+
+    def test_checkout_context_saving(self):
+        # Measure proceed_to_checkout -> confirm_order end to end, with and without reusing the checkout context
+        cart = Cart()
+        for i in range(200):
+            cart.add_item(f"Item {i}", 5.0, 1)
+        restaurant_menu = RestaurantMenu([f"Item {i}" for i in range(200)])
+        order_placement = OrderPlacement(cart, UserProfile("123 Main St"), restaurant_menu)
+        payment_method = PaymentMethod()
+
+        def run_checkouts(memoized, iterations=500):
+            start_time = time.perf_counter()
+            for _ in range(iterations):
+                order_placement.proceed_to_checkout()
+                if not memoized:
+                    order_placement.invalidate_checkout()
+                order_placement.confirm_order(payment_method)
+                order_placement.invalidate_checkout()  # Each iteration starts from a fresh checkout
+            return time.perf_counter() - start_time
+
+        uncached_time = run_checkouts(memoized=False)
+        cached_time = run_checkouts(memoized=True)
+        print(f"\nCheckout without context reuse: {uncached_time:.3f}s, with reuse: {cached_time:.3f}s "
+              f"({(1 - cached_time / uncached_time) * 100:.0f}% saved)")
+        self.assertLess(cached_time, uncached_time)
 
 if __name__ == '__main__':
     unittest.main()
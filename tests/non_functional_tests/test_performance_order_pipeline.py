@@ -0,0 +1,56 @@
+# python -m unittest tests/non_functional_tests/test_performance_order_pipeline.py
+import time
+import unittest
+from order_history import OrderHistory
+from order_pipeline import build_checkout_pipeline
+from Order_Placement import Cart, RestaurantMenu
+from Payment_Processing import InProcessTransport, PaymentGateway, PaymentService, QueuedNotificationService
+
+GATEWAY_LATENCY = 0.01  # Seconds per authorization.
+
+class SlowGateway(PaymentGateway):
+    def process_payment(self, method, details, amount):
+        time.sleep(GATEWAY_LATENCY)
+        return super().process_payment(method, details, amount)
+
+class TestOrderPipelinePerformance(unittest.TestCase):
+    """
+    Pushes a dinner-rush burst of orders through the checkout pipeline and compares its
+    throughput with processing the same orders one at a time.
+    """
+    ORDERS = 1000
+
+    def test_burst_throughput(self):
+        cart = Cart()
+        cart.add_item("Pizza", 12.99, 2)
+        menu = RestaurantMenu({"Pizza": 12.99})
+        payment_service = PaymentService(SlowGateway())
+        card = {"card_number": "1234567812345678", "expiry_date": "12/25", "cvv": "123"}
+
+        sample = 50
+        start_time = time.perf_counter()
+        for _ in range(sample):
+            payment_service.process_payment({"total_amount": cart.calculate_total()["total"]}, card)
+        sequential_rate = sample / (time.perf_counter() - start_time)
+
+        notifications = QueuedNotificationService(InProcessTransport())
+        pipeline = build_checkout_pipeline(menu, payment_service, OrderHistory(), notifications,
+                                           workers={"authorize": 32}, queue_size=64)
+        start_time = time.perf_counter()
+        futures = [pipeline.submit({"email": f"user{i % 100}@example.com", "cart": cart, "payment_details": card})
+                   for i in range(self.ORDERS)]
+        results = [future.result(timeout=60) for future in futures]
+        pipeline_rate = self.ORDERS / (time.perf_counter() - start_time)
+        stats = pipeline.stats()
+        pipeline.close()
+        notifications.close()
+
+        print(f"\nSequential: {sequential_rate:.0f} orders/s; pipeline: {pipeline_rate:.0f} orders/s")
+        for name, stage in stats.items():
+            print(f"  {name:>9}: {stage['processed']} processed, avg latency {stage['avg_latency'] * 1000:.2f}ms, "
+                  f"max {stage['max_latency'] * 1000:.2f}ms")
+        self.assertTrue(all(result["success"] for result in results))
+        self.assertGreater(pipeline_rate, sequential_rate * 5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+# python -m unittest tests/non_functional_tests/test_performance_profiling.py
+import tempfile
+import unittest
+from profiling import default_profiler
+from User_Registration import UserRegistration
+from tests.non_functional_tests.benchmark import format_ns, measure
+
+class TestProfilingOverhead(unittest.TestCase):
+    """
+    Compares register latency undecorated, with sampling off, and with 1% of calls sampled.
+    """
+    def test_overhead(self):
+        registration = UserRegistration()
+        undecorated = UserRegistration.register.__wrapped__
+
+        def register_plain():
+            undecorated(registration, "user@example.com", "Password123", "Password123")
+
+        def register_sampled():
+            registration.register("user@example.com", "Password123", "Password123")
+
+        plain = measure("register[undecorated]", register_plain, number=10_000, repeats=20)
+        off = measure("register[rate=0]", register_sampled, number=10_000, repeats=20)
+        with tempfile.TemporaryDirectory() as directory:
+            default_profiler.directory = directory
+            default_profiler.rate = 0.01
+            try:
+                sampled = measure("register[rate=0.01]", register_sampled, number=1_000, repeats=20)
+            finally:
+                default_profiler.rate = 0.0
+                default_profiler.directory = "profiles"
+
+        print(f"\nregister undecorated {format_ns(plain.p50)}, sampling off {format_ns(off.p50)}, "
+              f"1% sampled {format_ns(sampled.p50)}")
+        self.assertLess(off.p50, plain.p50 * 2)
+
+if __name__ == '__main__':
+    unittest.main()